@@ -5,7 +5,8 @@ from ebonite.runtime.command_line import start_runtime
 
 EBONITE_DEBUG = config.Core.DEBUG
 if config.Core.AUTO_IMPORT_EXTENSIONS:
-    ExtensionLoader.load_all()
+    # runtime needs no repositories, extensions for its model and server are loaded when their libraries are imported
+    ExtensionLoader.load_all(load_forced=not config.Core.RUNTIME)
 
 __all__ = ['load_extensions', 'Ebonite', 'EBONITE_DEBUG', 'start_runtime', 'create_model']
 __version__ = '0.7.0'
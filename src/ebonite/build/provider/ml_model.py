@@ -7,12 +7,15 @@ from ebonite.core.analyzer import TypeHookMixin
 from ebonite.core.analyzer.buildable import BuildableHook
 from ebonite.core.objects.artifacts import _RelativePathWrapper, CompositeArtifactCollection, Blobs, LocalFileBlob
 from ebonite.core.objects import ArtifactCollection, Model, Requirements, Task
-from pyjackson import dumps
+from pyjackson import dumps, loads, serialize
 from pyjackson.decorators import cached_property
 
 from ebonite.core.objects.core import WithMetadataRepository
-from ebonite.runtime.interface.ml_model import MODEL_BIN_PATH, MODEL_META_PATH
+from ebonite.core.objects.wrapper import Methods
+from ebonite.runtime.bundle import BUNDLE_BUILD_ERRORS, RUNTIME_BUNDLE_PATH, RuntimeBundle
+from ebonite.runtime.interface.ml_model import MODEL_BIN_PATH, MODEL_META_PATH, model_interface
 from ebonite.runtime.server import Server
+from ebonite.utils.log import logger
 from ebonite.utils.module import get_object_requirements
 
 LOADER_PATH = 'loader'
@@ -61,10 +64,33 @@ class MLModelProvider(PythonProvider):
         })
         return sources
 
+    def _bound_model(self) -> Model:
+        """Returns model which wrapper has methods, reading them from model artifacts if they are not loaded"""
+        wrapper = self.model.wrapper
+        if wrapper.methods is not None:
+            return self.model
+        with self.model.artifact_any.blob_dict() as blobs:
+            methods = loads(blobs[wrapper.methods_json].bytes().decode('utf8'), Optional[Methods])
+        # fresh wrapper, so model of this provider is left untouched
+        model = Model(self.model.name, serialize(wrapper), description=self.model.description)
+        model.wrapper.methods = methods
+        return model
+
+    def _get_runtime_bundle(self):
+        """Returns sources of runtime bundle or nothing if model interface could not be created
+        outside of its environment, other errors fail the build"""
+        try:
+            return {RUNTIME_BUNDLE_PATH: RuntimeBundle.from_interface(model_interface(self._bound_model())).dumps()}
+        except BUNDLE_BUILD_ERRORS as e:
+            logger.warning('Failed to precompute runtime bundle for %s, runtime will create it on startup: %s',
+                           self.model, e)
+            return {}
+
     def get_sources(self):
-        """Returns model metadata file and sources of custom modules from requirements"""
+        """Returns model metadata file, runtime bundle and sources of custom modules from requirements"""
         return {
             MODEL_META_PATH: dumps(self.model.without_artifacts()),
+            **self._get_runtime_bundle(),
             **self._get_sources(),
             **{os.path.basename(f): read(f) for f in self.server.additional_sources}
         }
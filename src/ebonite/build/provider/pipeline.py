@@ -13,8 +13,11 @@ from ebonite.core.analyzer.buildable import BuildableHook
 from ebonite.core.objects import ArtifactCollection, Model, Pipeline, Requirements, Task
 from ebonite.core.objects.artifacts import Blobs, CompositeArtifactCollection, LocalFileBlob, _RelativePathWrapper
 from ebonite.core.objects.core import _with_meta
-from ebonite.runtime.interface.pipeline import MODEL_BIN_PATH, PIPELINE_META_PATH, PipelineLoader, PipelineMeta
+from ebonite.runtime.bundle import BUNDLE_BUILD_ERRORS, RUNTIME_BUNDLE_PATH, RuntimeBundle
+from ebonite.runtime.interface.pipeline import (MODEL_BIN_PATH, PIPELINE_META_PATH, PipelineLoader, PipelineMeta,
+                                                pipeline_interface)
 from ebonite.runtime.server import Server
+from ebonite.utils.log import logger
 from ebonite.utils.module import get_object_requirements
 
 LOADER_PATH = 'loader'
@@ -65,13 +68,26 @@ class PipelineProvider(PythonProvider):
         })
         return sources
 
+    def _get_runtime_bundle(self):
+        """Returns sources of runtime bundle or nothing if pipeline has no data types or its interface could not be
+        created outside of its environment, other errors fail the build"""
+        if self.pipeline.input_data is None or self.pipeline.output_data is None:
+            return {}
+        try:
+            return {RUNTIME_BUNDLE_PATH: RuntimeBundle.from_interface(pipeline_interface(self.pipeline)).dumps()}
+        except BUNDLE_BUILD_ERRORS as e:
+            logger.warning('Failed to precompute runtime bundle for %s, runtime will create it on startup: %s',
+                           self.pipeline, e)
+            return {}
+
     def get_sources(self):
-        """Returns model metadata file and sources of custom modules from requirements"""
+        """Returns pipeline metadata file, runtime bundle and sources of custom modules from requirements"""
         meta = PipelineMeta(self.pipeline, {
             k: v.without_artifacts() for k, v in self.pipeline.models.items()
         })
         return {
             PIPELINE_META_PATH: dumps(meta),
+            **self._get_runtime_bundle(),
             **self._get_sources(),
             **{os.path.basename(f): read(f) for f in self.server.additional_sources}
         }
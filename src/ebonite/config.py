@@ -1,4 +1,5 @@
 import argparse
+import os
 from abc import abstractmethod
 from typing import Any, Callable, Dict, Type
 
@@ -114,6 +115,18 @@ class Core(Config):
                                    doc='Set to true to automatically load available extensions on ebonite import',
                                    parser=bool)
     RUNTIME = Param('runtime', default='false', doc='is this instance a runtime', parser=bool)
+    DATASET_CACHE_SIZE = Param('dataset_cache_size', default=str(1024 ** 3),
+                               doc='memory budget in bytes for datasets cached during evaluation', parser=int)
+    DATASET_ANALYSIS_SAMPLE_SIZE = Param('dataset_analysis_sample_size', default='0',
+                                         doc='lists longer than this are analyzed by sample of this size, '
+                                             '0 (default) to analyze all elements',
+                                         parser=int)
+    MODEL_PROBE_SIZE = Param('model_probe_size', default='10',
+                             doc='number of input data sample rows model methods are called with to analyze outputs, '
+                                 '0 to use whole sample',
+                             parser=int)
+    MODULE_INDEX_CACHE = Param('module_index_cache', default=os.path.join(os.path.expanduser('~'), '.cache', 'ebonite'),
+                               doc='directory to persist module classification index in, empty to disable persistence')
 
 
 class Logging(Config):
@@ -1,10 +1,10 @@
 import inspect
 from abc import ABC, abstractmethod
 from types import ModuleType
-from typing import List, Type
+from typing import Dict, List, Optional, Tuple, Type
 
 from ebonite.utils.log import logger
-from ebonite.utils.module import get_object_base_module
+from ebonite.utils.module import _OBJECTS_WITH_MODULE, get_object_base_module
 
 ANALYZER_FIELD = '_analyzer'
 
@@ -13,6 +13,10 @@ class Hook(ABC):
     """
     Base class for Hooks
     """
+    #: set to True if results of :meth:`can_process` and :meth:`must_process` depend only on type of object,
+    #: so analyzer may compute them once per type. Subclasses which override these methods are not type dispatched
+    #: unless they set this flag explicitly
+    type_dispatch: bool = False
 
     @abstractmethod
     def can_process(self, obj) -> bool:
@@ -53,6 +57,9 @@ class Hook(ABC):
             if len(arg_spec.args) > 1:
                 raise ValueError('Hook type [{}] cannot have __init__ with arguments'.format(cls.__name__))
 
+        if ('can_process' in cls.__dict__ or 'must_process' in cls.__dict__) and 'type_dispatch' not in cls.__dict__:
+            cls.type_dispatch = False
+
         if not inspect.isabstract(cls):
             for b in reversed(cls.__bases__):
                 analyzer = getattr(b, ANALYZER_FIELD, None)
@@ -82,6 +89,7 @@ class TypeHookMixin(CanIsAMustHookMixin):
     """
     Mixin for cases when hook must process objects of certain types
     """
+    type_dispatch = True
     valid_types: List[Type] = None
 
     def must_process(self, obj) -> bool:
@@ -93,6 +101,8 @@ class BaseModuleHookMixin(CanIsAMustHookMixin, Hook):
     """
     Mixin for cases when hook must process all objects with certain base modules
     """
+    # base module of instance is the module of its type, classes and functions are always checked by analyzer
+    type_dispatch = True
 
     @abstractmethod
     def is_valid_base_module_name(self, module_name: str) -> bool:
@@ -130,6 +140,75 @@ class LibHookMixin(BaseModuleHookMixin):
         return base_module == self.base_module_name
 
 
+class _HookIndex:
+    """
+    Dispatch index for analyzer hooks. Results of type dispatched hooks are memoized per exact type of object,
+    other hooks are checked for each object. Hook priorities are the same as for linear scan over all hooks:
+    first hook in registration order which must process object wins, otherwise the only one which can process it.
+
+    :param hook_type: hook type of analyzer
+    :param hooks: registered hooks
+    """
+
+    def __init__(self, hook_type: type, hooks: List[Hook]):
+        self.hook_type = hook_type
+        self.hooks = hooks
+        self.size = len(hooks)
+        self.typed = [(i, h) for i, h in enumerate(hooks) if h.type_dispatch]
+        self.predicates = [(i, h) for i, h in enumerate(hooks) if not h.type_dispatch]
+        self.by_type: Dict[type, Tuple[Optional[int], List[int]]] = {}
+
+    def is_valid(self, hooks: List[Hook]) -> bool:
+        """Returns True if index is built for hooks list in its current state"""
+        return hooks is self.hooks and len(hooks) == self.size
+
+    @staticmethod
+    def _check(obj, hooks) -> Tuple[Optional[int], List[int]]:
+        can = []
+        for i, hook in hooks:
+            if hook.must_process(obj):
+                return i, []
+            elif hook.can_process(obj):
+                can.append(i)
+        return None, can
+
+    def find(self, obj) -> Hook:
+        """
+        Finds hook to process obj
+
+        :param obj: object to analyze
+        :return: hook instance
+        """
+        if isinstance(obj, _OBJECTS_WITH_MODULE):
+            must, can = self._check(obj, enumerate(self.hooks))
+        else:
+            obj_type = type(obj)
+            try:
+                must, can = self.by_type[obj_type]
+            except KeyError:
+                must, can = self.by_type[obj_type] = self._check(obj, self.typed)
+            if self.predicates:
+                predicates = self.predicates if must is None else [(i, h) for i, h in self.predicates if i < must]
+                pred_must, pred_can = self._check(obj, predicates)
+                if pred_must is not None:
+                    must = pred_must
+                elif must is None and pred_can:
+                    can = sorted(can + pred_can)
+
+        if must is not None:
+            hook = self.hooks[must]
+            logger.debug('processing class %s with %s', type(obj).__name__, hook.__class__.__name__)
+            return hook
+
+        if not can:
+            raise ValueError(
+                f'No suitable {self.hook_type.__name__} for object '
+                f'[{type(obj).__name__}] {obj}. Registered hooks: {self.hooks}')
+        elif len(can) > 1:
+            raise ValueError(f'Multiple suitable hooks for object {obj} ({[self.hooks[i] for i in can]})')
+        return self.hooks[can[0]]
+
+
 def analyzer_class(hook_type: type, return_type: type):
     """
     Function to create separate hook hierarchies for analyzing different objects
@@ -146,6 +225,7 @@ def analyzer_class(hook_type: type, return_type: type):
         Analyzer for {hook_type.__name__} hooks
         """
         hooks: List[hook_type] = []
+        _index: Optional['_HookIndex'] = None
 
         @classmethod
         def analyze(cls, obj, **kwargs) -> return_type:
@@ -160,22 +240,10 @@ def analyzer_class(hook_type: type, return_type: type):
 
         @classmethod
         def _find_hook(cls, obj) -> hook_type:
-            hooks = []
-            for hook in cls.hooks:
-                if hook.must_process(obj):
-                    logger.debug('processing class %s with %s', type(obj).__name__, hook.__class__.__name__)
-                    return hook
-                elif hook.can_process(obj):
-                    hooks.append(hook)
-
-            if not hooks:
-                raise ValueError(
-                    f'No suitable {hook_type.__name__} for object '
-                    f'[{type(obj).__name__}] {obj}. Registered hooks: {cls.hooks}')
-            elif len(hooks) > 1:
-                raise ValueError(f'Multiple suitable hooks for object {obj} ({hooks})')
-
-            return hooks[0]
+            index = cls._index
+            if index is None or not index.is_valid(cls.hooks):
+                index = cls._index = _HookIndex(hook_type, cls.hooks)
+            return index.find(obj)
 
     Analyzer.__name__ = '{}Analyzer'.format(hook_type.__name__)
     setattr(hook_type, ANALYZER_FIELD, Analyzer)
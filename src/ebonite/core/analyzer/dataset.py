@@ -1,9 +1,11 @@
 from abc import abstractmethod
 
+from ebonite.config import Core
 from ebonite.core.analyzer.base import Hook, analyzer_class
 from ebonite.core.objects.dataset_type import (PRIMITIVES, BytesDatasetType, DatasetType, DictDatasetType,
                                                ListDatasetType, PrimitiveDatasetType, TupleDatasetType,
                                                TupleLikeListDatasetType)
+from ebonite.utils.log import logger
 
 
 class DatasetHook(Hook):
@@ -30,6 +32,8 @@ class PrimitivesHook(DatasetHook):
     """
     Hook for primitive data, for example when you model outputs just one int
     """
+    type_dispatch = True
+
     def can_process(self, obj):
         if type(obj) in PRIMITIVES:
             return True
@@ -43,8 +47,16 @@ class PrimitivesHook(DatasetHook):
 
 class OrderedCollectionHookDelegator(DatasetHook):
     """
-    Hook for list/tuple data
+    Hook for list/tuple data.
+    If :attr:`ebonite.config.Core.DATASET_ANALYSIS_SAMPLE_SIZE` is set (sampling is off by default),
+    longer lists are analyzed by sample of elements. All elements are first grouped by python types of their nested
+    values, which is cheaper than their analysis, and only evenly spaced sample of each group is analyzed.
+    Single group with the same sampled types is described with :class:`.ListDatasetType`, otherwise list is
+    described with :class:`.TupleLikeListDatasetType` which shares types of elements of the same group.
+    Lists of mostly different elements still get one type description per element
     """
+    type_dispatch = True
+
     def can_process(self, obj) -> bool:
         return isinstance(obj, (list, tuple))
 
@@ -55,6 +67,10 @@ class OrderedCollectionHookDelegator(DatasetHook):
         if isinstance(obj, tuple):
             return TupleDatasetType([DatasetAnalyzer.analyze(o) for o in obj])
 
+        sample_size = Core.DATASET_ANALYSIS_SAMPLE_SIZE
+        if 0 < sample_size < len(obj):
+            return self._process_sample(obj, sample_size)
+
         py_types = {type(o) for o in obj}
         if len(obj) <= 1 or len(py_types) > 1:
             return TupleLikeListDatasetType([DatasetAnalyzer.analyze(o) for o in obj])
@@ -65,11 +81,59 @@ class OrderedCollectionHookDelegator(DatasetHook):
         # optimization for large lists of same primitive type elements
         return ListDatasetType(DatasetAnalyzer.analyze(obj[0]), len(obj))
 
+    @staticmethod
+    def _process_sample(obj: list, sample_size: int) -> DatasetType:
+        # cheap pass over all elements: only python types are checked,
+        # so only a sample of each group has to be analyzed
+        groups = {}
+        for i, o in enumerate(obj):
+            groups.setdefault(_element_shape(o), []).append(i)
+        if len(groups) > sample_size:
+            logger.debug('List of size %s has %s groups of elements with different types, sampling does not help',
+                         len(obj), len(groups))
+
+        types = [None] * len(obj)
+        uniform = True
+        for indices in groups.values():
+            if len(indices) > sample_size:
+                step = (len(indices) - 1) / max(sample_size - 1, 1)
+                sampled = [indices[round(k * step)] for k in range(sample_size)]
+            else:
+                sampled = indices
+            sample_types = [DatasetAnalyzer.analyze(obj[i]) for i in sampled]
+            if all(t == sample_types[0] for t in sample_types[1:]):
+                group_types = [sample_types[0]] * len(indices)
+            else:
+                uniform = False
+                if sampled is indices:
+                    group_types = sample_types
+                else:
+                    logger.debug('Sampled elements of list of size %s have different types, analyzing %s of them',
+                                 len(obj), len(indices))
+                    group_types = [DatasetAnalyzer.analyze(obj[i]) for i in indices]
+            for i, t in zip(indices, group_types):
+                types[i] = t
+
+        if uniform and len(groups) == 1:
+            return ListDatasetType(types[0], len(obj))
+        return TupleLikeListDatasetType(types)
+
+
+def _element_shape(obj):
+    """Python types of object and its nested dict values and sequence items"""
+    if isinstance(obj, dict):
+        return type(obj), frozenset((k, _element_shape(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return type(obj), tuple(_element_shape(o) for o in obj)
+    return type(obj)
+
 
 class DictHookDelegator(DatasetHook):
     """
     Hook for dict data
     """
+    type_dispatch = True
+
     def can_process(self, obj) -> bool:
         return isinstance(obj, dict)
 
@@ -88,6 +152,8 @@ class BytesDatasetHook(DatasetHook):
     """
     Hook for bytes objects
     """
+    type_dispatch = True
+
     def process(self, obj, **kwargs) -> DatasetType:
         return BytesDatasetType()
 
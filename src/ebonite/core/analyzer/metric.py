@@ -38,6 +38,8 @@ class LibFunctionMixin(MetricHook, LibHookMixin):
 
 
 class CallableMetricHook(MetricHook):
+    type_dispatch = True
+
     def process(self, obj, **kwargs) -> Metric:
         return CallableMetric(CallableMetricWrapper.from_callable(obj))
 
@@ -38,6 +38,8 @@ class CallableMethodModelHook(BindingModelHook):
     """
     Hook for processing functions
     """
+    type_dispatch = True
+
     def _wrapper_factory(self) -> ModelWrapper:
         return CallableMethodModelWrapper()
 
@@ -244,3 +244,9 @@ class ArtifactExistsError(ArtifactError):
 
     def __init__(self, artifact_id, repo):
         super(ArtifactExistsError, self).__init__(f'Artifact with id {artifact_id} already in {repo}')
+
+
+class ArtifactIntegrityError(ArtifactError):
+    """
+    Exception which is thrown if artifact payload does not match its manifest
+    """
@@ -2,16 +2,19 @@ import contextlib
 import io
 import os
 import shutil
-import sys
 import tempfile
 import typing
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import copy
 
 from pyjackson.core import Unserializable
 from pyjackson.decorators import make_string, type_field
 
 from ebonite.core.objects.base import EboniteParams
+from ebonite.utils.compression import CHUNK_SIZE, get_codec
+from ebonite.utils.hashing import HashingReader, file_digest, hash_parts, payload_digest
+from ebonite.utils.log import logger
 
 StreamContextManager = typing.Iterable[typing.BinaryIO]
 
@@ -57,6 +60,22 @@ class Blob(EboniteParams):
         with self.bytestream() as bs:
             return bs.read()
 
+    def local_path(self) -> typing.Optional[str]:
+        """
+        Returns path to local file with blob's payload if there is one, so it could be used without copying
+
+        :return: path or `None`
+        """
+        return None
+
+    def content_digest(self) -> typing.Optional[str]:
+        """
+        Returns hash of blob's payload if it is known without reading payload (e.g. from integrity manifest)
+
+        :return: hex digest or `None`
+        """
+        return None
+
 
 class LocalFileBlob(Blob):
     """
@@ -88,6 +107,9 @@ class LocalFileBlob(Blob):
         with open(self.path, 'rb') as f:
             yield f
 
+    def local_path(self) -> typing.Optional[str]:
+        return self.path
+
 
 # noinspection PyAbstractClass
 class MaterializeOnlyBlobMixin(Blob):
@@ -142,6 +164,14 @@ class InMemoryBlob(Blob, Unserializable):
         """
         yield io.BytesIO(self.payload)
 
+    def content_digest(self) -> typing.Optional[str]:
+        """
+        Hashes payload which is already in memory
+
+        :return: hex digest
+        """
+        return payload_digest(self.payload)
+
 
 class LazyBlob(Blob, Unserializable):
     """Represents a lazy blob, which is computed only when needed
@@ -155,30 +185,193 @@ class LazyBlob(Blob, Unserializable):
 
     def materialize(self, path):
         """
-        Writes payload to path
+        Writes payload to path chunk by chunk
 
         :param path: target path
         """
         os.makedirs(os.path.dirname(path), exist_ok=True)
+        source = self.source()
         with open(path, 'wb') as f:
-            source = self.source()
-            if not isinstance(source, (str, bytes)):
-                source.seek(0)
-                source = source.read()
             if isinstance(source, str):
                 source = source.encode(self.encoding)
-            f.write(source)
+            if isinstance(source, bytes):
+                f.write(source)
+                return
+            source.seek(0)
+            if isinstance(source, io.TextIOBase):
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), ''):
+                    f.write(chunk.encode(self.encoding))
+            else:
+                shutil.copyfileobj(source, f, CHUNK_SIZE)
 
     @contextlib.contextmanager
     def bytestream(self) -> StreamContextManager:
         """
-        Creates BytesIO object from bytes
+        Returns binary file-like object with payload
 
         :yields: file-like object
         """
         source = self.source()
+        if isinstance(source, str):
+            source = source.encode(self.encoding)
+        if isinstance(source, bytes):
+            yield io.BytesIO(source)
+            return
         source.seek(0)
-        yield source
+        if isinstance(source, io.TextIOBase):
+            yield io.BytesIO(source.read().encode(self.encoding))
+        else:
+            yield source
+
+
+class CompressedBlob(Blob):
+    """
+    Blob implementation for compressed payload of another blob. Payload is decompressed on the fly
+
+    :param blob: blob with compressed payload
+    :param codec: type name of :class:`~ebonite.utils.compression.Codec` used for compression
+    """
+    type = 'compressed'
+
+    def __init__(self, blob: Blob, codec: str):
+        self.blob = blob
+        self.codec = codec
+
+    def materialize(self, path):
+        """
+        Writes decompressed payload to path
+
+        :param path: target path
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.bytestream() as src, open(path, 'wb') as f:
+            shutil.copyfileobj(src, f, CHUNK_SIZE)
+
+    @contextlib.contextmanager
+    def bytestream(self) -> StreamContextManager:
+        """
+        Opens underlying blob and decompresses it
+
+        :yields: file-like object
+        """
+        with self.blob.bytestream() as src, get_codec(self.codec).decompress_stream(src) as f:
+            yield f
+
+    def content_digest(self) -> typing.Optional[str]:
+        """
+        Returns hash of codec and compressed payload hash if the latter is known
+
+        :return: hex digest or `None`
+        """
+        digest = self.blob.content_digest()
+        return hash_parts(self.codec, digest) if digest is not None else None
+
+
+class _VerifyingReader(HashingReader):
+    def __init__(self, stream: typing.BinaryIO, blob: 'VerifiedBlob'):
+        super().__init__(stream)
+        self.blob = blob
+
+    def _update(self, data: bytes):
+        super()._update(data)
+        if not self.finished and self.size >= self.blob.size:
+            # callers often read exactly expected size, check that there is nothing more instead of waiting for EOF
+            super()._update(self.stream.read(1))
+            self._on_finish()
+
+    def _on_finish(self):
+        super()._on_finish()
+        self.blob.verify(self.size, self.digest)
+
+    def close(self):
+        """Closes stream. Payload which was not read to the end stays unverified"""
+        if not self.closed and not self.finished:
+            logger.debug('%s was not read to the end, its payload is not verified', self.blob.blob)
+        super().close()
+
+
+class VerifiedBlob(Blob):
+    """
+    Blob implementation which checks payload of another blob against known size and hash.
+    Payload is verified when it is read to the end (streams closed earlier stay unverified),
+    and materialization is skipped if target file already has the same payload
+
+    :param blob: blob to verify
+    :param size: expected payload size
+    :param digest: expected payload hash hex digest
+    """
+    type = 'verified'
+
+    def __init__(self, blob: Blob, size: int, digest: str):
+        self.blob = blob
+        self.size = size
+        self.digest = digest
+
+    def verify(self, size: int, digest: str):
+        """
+        Checks that given size and hash match expected ones
+
+        :param size: actual payload size
+        :param digest: actual payload hash hex digest
+        :exception: :exc:`.ArtifactIntegrityError` if they do not match
+        """
+        if size != self.size or digest != self.digest:
+            # we couldn't import errors at top as it leads to circular import failure
+            from ebonite.core.errors import ArtifactIntegrityError
+            raise ArtifactIntegrityError(f'{self.blob} payload of size {size} and hash {digest} does not match '
+                                         f'expected size {self.size} and hash {self.digest}')
+
+    def materialize(self, path):
+        """
+        Writes verified payload to path unless it is already there
+
+        :param path: target path
+        """
+        if os.path.isfile(path) and os.path.getsize(path) == self.size and file_digest(path) == self.digest:
+            logger.debug('%s is already materialized to %s', self.blob, path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part_path = path + '.part'
+        try:
+            with self.bytestream() as src, open(part_path, 'wb') as f:
+                shutil.copyfileobj(src, f, CHUNK_SIZE)
+            os.replace(part_path, path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+    @contextlib.contextmanager
+    def bytestream(self) -> StreamContextManager:
+        """
+        Opens underlying blob and verifies its payload when it is read to the end.
+        Stream is seekable if underlying one is
+
+        :yields: file-like object
+        """
+        with self.blob.bytestream() as src:
+            reader = _VerifyingReader(src, self)
+            yield reader
+            reader.close()
+
+    def content_digest(self) -> str:
+        """
+        Returns expected hash of payload without reading it
+
+        :return: hex digest
+        """
+        return self.digest
+
+    def local_path(self) -> typing.Optional[str]:
+        """
+        Returns path to local file of underlying blob.
+        Only size of that file is verified, as hashing it would defeat the purpose of using it in place
+
+        :return: path or `None`
+        """
+        path = self.blob.local_path()
+        if path is not None and os.path.getsize(path) != self.size:
+            self.verify(os.path.getsize(path), file_digest(path))
+        return path
 
 
 @type_field('type')
@@ -203,7 +396,8 @@ class ArtifactCollection(EboniteParams):
     @abstractmethod
     def bytes_dict(self) -> typing.Dict[str, bytes]:
         """
-        Implementation must return a dict of artifact name -> artifact payload
+        Implementation must return a dict of artifact name -> artifact payload.
+        Note that this loads all payloads into memory, use :meth:`blob_dict` to stream them instead
 
         :returns: dict of artifact names -> artifact payloads
         """
@@ -219,6 +413,19 @@ class ArtifactCollection(EboniteParams):
         """
         pass  # pragma: no cover
 
+    def fingerprint(self) -> typing.Optional[str]:
+        """
+        Computes hash of names and payload hashes of all artifacts. Payloads are never read,
+        so fingerprint is known only if all blobs know their hashes (e.g. from integrity manifests)
+
+        :return: hex digest or `None`
+        """
+        with self.blob_dict() as blobs:
+            digests = {name: blob.content_digest() for name, blob in blobs.items()}
+        if any(d is None for d in digests.values()):
+            return None
+        return hash_parts(*[part for name in sorted(digests) for part in (name, digests[name])])
+
     def __add__(self, other):
         """
         Creates a :py:class:`CompositeArtifactCollection` with union of artifacts from self and other ArtifactCollection
@@ -278,7 +485,7 @@ def _enter_all_cm(managers):
     except Exception as e:
         for m in reversed(entered):
             try:
-                m.__exit__(type(e), e, sys.exc_traceback)
+                m.__exit__(type(e), e, e.__traceback__)
             except Exception as e2:
                 e = e2
         raise e
@@ -297,7 +504,7 @@ class _ExitAllCm:
             try:
                 m.__exit__(exc_type, exc_val, exc_tb)
             except Exception as e:
-                exc_type, exc_val, exc_tb = type(e), e, sys.exc_traceback
+                exc_type, exc_val, exc_tb = type(e), e, e.__traceback__
 
 
 class CompositeArtifactCollection(ArtifactCollection):
@@ -307,18 +514,55 @@ class CompositeArtifactCollection(ArtifactCollection):
     :param artifacts: ArtifactCollections to merge
     """
     type = 'composite'
+    max_workers = 8
 
     def __init__(self, artifacts: typing.List[ArtifactCollection]):
         self.artifacts = artifacts
 
     def materialize(self, path):
         """
-        Materializes every ArtifactCollection to path
+        Materializes every ArtifactCollection concurrently using at most :attr:`max_workers` threads.
+        Artifacts are materialized to staging dir next to path and moved to path only if all of them succeed,
+        so failed materialization leaves path untouched
 
         :param path: target dir
         """
-        for a in self.artifacts:
-            a.materialize(path)
+        if len(self.artifacts) < 2:
+            for a in self.artifacts:
+                a.materialize(path)
+            return
+
+        path = os.path.abspath(str(path))
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.ebonite_materialize_', dir=parent)
+        try:
+            total = len(self.artifacts)
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, total),
+                                    thread_name_prefix='ebonite_materialize') as pool:
+                futures = [pool.submit(a.materialize, staging) for a in self.artifacts]
+                try:
+                    for i, future in enumerate(as_completed(futures), 1):
+                        future.result()
+                        logger.debug('Materialized %s of %s artifacts to %s', i, total, path)
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            self._move_tree(staging, path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def _move_tree(src: str, dst: str):
+        if not os.path.exists(dst):
+            os.replace(src, dst)
+            return
+        for root, _, files in os.walk(src):
+            target = os.path.join(dst, os.path.relpath(root, src))
+            os.makedirs(target, exist_ok=True)
+            for name in files:
+                os.replace(os.path.join(root, name), os.path.join(target, name))
 
     def bytes_dict(self) -> typing.Dict[str, bytes]:
         return {k: v for a in self.artifacts for k, v in a.bytes_dict().items()}
@@ -1,13 +1,16 @@
 import datetime
 import getpass
 import json
+import multiprocessing
 import re
 import tempfile
 import time
 import warnings
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from copy import copy
-from functools import wraps
+from functools import partial, wraps
+from itertools import zip_longest
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from pyjackson import deserialize, serialize
@@ -24,9 +27,10 @@ from ebonite.core.objects.artifacts import ArtifactCollection, CompositeArtifact
 from ebonite.core.objects.base import EboniteParams
 from ebonite.core.objects.dataset_source import AbstractDataset, Dataset, DatasetSource, InMemoryDatasetSource
 from ebonite.core.objects.dataset_type import DatasetType
-from ebonite.core.objects.metric import Metric
+from ebonite.core.objects.metric import Metric, MetricSetAccumulator
 from ebonite.core.objects.requirements import AnyRequirements, Requirements, resolve_requirements
 from ebonite.core.objects.wrapper import ModelWrapper, WrapperArtifactCollection
+from ebonite.utils.hashing import hash_parts
 from ebonite.utils.index_dict import IndexDict, IndexDictAccessor
 from ebonite.utils.log import logger
 from ebonite.utils.module import get_python_version
@@ -330,6 +334,33 @@ class Project(EboniteObject):
         return """Project '{name}', {td} tasks""".format(name=self.name, td=len(self.tasks))
 
 
+EVALUATION_BATCH_SIZE = 100000
+
+
+def _evaluate_batches(input: DatasetSource, output: DatasetSource, metrics: Dict[str, Metric],
+                      calls: Dict[str, Callable], batch_size: int) -> Dict[str, Dict[str, Any]]:
+    """Reads input and output datasets once batch by batch, calls every callable on input batches
+    and accumulates metrics on results
+
+    :param input: input data
+    :param output: target
+    :param metrics: dict of metrics to evaluate
+    :param calls: dict of name -> callable to evaluate
+    :param batch_size: number of rows in batch
+    :return: dict of callable name -> metric name -> score"""
+    accumulators = {name: MetricSetAccumulator(metrics) for name in calls}
+    if input.dataset_type.batchable and output.dataset_type.batchable:
+        batches = zip_longest(input.read_batches(batch_size), output.read_batches(batch_size))
+    else:
+        batches = [(input.read(), output.read())]
+    for input_batch, output_batch in batches:
+        if input_batch is None or output_batch is None:
+            raise ValueError('input and output datasets have different number of rows')
+        for name, call in calls.items():
+            accumulators[name].update(output_batch.data, call(input_batch.data))
+    return {name: accumulator.result() for name, accumulator in accumulators.items()}
+
+
 class EvaluationSet(EboniteParams):
     """Represents a set of objects for evaluation
 
@@ -728,31 +759,151 @@ class Task(EboniteObject, WithDatasetRepository):
         if save:
             self.save()
 
-    def evaluate_all(self, force=False, save_result=True) -> Dict[str, 'EvaluationResult']:
-        """Evaluates all viable pairs of evalsets and models/pipelines
+    def evaluate_all(self, force=False, save_result=True, workers: int = 1,
+                     batch_size: int = EVALUATION_BATCH_SIZE) -> Dict[str, 'EvaluationResult']:
+        """Evaluates all viable pairs of evalsets and models/pipelines.
+        Every evalset dataset is read once, and if `workers` > 1 and fork is the multiprocessing start method
+        evaluations are run in forked processes which share datasets with this one. Evaluated objects are written to meta in one batch
 
         :param force: force reevaluate already evaluated
-        :param save_result: save evaluation results to meta"""
+        :param save_result: save evaluation results to meta
+        :param workers: number of processes to run evaluations in
+        :param batch_size: number of rows to evaluate at once"""
         result = {}
         timestamp = time.time()
+        jobs: List[_EvaluationJob] = []
         for name, evalset in self.evaluation_sets.items():
             input, output, metrics = evalset.get(self, cache=True)
             for model in self._models.values():
-                evaluate = model.evaluate(input, output, metrics, evaluation_name=name,
-                                          timestamp=timestamp, force=force, save=save_result)
-                if isinstance(evaluate, dict):
-                    for method, res in evaluate.items():
-                        result[f'{model.name}.{method}'] = res
-                elif isinstance(evaluate, EvaluationResult):
-                    result[model.name] = evaluate
+                methods = model.wrapper.match_methods_by_type(input.dataset_type, output.dataset_type)
+                for method in methods:
+                    key = f'{model.name}.{method}' if len(methods) > 1 else model.name
+                    fingerprint = None if force else evaluation_fingerprint(model, method, input, output, metrics)
+                    evaluations = model.evaluations.get(method, {})
+                    cached = evaluations[name].find(fingerprint) if name in evaluations and not force else None
+                    if cached is not None:
+                        result[key] = cached
+                        continue
+                    jobs.append(_EvaluationJob(key, model, name, method, partial(model.wrapper.call_method, method),
+                                               input, output, metrics, fingerprint))
             for pipeline in self._pipelines.values():
-                evaluate = pipeline.evaluate(input, output, metrics, evaluation_name=name,
-                                             timestamp=timestamp, force=force, save=save_result)
-                if evaluate is not None:
-                    result[pipeline.name] = evaluate
+                if input.dataset_type != pipeline.input_data or output.dataset_type != pipeline.output_data:
+                    continue
+                fingerprint = None if force else evaluation_fingerprint(pipeline, None, input, output, metrics)
+                evaluations = pipeline.evaluations
+                cached = evaluations[name].find(fingerprint) if name in evaluations and not force else None
+                if cached is not None:
+                    result[pipeline.name] = cached
+                    continue
+                jobs.append(_EvaluationJob(pipeline.name, pipeline, name, None, pipeline.run,
+                                           input, output, metrics, fingerprint))
+
+        if save_result:
+            for job in jobs:
+                job.obj._check_meta(True)
+
+        changed = {}
+        for job, scores in zip(jobs, _run_evaluation_jobs(jobs, workers, batch_size)):
+            result[job.key] = EvaluationResult(timestamp, scores, job.fingerprint)
+            if save_result:
+                job.add_result(result[job.key])
+                changed[id(job.obj)] = job.obj
+        if changed:
+            self._save_evaluated(list(changed.values()))
+        return result
+
+    @staticmethod
+    def _save_evaluated(objects: List[Union['Model', 'Pipeline']]):
+        """Writes evaluated models and pipelines to their metadata repositories in one batch per repository
+
+        :param objects: models and pipelines to save"""
+        by_meta = {}
+        for obj in objects:
+            if isinstance(obj, Model) and obj._unpersisted_artifacts is not None:
+                obj._art.push_model_artifacts(obj)
+            by_meta.setdefault(id(obj._meta), (obj._meta, []))[1].append(obj)
+        for meta, objs in by_meta.values():
+            meta.update_models_and_pipelines(objs)
+
+
+class _EvaluationJob:
+    """Evaluation of model method or pipeline on evalset
+
+    :param key: name of the result in :meth:`Task.evaluate_all` result
+    :param obj: model or pipeline
+    :param evaluation_name: evalset name
+    :param method_name: model method name or None for pipeline
+    :param call: callable to evaluate
+    :param input: input data
+    :param output: target
+    :param metrics: dict of metrics to evaluate
+    :param fingerprint: fingerprint of this evaluation"""
+
+    def __init__(self, key: str, obj: Union['Model', 'Pipeline'], evaluation_name: str, method_name: Optional[str],
+                 call: Callable, input: DatasetSource, output: DatasetSource, metrics: Dict[str, Metric],
+                 fingerprint: Optional[str] = None):
+        self.key = key
+        self.obj = obj
+        self.evaluation_name = evaluation_name
+        self.method_name = method_name
+        self.call = call
+        self.input = input
+        self.output = output
+        self.metrics = metrics
+        self.fingerprint = fingerprint
+
+    def run(self, batch_size: int) -> Dict[str, Any]:
+        return _evaluate_batches(self.input, self.output, self.metrics, {self.key: self.call}, batch_size)[self.key]
+
+    def add_result(self, result: 'EvaluationResult') -> 'EvaluationResult':
+        evaluations = self.obj.evaluations
+        if self.method_name is not None:
+            evaluations = evaluations.setdefault(self.method_name, {})
+        evaluations.setdefault(self.evaluation_name, EvaluationResultCollection()).add(result)
         return result
 
 
+# jobs are passed to forked workers through module global so they are not pickled,
+# that is why they are run in parallel only where fork is the start method
+_evaluation_jobs: List[_EvaluationJob] = []
+
+
+def _run_forked_evaluation_job(index: int, batch_size: int):
+    return _evaluation_jobs[index].run(batch_size)
+
+
+def _default_start_method() -> str:
+    # first of all start methods is platform default, unlike get_start_method this does not fix it
+    return multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_all_start_methods()[0]
+
+
+def _run_evaluation_jobs(jobs: List[_EvaluationJob], workers: int, batch_size: int) -> List[Dict[str, Any]]:
+    """Runs evaluation jobs either in this process or in a pool of forked processes
+
+    :param jobs: jobs to run
+    :param workers: number of processes
+    :param batch_size: number of rows to evaluate at once
+    :return: list of scores for each job"""
+    if workers > 1 and len(jobs) > 1 and _default_start_method() != 'fork':
+        logger.warning('Parallel evaluation requires fork start method, running evaluations sequentially')
+        workers = 1
+    if workers <= 1 or len(jobs) <= 1:
+        return [job.run(batch_size) for job in jobs]
+
+    # read datasets before fork so workers share them instead of reading on their own
+    for job in jobs:
+        job.input.read()
+        job.output.read()
+    global _evaluation_jobs
+    _evaluation_jobs = jobs
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            return list(pool.map(_run_forked_evaluation_job, range(len(jobs)), [batch_size] * len(jobs)))
+    finally:
+        _evaluation_jobs = []
+
+
 class _InTask(EboniteObject):
     """Intermediate abstract class for object inside task"""
 
@@ -784,11 +935,13 @@ class EvaluationResult(EboniteParams):
 
     :param scores: mapping 'metric' -> 'score'
     :param timestamp: time of evaluation
+    :param fingerprint: hash of evaluated object, datasets and metrics, see :func:`evaluation_fingerprint`
     """
 
-    def __init__(self, timestamp: float, scores: Dict[str, float] = None):
+    def __init__(self, timestamp: float, scores: Dict[str, float] = None, fingerprint: str = None):
         self.timestamp = timestamp
         self.scores = scores or {}
+        self.fingerprint = fingerprint
 
 
 @make_string
@@ -810,6 +963,38 @@ class EvaluationResultCollection(EboniteParams):
             return
         return max(self.results, key=lambda r: r.timestamp)
 
+    def find(self, fingerprint: Optional[str]) -> Optional[EvaluationResult]:
+        """Returns latest result with given fingerprint, or just latest result if fingerprint is unknown
+
+        :param fingerprint: fingerprint of evaluation
+        :return: result or None if there is no such result"""
+        if fingerprint is None:
+            return self.latest
+        results = [r for r in self.results if r.fingerprint == fingerprint]
+        return max(results, key=lambda r: r.timestamp) if results else None
+
+
+def evaluation_fingerprint(obj: Union['Model', 'Pipeline'], method_name: Optional[str], input: DatasetSource,
+                           output: DatasetSource, metrics: Dict[str, Metric]) -> Optional[str]:
+    """Computes hash of evaluation, which is used to skip evaluations of unchanged objects on unchanged data.
+    Datasets are not fingerprinted if object fingerprint is unknown
+
+    :param obj: model or pipeline to evaluate
+    :param method_name: model method name or None for pipeline
+    :param input: input data
+    :param output: target
+    :param metrics: dict of metrics to evaluate
+    :return: hex digest or None if object or some of the datasets have no fingerprint"""
+    obj_fingerprint = obj.fingerprint()
+    if obj_fingerprint is None:
+        return None
+    parts = [obj_fingerprint, method_name or '', input.fingerprint(), output.fingerprint()]
+    for name in sorted(metrics):
+        parts += [name, metrics[name].fingerprint()]
+    if any(p is None for p in parts):
+        return None
+    return hash_parts(*parts)
+
 
 EvaluationResults = Dict[str, EvaluationResultCollection]  # Evaluation results for all evalsets
 MultipleResults = Dict[str, EvaluationResult]  # Evaluation results for multiple objects but one evalset
@@ -878,6 +1063,7 @@ class Model(_InTask):
         self.requirements = requirements
         self._persisted_artifacts = artifact
         self._unpersisted_artifacts: Optional[ArtifactCollection] = None
+        self._fingerprint: Optional[Tuple[tuple, Optional[str]]] = None  # (state, fingerprint)
 
     def load(self):
         """
@@ -896,6 +1082,22 @@ class Model(_InTask):
         if self.wrapper.model is None:
             self.load()
 
+    def fingerprint(self) -> Optional[str]:
+        """Returns hash of model wrapper and stored hashes of persisted artifacts. Artifacts are never read,
+        so it is `None` if model has unpersisted artifacts or its artifacts do not know their hashes.
+        Result is memoized until wrapper or artifacts of model change"""
+        state = (self._wrapper, self._wrapper_meta, self._persisted_artifacts, self._unpersisted_artifacts)
+        if self._fingerprint is not None and all(a is b for a, b in zip(self._fingerprint[0], state)):
+            return self._fingerprint[1]
+        fingerprint = None
+        if self._unpersisted_artifacts is None and self._persisted_artifacts is not None:
+            artifacts = self._persisted_artifacts.fingerprint()
+            if artifacts is not None:
+                meta = self._wrapper_meta if self._wrapper_meta is not None else serialize(self.wrapper)
+                fingerprint = hash_parts(json.dumps(meta, sort_keys=True, default=str), artifacts)
+        self._fingerprint = (state, fingerprint)
+        return fingerprint
+
     @property
     def wrapper(self) -> 'ModelWrapper':
         if self._wrapper is None:
@@ -1018,7 +1220,8 @@ class Model(_InTask):
                params: Dict[str, Any] = None, description: str = None,
                additional_artifacts: ArtifactCollection = None, additional_requirements: AnyRequirements = None,
                custom_wrapper: ModelWrapper = None, custom_artifact: ArtifactCollection = None,
-               custom_requirements: AnyRequirements = None) -> 'Model':
+               custom_requirements: AnyRequirements = None,
+               output_types: Dict[str, DatasetType] = None) -> 'Model':
         """
         Creates Model instance from arbitrary model objects and sample of input data
 
@@ -1032,9 +1235,11 @@ class Model(_InTask):
         :param custom_wrapper: Custom model wrapper.
         :param custom_artifact: Custom artifact collection to replace all other.
         :param custom_requirements: Custom requirements to replace all other.
+        :param output_types: Declared output types of model methods, these methods are not called for analysis.
         :returns: :py:class:`Model`
         """
-        wrapper: ModelWrapper = custom_wrapper or ModelAnalyzer.analyze(model_object, input_data=input_data)
+        wrapper: ModelWrapper = custom_wrapper or ModelAnalyzer.analyze(model_object, input_data=input_data,
+                                                                        output_types=output_types)
         name = model_name or _generate_model_name(wrapper)
 
         artifact = custom_artifact or WrapperArtifactCollection(wrapper)
@@ -1139,7 +1344,8 @@ class Model(_InTask):
     def evaluate_set(self, evalset: Union[str, EvaluationSet],
                      evaluation_name: str = None, method_name: str = None,
                      timestamp=None, save=True, force=False,
-                     raise_on_error=False) -> Optional[EvaluationResult]:
+                     raise_on_error=False, batch_size: int = EVALUATION_BATCH_SIZE,
+                     cache: bool = True) -> Optional[EvaluationResult]:
         """Evaluates this model
 
         :param evalset: evalset or it's name
@@ -1149,6 +1355,8 @@ class Model(_InTask):
         :param save: save results to meta
         :param force: force reevalute
         :param raise_on_error: raise error if datatypes are incorrect or just return
+        :param batch_size: number of rows to evaluate at once
+        :param cache: share evalset datasets through process-wide dataset cache
         """
         task = self.task
         if isinstance(evalset, str):
@@ -1157,15 +1365,16 @@ class Model(_InTask):
                 evalset = task.evaluation_sets[evalset]
             except KeyError:
                 raise ValueError(f'No evalset {evalset} in {task}')
-        input, output, metrics = evalset.get(task, False)
+        input, output, metrics = evalset.get(task, cache)
         return self.evaluate(input, output, metrics, evaluation_name, method_name, timestamp, save, force,
-                             raise_on_error)
+                             raise_on_error, batch_size)
 
     def evaluate(self, input: DatasetSource, output: DatasetSource, metrics: Dict[str, Metric],
                  evaluation_name: str = None, method_name: str = None,
                  timestamp=None, save=True, force=False,
-                 raise_on_error=False) -> Optional[Union[EvaluationResult, Dict[str, EvaluationResult]]]:
-        """Evaluates this model
+                 raise_on_error=False, batch_size: int = EVALUATION_BATCH_SIZE
+                 ) -> Optional[Union[EvaluationResult, Dict[str, EvaluationResult]]]:
+        """Evaluates this model. Datasets are read once and processed by batches
 
         :param input: input data
         :param output: target
@@ -1176,6 +1385,7 @@ class Model(_InTask):
         :param save: save results to meta
         :param force: force reevalute
         :param raise_on_error: raise error if datatypes are incorrect or just return
+        :param batch_size: number of rows to evaluate at once
         """
         if method_name is None:
             methods = self.wrapper.match_methods_by_type(input.dataset_type, output.dataset_type)
@@ -1199,22 +1409,28 @@ class Model(_InTask):
         results: Dict[str, EvaluationResult] = {}  # method -> result
         timestamp = timestamp or time.time()
 
+        calls = {}
+        fingerprints = {}
         for method_name in methods:
             self.evaluations.setdefault(method_name, {})
-            if evaluation_name in self.evaluations[method_name] and not force:
-                results[method_name] = self.evaluations[method_name][evaluation_name].latest
-                continue
+            fingerprint = None if force else evaluation_fingerprint(self, method_name, input, output, metrics)
+            collection = self.evaluations[method_name].get(evaluation_name)
+            cached = collection.find(fingerprint) if collection is not None and not force else None
+            if cached is not None:
+                results[method_name] = cached
+            else:
+                calls[method_name] = partial(self.wrapper.call_method, method_name)
+                fingerprints[method_name] = fingerprint
+                results[method_name] = None
 
-            call = self.wrapper.call_method(method_name, input.read().data)
-            scores = {}
-            for mname, metric in metrics.items():
-                scores[mname] = metric.evaluate(output.read().data, call)
-            results[method_name] = EvaluationResult(timestamp, scores)
+        if len(calls) > 0:
+            for method_name, scores in _evaluate_batches(input, output, metrics, calls, batch_size).items():
+                results[method_name] = EvaluationResult(timestamp, scores, fingerprints[method_name])
 
         if save:
-            for method_name, result in results.items():
+            for method_name in calls:
                 self.evaluations[method_name].setdefault(evaluation_name, EvaluationResultCollection())
-                self.evaluations[method_name][evaluation_name].add(result)
+                self.evaluations[method_name][evaluation_name].add(results[method_name])
             self.save()
 
         if len(results) == 1:
@@ -1306,6 +1522,15 @@ class Pipeline(_InTask):
             data = model.wrapper.call_method(step.method_name, data)
         return data
 
+    def fingerprint(self) -> Optional[str]:
+        """Returns hash of pipeline steps and their models, or `None` if some of the models have no fingerprint"""
+        parts = [json.dumps([[step.model_name, step.method_name] for step in self.steps])]
+        for name in sorted({step.model_name for step in self.steps}):
+            parts.append(self.models[name].fingerprint())
+        if any(p is None for p in parts):
+            return None
+        return hash_parts(*parts)
+
     def append(self, model: Union[Model, _WrapperMethodAccessor], method_name: str = None):
         """Appends another Model to the sequence of this pipeline steps
 
@@ -1335,7 +1560,8 @@ class Pipeline(_InTask):
     def evaluate_set(self, evalset: Union[str, EvaluationSet],
                      evaluation_name: str = None,
                      timestamp=None, save=True, force=False,
-                     raise_on_error=False) -> Optional[EvaluationResult]:
+                     raise_on_error=False, batch_size: int = EVALUATION_BATCH_SIZE,
+                     cache: bool = True) -> Optional[EvaluationResult]:
         """Evaluates this pipeline
 
         :param evalset: evalset or it's name
@@ -1344,6 +1570,8 @@ class Pipeline(_InTask):
         :param save: save results to meta
         :param force: force reevalute
         :param raise_on_error: raise error if datatypes are incorrect or just return
+        :param batch_size: number of rows to evaluate at once
+        :param cache: share evalset datasets through process-wide dataset cache
         """
         task = self.task
         if isinstance(evalset, str):
@@ -1352,14 +1580,15 @@ class Pipeline(_InTask):
                 evalset = task.evaluation_sets[evalset]
             except KeyError:
                 raise ValueError(f'No evalset {evalset} in {task}')
-        input, output, metrics = evalset.get(task, False)
-        return self.evaluate(input, output, metrics, evaluation_name, timestamp, save, force, raise_on_error)
+        input, output, metrics = evalset.get(task, cache)
+        return self.evaluate(input, output, metrics, evaluation_name, timestamp, save, force, raise_on_error,
+                             batch_size)
 
     def evaluate(self, input: DatasetSource, output: DatasetSource, metrics: Dict[str, Metric],
                  evaluation_name: str = None,
                  timestamp=None, save=True, force=False,
-                 raise_on_error=False) -> Optional[EvaluationResult]:
-        """Evaluates this pipeline
+                 raise_on_error=False, batch_size: int = EVALUATION_BATCH_SIZE) -> Optional[EvaluationResult]:
+        """Evaluates this pipeline. Datasets are read once and processed by batches
 
         :param input: input data
         :param output: target
@@ -1369,28 +1598,30 @@ class Pipeline(_InTask):
         :param save: save results to meta
         :param force: force reevalute
         :param raise_on_error: raise error if datatypes are incorrect or just return
+        :param batch_size: number of rows to evaluate at once
         """
+        if input.dataset_type != self.input_data or output.dataset_type != self.output_data:
+            if raise_on_error:
+                raise ValueError('incompatible dataset types for evaluation')
+            return
+        fingerprint = None if force else evaluation_fingerprint(self, None, input, output, metrics)
         if evaluation_name in self.evaluations and not force:
-            return self.evaluations[evaluation_name].latest
+            cached = self.evaluations[evaluation_name].find(fingerprint)
+            if cached is not None:
+                return cached
         if save:
             if evaluation_name is None:
                 raise ValueError('Provide evaluation_name to save evaluation or set save = False')
             self._check_meta(True)
         timestamp = timestamp or time.time()
 
-        if input.dataset_type == self.input_data and output.dataset_type == self.output_data:
-            scores = {}
-            call = self.run(input.read().data)
-            for mname, metric in metrics.items():
-                scores[mname] = metric.evaluate(output.read().data, call)
-            result = EvaluationResult(timestamp, scores)
-            if save:
-                self.evaluations.setdefault(evaluation_name, EvaluationResultCollection())
-                self.evaluations[evaluation_name].add(result)
-                self.save()
-            return result
-        elif raise_on_error:
-            raise ValueError('incompatible dataset types for evaluation')
+        scores = _evaluate_batches(input, output, metrics, {'run': self.run}, batch_size)['run']
+        result = EvaluationResult(timestamp, scores, fingerprint)
+        if save:
+            self.evaluations.setdefault(evaluation_name, EvaluationResultCollection())
+            self.evaluations[evaluation_name].add(result)
+            self.save()
+        return result
 
 
 @type_field('type')
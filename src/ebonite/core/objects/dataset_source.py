@@ -1,13 +1,20 @@
+import json
+import threading
+import weakref
 from abc import abstractmethod
-from collections import Iterable
-from typing import Any, Optional
+from collections import Iterable, OrderedDict
+from typing import Any, Callable, Iterator, Optional, Tuple
 
+from pyjackson import serialize
 from pyjackson.core import Unserializable
-from pyjackson.decorators import type_field
+from pyjackson.decorators import make_string, type_field
+from pyjackson.errors import SerializationError
 
+from ebonite.config import Core
 from ebonite.core.analyzer.dataset import DatasetAnalyzer
 from ebonite.core.objects.base import EboniteParams
 from ebonite.core.objects.dataset_type import DatasetType
+from ebonite.utils.hashing import hash_parts, params_digest
 
 
 class AbstractDataset(Unserializable):
@@ -55,6 +62,23 @@ class Dataset(AbstractDataset):
     def get(self):
         return self.data
 
+    def iterate_batches(self, batch_size: int) -> Iterator['Dataset']:
+        """Iterates through data in batches of `batch_size` rows.
+        Data which dataset type is not batchable is yielded as one batch
+
+        :param batch_size: number of rows in batch"""
+        try:
+            size = len(self.data) if self.dataset_type.batchable else None
+        except TypeError:
+            size = None
+        if size is None:
+            yield self
+            return
+        # use positional indexing for pandas objects
+        data = getattr(self.data, 'iloc', self.data)
+        for start in range(0, size, batch_size):
+            yield Dataset(data[start:start + batch_size], self.dataset_type)
+
     @classmethod
     def from_object(cls, data):
         """Creates Dataset instance from raw data object"""
@@ -80,13 +104,127 @@ class DatasetSource(EboniteParams):
         """Abstract method that must return produced Dataset instance"""
         raise NotImplementedError()
 
+    def read_batches(self, batch_size: int) -> Iterator[Dataset]:
+        """Produces Dataset in batches of `batch_size` rows.
+        Reads whole dataset by default, subclasses should override it to read data by chunks
+
+        :param batch_size: number of rows in batch"""
+        yield from self.read().iterate_batches(batch_size)
+
     def cache(self):
         """Returns :class:`.CachedDatasetSource` that will cache data on the first read"""
         return CachedDatasetSource(self)
 
+    def cache_key(self) -> Optional[str]:
+        """Returns key to share data of this source in :data:`DATASET_CACHE`, or `None` if it could not be shared.
+        By default it is a hash of this source's representation, so it is `None` for dynamic and unserializable
+        sources"""
+        if self.is_dynamic:
+            return None
+        try:
+            return hash_parts(json.dumps(serialize(self, DatasetSource), sort_keys=True))
+        except (SerializationError, TypeError):
+            return None
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns hash of dataset type and content, or `None` for dynamic sources which content may change.
+        Reads and hashes the whole dataset by default, subclasses should override it if there is a cheaper way"""
+        if self.is_dynamic:
+            return None
+        dataset = self.read()
+        return hash_parts(params_digest(dataset.dataset_type, DatasetType),
+                          dataset.dataset_type.hash_data(dataset.data))
+
+
+@make_string
+class DatasetCacheStats:
+    """Statistics of :class:`DatasetCache`
+
+    :param hits: number of reads served from cache
+    :param misses: number of reads from sources
+    :param evictions: number of datasets evicted to fit memory budget
+    :param size: estimated size of cached datasets in bytes
+    :param count: number of cached datasets"""
+
+    def __init__(self, hits: int, misses: int, evictions: int, size: int, count: int):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.size = size
+        self.count = count
+
+
+class DatasetCache:
+    """Thread-safe LRU cache of datasets which keeps their total estimated size within memory budget.
+    Evicted datasets are still returned from cache while they are referenced somewhere else
+
+    :param max_size: memory budget in bytes"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._datasets: 'OrderedDict[str, Tuple[Dataset, int]]' = OrderedDict()
+        self._in_use = weakref.WeakValueDictionary()
+        self._size = 0
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: str, read: Callable[[], Dataset]) -> Dataset:
+        """Returns cached dataset or reads it and puts it to cache
+
+        :param key: dataset key
+        :param read: function to read dataset if it is not cached"""
+        with self._lock:
+            if key in self._datasets:
+                self._datasets.move_to_end(key)
+                self._hits += 1
+                return self._datasets[key][0]
+            dataset = self._in_use.get(key)
+            if dataset is not None:
+                self._hits += 1
+                self._put(key, dataset)
+                return dataset
+            self._misses += 1
+        dataset = read()
+        with self._lock:
+            self._put(key, dataset)
+        return dataset
+
+    def _put(self, key: str, dataset: Dataset):
+        self._in_use[key] = dataset
+        if key in self._datasets:
+            return
+        size = dataset.dataset_type.data_size(dataset.data)
+        if size > self.max_size:
+            return
+        self._datasets[key] = (dataset, size)
+        self._size += size
+        while self._size > self.max_size:
+            _, (_, evicted_size) = self._datasets.popitem(last=False)
+            self._size -= evicted_size
+            self._evictions += 1
+
+    def stats(self) -> DatasetCacheStats:
+        """Returns cache statistics"""
+        with self._lock:
+            return DatasetCacheStats(self._hits, self._misses, self._evictions, self._size, len(self._datasets))
+
+    def clear(self):
+        """Removes all datasets from cache and resets statistics"""
+        with self._lock:
+            self._datasets.clear()
+            self._in_use.clear()
+            self._size = 0
+            self._hits = self._misses = self._evictions = 0
+
+
+#: process-wide cache used by :class:`CachedDatasetSource`
+DATASET_CACHE = DatasetCache(Core.DATASET_CACHE_SIZE)
+
 
 class CachedDatasetSource(DatasetSource):
-    """Wrapper that will cache the result of underlying source on the first read
+    """Wrapper that will cache the result of underlying source on the first read.
+    Data of sources with :meth:`~DatasetSource.cache_key` is shared through :data:`DATASET_CACHE`,
+    and wrapper keeps it even if it does not fit cache or is evicted, so it is read once for wrapper's lifetime
 
     :param source: underlying DatasetSource"""
 
@@ -94,15 +232,32 @@ class CachedDatasetSource(DatasetSource):
         super().__init__(source.dataset_type)
         self.source = source
         self._cache: Optional[Dataset] = None
+        self._fingerprint: Optional[str] = None
 
     def read(self) -> Dataset:
-        if self._cache is None:
+        if self._cache is not None:
+            return self._cache
+        key = self.source.cache_key()
+        if key is None:
             self._cache = self.source.read()
+        else:
+            self._cache = DATASET_CACHE.get(key, self.source.read)
         return self._cache
 
     def cache(self):
         return self
 
+    def fingerprint(self) -> Optional[str]:
+        if self._fingerprint is None:
+            self._fingerprint = self._compute_fingerprint()
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> Optional[str]:
+        if type(self.source).fingerprint is DatasetSource.fingerprint:
+            # default fingerprint hashes data, so read it through cache instead of reading it once more
+            return DatasetSource.fingerprint(self) if not self.source.is_dynamic else None
+        return self.source.fingerprint()
+
 
 class InMemoryDatasetSource(CachedDatasetSource, Unserializable):
     """DatasetSource that holds existing dataset inmemory
@@ -112,3 +267,6 @@ class InMemoryDatasetSource(CachedDatasetSource, Unserializable):
     def __init__(self, dataset: Dataset):
         super().__init__(DatasetSource(dataset.dataset_type))
         self._cache = dataset
+
+    def _compute_fingerprint(self) -> Optional[str]:
+        return DatasetSource.fingerprint(self)
@@ -1,4 +1,6 @@
 import builtins
+import json
+import sys
 from abc import abstractmethod
 from typing import Dict, List, Sized
 
@@ -10,6 +12,7 @@ from pyjackson.errors import DeserializationError, SerializationError
 from ebonite.core.objects.base import EboniteParams
 from ebonite.core.objects.requirements import InstallableRequirement, Requirements
 from ebonite.core.objects.typing import SizedTypedListType, TypeWithSpec
+from ebonite.utils.hashing import hash_parts
 
 
 @type_field('type')
@@ -17,8 +20,12 @@ class DatasetType(EboniteParams, TypeWithSpec):
     """
     Base class for dataset type metadata.
     Children of this class must be both pyjackson-serializable and be a pyjackson serializer for it's dataset type
+
+    Children should set `batchable` to True if their datasets are collections of rows which may be split into batches
+    with slicing and processed independently
     """
     type = None
+    batchable = False
 
     @staticmethod
     def _check_type(obj, exp_type, exc_type):
@@ -34,6 +41,34 @@ class DatasetType(EboniteParams, TypeWithSpec):
     def get_writer(self):
         """"""  # TODO docs
 
+    def hash_data(self, instance) -> str:
+        """Computes hash of dataset content. Hashes serialized representation by default,
+        children should override it if there is a faster way
+
+        :param instance: dataset of this type
+        :return: hex digest"""
+        return hash_parts(json.dumps(self.serialize(instance), sort_keys=True, default=str))
+
+    def data_size(self, instance) -> int:
+        """Estimates memory size of dataset in bytes. Shallow size is used by default,
+        children should override it for container types
+
+        :param instance: dataset of this type
+        :return: size in bytes"""
+        return sys.getsizeof(instance)
+
+    def head(self, instance, size: int):
+        """Returns first `size` rows of dataset. Batchable datasets are sliced, others are returned as is,
+        children should override it if there is a way to take part of their datasets
+
+        :param instance: dataset of this type
+        :param size: number of rows
+        :return: dataset of this type"""
+        if not self.batchable:
+            return instance
+        # use positional indexing for pandas objects
+        return getattr(instance, 'iloc', instance)[:size]
+
 
 class LibDatasetTypeMixin(DatasetType):
     """
@@ -113,6 +148,9 @@ class ListDatasetType(DatasetType, SizedTypedListType):
     def requirements(self) -> Requirements:
         return self.dtype.requirements
 
+    def data_size(self, instance: list) -> int:
+        return sys.getsizeof(instance) + sum(self.dtype.data_size(o) for o in instance)
+
     def get_writer(self):
         from ebonite.repository.dataset.artifact import PickleWriter
         return PickleWriter()
@@ -142,6 +180,9 @@ class _TupleLikeDatasetType(DatasetType):
     def requirements(self) -> Requirements:
         return sum([i.requirements for i in self.items], Requirements())
 
+    def data_size(self, instance: Sized) -> int:
+        return sys.getsizeof(instance) + sum(t.data_size(o) for t, o in zip(self.items, instance))
+
     def get_writer(self):
         from ebonite.repository.dataset.artifact import PickleWriter
         return PickleWriter()
@@ -201,6 +242,9 @@ class DictDatasetType(DatasetType):
     def requirements(self) -> Requirements:
         return sum([i.requirements for i in self.item_types.values()], Requirements())
 
+    def data_size(self, instance: dict) -> int:
+        return sys.getsizeof(instance) + sum(self.item_types[k].data_size(v) for k, v in instance.items())
+
     def get_writer(self):
         from ebonite.repository.dataset.artifact import PickleWriter
         return PickleWriter()
@@ -1,25 +1,209 @@
 import base64
+import io
 import os
+import sys
 import tempfile
 import zlib
 from abc import abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from pyjackson.decorators import cached_property, type_field
 
 from ebonite.core.objects.base import EboniteParams
 from ebonite.core.objects.requirements import Requirements
 from ebonite.core.objects.wrapper import PickleModelIO
+from ebonite.utils.hashing import params_digest
 from ebonite.utils.importing import import_string
 from ebonite.utils.module import get_object_requirements
 
 
+def concat_batches(batches: List[Any]):
+    """Concatenates batches of lists, numpy arrays, pandas or torch objects into one object
+
+    :param batches: list of batches of the same type"""
+    if len(batches) == 1:
+        return batches[0]
+    first = batches[0]
+    if isinstance(first, list):
+        return [row for batch in batches for row in batch]
+    lib = type(first).__module__.split('.')[0]
+    if lib == 'numpy':
+        return sys.modules['numpy'].concatenate(batches)
+    if lib == 'pandas':
+        pd = sys.modules['pandas']
+        # default indexes are renumbered instead of repeating
+        return pd.concat(batches, ignore_index=all(isinstance(b.index, pd.RangeIndex) for b in batches))
+    if lib == 'torch':
+        return sys.modules['torch'].cat(batches)
+    raise ValueError(f'Cannot concatenate batches of type {type(first)}')
+
+
+def to_array(data):
+    """Converts lists, numpy, pandas or torch objects to contiguous numpy array
+
+    :param data: object to convert"""
+    import numpy as np
+    if hasattr(data, 'to_numpy'):  # pandas objects
+        data = data.to_numpy()
+    return np.ascontiguousarray(data)
+
+
+class MetricBatch:
+    """Batch of targets and predictions shared by all metrics evaluated on it.
+    Arrays and intermediate values (e.g. confusion matrix) are computed once on first request
+
+    :param truth: batch of targets
+    :param prediction: batch of predictions"""
+
+    def __init__(self, truth, prediction):
+        self.truth = truth
+        self.prediction = prediction
+        self._shared = {}
+
+    def shared(self, key: str, compute: Callable[[], Any]):
+        """Returns intermediate value computed for this batch, computing it on first request
+
+        :param key: name of intermediate value
+        :param compute: function to compute value"""
+        if key not in self._shared:
+            self._shared[key] = compute()
+        return self._shared[key]
+
+    @property
+    def truth_array(self):
+        """Targets as contiguous numpy array"""
+        return self.shared('truth_array', lambda: to_array(self.truth))
+
+    @property
+    def prediction_array(self):
+        """Predictions as contiguous numpy array"""
+        return self.shared('prediction_array', lambda: to_array(self.prediction))
+
+
+class MetricAccumulator:
+    """Base class for objects which evaluate metric batch by batch"""
+
+    @abstractmethod
+    def update(self, truth, prediction):
+        """Accumulates batch
+
+        :param truth: batch of targets
+        :param prediction: batch of predictions"""
+
+    def update_batch(self, batch: MetricBatch):
+        """Accumulates batch shared with other metrics. Calls :meth:`update` by default,
+        subclasses should override it to reuse batch arrays and intermediate values
+
+        :param batch: batch of targets and predictions"""
+        self.update(batch.truth, batch.prediction)
+
+    @abstractmethod
+    def result(self):
+        """Returns metric value for all accumulated batches"""
+
+
+class CollectingAccumulator(MetricAccumulator):
+    """Accumulator which collects all batches and evaluates metric on their concatenation
+
+    :param metric: metric to evaluate"""
+
+    def __init__(self, metric: 'Metric'):
+        self.metric = metric
+        self.truth = []
+        self.prediction = []
+
+    def update(self, truth, prediction):
+        self.truth.append(truth)
+        self.prediction.append(prediction)
+
+    def result(self):
+        if len(self.truth) == 0:
+            return self.metric.evaluate_batch(MetricBatch([], []))
+        return self.metric.evaluate_batch(MetricBatch(concat_batches(self.truth), concat_batches(self.prediction)))
+
+
+class MetricSetAccumulator(MetricAccumulator):
+    """Accumulator which evaluates several metrics in a single pass.
+    Every batch is wrapped in one :class:`MetricBatch` for all incremental metrics.
+    Batches for other metrics are collected and concatenated once
+
+    :param metrics: dict of metrics to evaluate"""
+
+    def __init__(self, metrics: Dict[str, 'Metric']):
+        self.metrics = metrics
+        self.accumulators: Dict[str, MetricAccumulator] = {}
+        self.collected: Dict[str, Metric] = {}
+        for name, metric in metrics.items():
+            accumulator = metric.accumulator()
+            if isinstance(accumulator, CollectingAccumulator):
+                self.collected[name] = metric
+            else:
+                self.accumulators[name] = accumulator
+        self.truth = []
+        self.prediction = []
+
+    def update(self, truth, prediction):
+        batch = MetricBatch(truth, prediction)
+        for accumulator in self.accumulators.values():
+            accumulator.update_batch(batch)
+        if self.collected:
+            self.truth.append(truth)
+            self.prediction.append(prediction)
+
+    def result(self) -> Dict[str, Any]:
+        """Returns dict of metric name -> metric value for all accumulated batches"""
+        scores = {name: accumulator.result() for name, accumulator in self.accumulators.items()}
+        if self.collected:
+            if len(self.truth) == 0:
+                batch = MetricBatch([], [])
+            else:
+                batch = MetricBatch(concat_batches(self.truth), concat_batches(self.prediction))
+            scores.update({name: metric.evaluate_batch(batch) for name, metric in self.collected.items()})
+        return {name: scores[name] for name in self.metrics}
+
+
+def evaluate_metrics(metrics: Dict[str, 'Metric'], truth, prediction) -> Dict[str, Any]:
+    """Evaluates several metrics sharing conversions and intermediate values between them
+
+    :param metrics: dict of metrics to evaluate
+    :param truth: targets
+    :param prediction: predictions
+    :return: dict of metric name -> metric value"""
+    accumulator = MetricSetAccumulator(metrics)
+    accumulator.update(truth, prediction)
+    return accumulator.result()
+
+
 @type_field('type')
 class Metric(EboniteParams):
     @abstractmethod
     def evaluate(self, truth, prediction):
         raise NotImplementedError()
 
+    def evaluate_batch(self, batch: MetricBatch):
+        """Evaluates metric on batch shared with other metrics. Calls :meth:`evaluate` by default
+
+        :param batch: batch of targets and predictions"""
+        return self.evaluate(batch.truth, batch.prediction)
+
+    def accumulator(self) -> MetricAccumulator:
+        """Returns accumulator to evaluate this metric batch by batch.
+        By default it collects all batches, subclasses should override it if metric may be computed incrementally"""
+        return CollectingAccumulator(self)
+
+    def fingerprint(self) -> str:
+        """Returns hash of this metric parameters"""
+        return params_digest(self, Metric)
+
+
+#: function full name -> factory of accumulator which computes this function with default arguments incrementally
+STREAMING_ACCUMULATORS: Dict[str, Callable[[], MetricAccumulator]] = {}
+#: function full name -> function which computes this function with default arguments from batch intermediates
+#: or returns `None` if batch is not supported
+SHARED_METRICS: Dict[str, Callable[[MetricBatch], Optional[Any]]] = {}
+#: names of root modules which metric functions are called with numpy arrays shared between metrics
+ARRAY_LIBRARIES: Set[str] = set()
+
 
 class LibFunctionMetric(Metric):
     def __init__(self, function: str, args: Dict[str, Any] = None, invert_input: bool = False):
@@ -37,6 +221,22 @@ class LibFunctionMetric(Metric):
         else:
             return self._function(truth, prediction, **self.args)
 
+    def evaluate_batch(self, batch: MetricBatch):
+        shared = SHARED_METRICS.get(self.function)
+        if shared is not None and not self.args and not self.invert_input:
+            result = shared(batch)
+            if result is not None:
+                return result
+        if self.function.split('.')[0] in ARRAY_LIBRARIES:
+            return self.evaluate(batch.truth_array, batch.prediction_array)
+        return super().evaluate_batch(batch)
+
+    def accumulator(self) -> MetricAccumulator:
+        factory = STREAMING_ACCUMULATORS.get(self.function)
+        if factory is None or self.args or self.invert_input:
+            return super().accumulator()
+        return factory()
+
 
 class CallableMetricWrapper:
     def __init__(self, artifacts: Dict[str, str], requirements: Requirements):
@@ -80,6 +280,11 @@ class CallableMetricWrapper:
         return CallableMetricWrapper(payload, reqs).bind(callable)
 
     def load(self):
+        if list(self.artifacts) == [PickleModelIO.model_filename]:
+            # plain pickle without refs is loaded from memory
+            payload = io.BytesIO(self.decompress(self.artifacts[PickleModelIO.model_filename]))
+            self.callable = PickleModelIO._deserialize_model(payload, {})
+            return
         with tempfile.TemporaryDirectory() as tmpdir:
             for path, art in self.artifacts.items():
                 with open(os.path.join(tmpdir, path), 'wb') as f:
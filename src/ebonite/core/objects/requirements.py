@@ -3,13 +3,18 @@ import glob
 import itertools
 import json
 import os
+import threading
 import zlib
+from collections import OrderedDict
+from copy import copy
 from types import ModuleType
-from typing import Dict, List, Type, TypeVar, Union
+from typing import Callable, Dict, Hashable, List, Optional, Type, TypeVar, Union
 
 from pyjackson.decorators import make_string, type_field
 
+from ebonite.core.objects.artifacts import ArtifactCollection, Blob, InMemoryBlob
 from ebonite.core.objects.base import EboniteParams
+from ebonite.utils.hashing import hash_parts
 
 # TODO i dont know how to do this better
 MODULE_PACKAGE_MAPPING = {
@@ -24,6 +29,38 @@ def read(path, bin=False):
         return f.read()
 
 
+class _LRUCache:
+    """
+    Small thread-safe LRU cache
+
+    :param size: maximum number of entries
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], object]):
+        """
+        Returns cached value for key, creating it on miss
+
+        :param key: cache key
+        :param factory: function to create value
+        :return: value
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        value = factory()
+        with self.lock:
+            self.entries[key] = value
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return value
+
+
 @type_field('type')
 class Requirement(EboniteParams):
     """
@@ -98,23 +135,36 @@ class InstallableRequirement(PythonRequirement):
 @make_string(include_name=True)
 class CustomRequirement(PythonRequirement):
     """
-    This class represents local python code that you need as a requirement for your code
+    This class represents local python code that you need as a requirement for your code.
+    Sources may be stored in requirement itself or as content-addressed artifact shared by many models,
+    in which case requirement only references them by hash (see :meth:`with_artifact`).
+    Decompressed sources are cached per content hash, so builds of many models decompress them once
 
     :param name: filename of this code
-    :param source64zip: zipped and base64-encoded source
+    :param source64zip: zipped and base64-encoded source, `None` if sources are stored in `artifact`
     :param is_package: whether this code should be in %name%/__init__.py
+    :param digest: hash of `source64zip`
+    :param artifact: :class:`~ebonite.core.objects.ArtifactCollection` with `source64zip` payload
     """
     type = 'custom'
+    sources_file = 'sources'
+
+    _compressed_cache = _LRUCache(256)
+    _decompressed_cache = _LRUCache(256)
 
-    def __init__(self, name: str, source64zip: str, is_package: bool):
+    def __init__(self, name: str, source64zip: Optional[str] = None, is_package: bool = False, digest: str = None,
+                 artifact: ArtifactCollection = None):
         self.source64zip = source64zip
         self.name = name
         self.is_package = is_package
+        self.digest = digest or (hash_parts(source64zip) if source64zip is not None else None)
+        self.artifact = artifact
 
     @staticmethod
     def from_module(mod: ModuleType) -> 'CustomRequirement':
         """
-        Factory method to create :class:`CustomRequirement` from module object
+        Factory method to create :class:`CustomRequirement` from module object.
+        Sources are compressed once per process while module files are not changed
 
         :param mod: module object
         :return: :class:`CustomRequirement`
@@ -122,13 +172,18 @@ class CustomRequirement(PythonRequirement):
         is_package = mod.__file__.endswith('__init__.py')
         if is_package:
             pkg_dir = os.path.dirname(mod.__file__)
-            par = os.path.dirname(pkg_dir)
-            sources = {os.path.relpath(p, par): read(p, bin=True)
-                       for p in glob.glob(os.path.join(pkg_dir, '**', '*'), recursive=True) if os.path.isfile(p)}
-            src = CustomRequirement.compress_package(sources)
+            files = sorted(p for p in glob.glob(os.path.join(pkg_dir, '**', '*'), recursive=True) if os.path.isfile(p))
         else:
-            src = CustomRequirement.compress(read(mod.__file__))
-        return CustomRequirement(mod.__name__, src, is_package)
+            files = [mod.__file__]
+
+        def compress():
+            if is_package:
+                par = os.path.dirname(pkg_dir)
+                return CustomRequirement.compress_package({os.path.relpath(p, par): read(p, bin=True) for p in files})
+            return CustomRequirement.compress(read(mod.__file__))
+
+        key = (mod.__name__, is_package, tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in files))
+        return CustomRequirement(mod.__name__, CustomRequirement._compressed_cache.get(key, compress), is_package)
 
     @staticmethod
     def compress(s: str) -> str:
@@ -147,7 +202,8 @@ class CustomRequirement(PythonRequirement):
         sources = {
             path: base64.standard_b64encode(zlib.compress(payload)).decode('utf8') for path, payload in s.items()
         }
-        return CustomRequirement.compress(json.dumps(sources))
+        # sorted keys so same sources always have same hash
+        return CustomRequirement.compress(json.dumps(sources, sort_keys=True))
 
     @staticmethod
     def decompress(s: str) -> str:
@@ -169,6 +225,42 @@ class CustomRequirement(PythonRequirement):
             for path, payload in sources.items()
         }
 
+    def with_artifact(self, artifact: ArtifactCollection) -> 'CustomRequirement':
+        """
+        Creates copy of this requirement which references sources stored in artifact instead of containing them
+
+        :param artifact: :class:`~ebonite.core.objects.ArtifactCollection` with sources payload
+            (see :meth:`sources_blobs`)
+        :return: :class:`CustomRequirement`
+        """
+        req = copy(self)
+        req.source64zip = None
+        req.artifact = artifact
+        return req
+
+    def sources_blobs(self) -> Dict[str, Blob]:
+        """
+        :return: blobs to store sources of this requirement as artifact
+        """
+        return {self.sources_file: InMemoryBlob(self._payload().encode('utf8'))}
+
+    def _payload(self) -> str:
+        if self.source64zip is not None:
+            return self.source64zip
+        if self.artifact is None:
+            raise ValueError(f'{self.name} requirement has neither sources nor artifact with them')
+        with self.artifact.blob_dict() as blobs:
+            return blobs[self.sources_file].bytes().decode('utf8')
+
+    def _decompressed(self):
+        def decompress():
+            payload = self._payload()
+            return self.decompress_package(payload) if self.is_package else self.decompress(payload)
+
+        if self.digest is None:
+            return decompress()
+        return self._decompressed_cache.get((self.digest, self.is_package), decompress)
+
     @property
     def module(self):
         """
@@ -182,13 +274,13 @@ class CustomRequirement(PythonRequirement):
         Source code of this requirement
         """
         if not self.is_package:
-            return CustomRequirement.decompress(self.source64zip)
+            return self._decompressed()
         raise AttributeError("package requirement does not have source attribute")
 
     @property
     def sources(self) -> Dict[str, bytes]:
         if self.is_package:
-            return CustomRequirement.decompress_package(self.source64zip)
+            return dict(self._decompressed())
         raise AttributeError("non package requirement does not have sources attribute")
 
     def to_sources_dict(self):
@@ -204,8 +296,9 @@ class CustomRequirement(PythonRequirement):
 
 
 class FileRequirement(CustomRequirement):
-    def __init__(self, name: str, source64zip: str):
-        super().__init__(name, source64zip, False)
+    def __init__(self, name: str, source64zip: Optional[str] = None, digest: str = None,
+                 artifact: ArtifactCollection = None):
+        super().__init__(name, source64zip, False, digest, artifact)
 
     def to_sources_dict(self):
         """
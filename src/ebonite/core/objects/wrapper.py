@@ -1,11 +1,14 @@
 import contextlib
+import mmap
 import os
 import pickle
+import sys
+import tempfile
 import typing
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from importlib import import_module
-from io import BytesIO
 from pickle import _Unpickler
 from uuid import uuid4
 
@@ -14,14 +17,17 @@ from pyjackson.core import Unserializable
 from pyjackson.decorators import type_field
 from pyjackson.utils import get_class_fields
 
+from ebonite.config import Core
 from ebonite.core.analyzer.dataset import DatasetAnalyzer
-from ebonite.core.objects.artifacts import ArtifactCollection, Blob, Blobs, CompositeArtifactCollection, InMemoryBlob
+from ebonite.core.objects.artifacts import (ArtifactCollection, Blob, Blobs, CompositeArtifactCollection, InMemoryBlob,
+                                            LocalFileBlob)
 from ebonite.core.objects.base import EboniteParams
 from ebonite.core.objects.dataset_type import DatasetType
 from ebonite.core.objects.requirements import InstallableRequirement, Requirements
 from ebonite.utils.fs import switch_curdir
+from ebonite.utils.log import logger
 from ebonite.utils.module import get_object_requirements
-from ebonite.utils.pickling import EbonitePickler
+from ebonite.utils.pickling import EbonitePickler, EboniteUnpickler
 
 FilesContextManager = typing.ContextManager[ArtifactCollection]
 MethodArg = DatasetType
@@ -29,6 +35,10 @@ MethodReturn = DatasetType
 Method = typing.Tuple[str, MethodArg, MethodReturn]
 Methods = typing.Dict[str, Method]
 
+#: whether pickle protocol 5 with out of band buffers is available (python 3.8+)
+OUT_OF_BAND_BUFFERS = pickle.HIGHEST_PROTOCOL >= 5
+_REF_PID = 'ebonite_ref'
+
 
 @type_field('type')
 class ModelIO(EboniteParams):
@@ -37,6 +47,9 @@ class ModelIO(EboniteParams):
 
     Must be pyjackson-serializable
     """
+    #: whether dumps and loads of different models may run concurrently in threads,
+    #: e.g. if model is saved to its own temporary files
+    thread_safe = False
 
     @abstractmethod
     def dump(self, model) -> FilesContextManager:
@@ -88,12 +101,13 @@ class ModelWrapper(EboniteParams):
         self.methods = read(os.path.join(path, self.methods_json), typing.Optional[Methods])
         self.requirements = read(os.path.join(path, self.requirements_json), Requirements)
 
-    def bind_model(self, model, input_data=None, **kwargs):
+    def bind_model(self, model, input_data=None, output_types: typing.Dict[str, DatasetType] = None, **kwargs):
         """
         Bind model object to this wrapper by using given input data sample
 
         :param model: model object to bind
         :param input_data: input data sample to determine model methods signatures
+        :param output_types: declared output types of exposed methods, these methods are not called for analysis
         :param kwargs: additional information to be used for analysis
         :return: self
         """
@@ -101,25 +115,59 @@ class ModelWrapper(EboniteParams):
             raise ValueError("Input data sample should be specified as 'input_data' key in order to analyze model")
 
         self.model = model
-        self.methods, self.requirements = self._prepare_methods_and_requirements(input_data)
+        self.methods, self.requirements = self._prepare_methods_and_requirements(input_data, output_types)
         return self
 
-    def _prepare_methods_and_requirements(self, input_data):
+    def _prepare_methods_and_requirements(self, input_data, output_types: typing.Dict[str, DatasetType] = None):
         requirements = Requirements()
         requirements += self._model_requirements()
 
         arg_type = DatasetAnalyzer.analyze(input_data)
         requirements += arg_type.requirements
 
+        output_types = output_types or {}
+        probe_data = None
         methods = {}
         for exposed, wrapped in self._exposed_methods_mapping().items():
-            output_data = self._call_method(wrapped, input_data)
-            out_type = DatasetAnalyzer.analyze(output_data)
+            out_type = output_types.get(exposed) or self._static_output_type(wrapped, arg_type)
+            if out_type is None:
+                if probe_data is None:
+                    probe_data = self._probe_data(arg_type, input_data)
+                out_type = DatasetAnalyzer.analyze(self._probe_method(wrapped, probe_data, input_data))
 
             methods[exposed] = (wrapped, arg_type, out_type)
             requirements += out_type.requirements
         return methods, requirements
 
+    @staticmethod
+    def _probe_data(arg_type: DatasetType, input_data):
+        """Takes first :attr:`ebonite.config.Core.MODEL_PROBE_SIZE` rows of input data sample"""
+        probe_size = Core.MODEL_PROBE_SIZE
+        if probe_size <= 0:
+            return input_data
+        return arg_type.head(input_data, probe_size)
+
+    def _probe_method(self, wrapped, probe_data, input_data):
+        """Calls method with probe data to analyze its output, falls back to whole input data sample if call fails"""
+        if probe_data is not input_data:
+            try:
+                return self._call_method(wrapped, probe_data)
+            except Exception as e:
+                logger.debug('Failed to call %s with first rows of input data, calling with whole sample: %s',
+                             wrapped, e)
+        return self._call_method(wrapped, input_data)
+
+    def _static_output_type(self, wrapped: str, arg_type: DatasetType) -> typing.Optional[DatasetType]:
+        """
+        Should return output type of wrapped method if it is known from model without calling it.
+        By default returns None, so method is called with input data sample to analyze its output
+
+        :param wrapped: name of wrapped method
+        :param arg_type: type of method argument
+        :return: output type or None
+        """
+        return None
+
     def unbind(self):
         """
         Unbind model object from this wrapper
@@ -144,7 +192,7 @@ class ModelWrapper(EboniteParams):
         :param name: name of the method to determine input / output types
         :return: input / output type of method with given name
         """
-        self._check_method(name)
+        self._check_method(name, need_model=False)
         _, *signature = self.methods[name]
         return signature
 
@@ -161,8 +209,9 @@ class ModelWrapper(EboniteParams):
         output_data = self._call_method(wrapped, input_data)
         return output_data
 
-    def _check_method(self, name):
-        if self.model is None:
+    def _check_method(self, name, need_model=True):
+        # signatures are known from methods metadata, model object is needed only to call methods
+        if self.model is None and (need_model or self.methods is None):
             raise ValueError('Wrapper {} has no model yet'.format(self))
         if name not in self.methods:
             raise ValueError(f"Wrapper '{self}' obj doesn't expose method '{name}'")
@@ -305,32 +354,60 @@ class PickleModelIO(ModelIO):
 
     So, if you use function that internally calls tensorflow model, this tensorflow model will be dumped with
     tensorflow code and not pickled
+
+    With pickle protocol 5 (python 3.8+) large buffers of objects (e.g. numpy arrays) are stored out of band
+    as separate files and are used on load without copying: if `mmap_mode` is set they are memory-mapped,
+    so they are read lazily and their pages may be shared between processes loading the same model files.
+    On older python versions large numpy arrays are stored out of band as `.npy` files only if `mmap_mode` is set
+
+    Nested models with thread-safe IOs (see :attr:`ModelIO.thread_safe`) are dumped and loaded concurrently
+    using at most :attr:`max_workers` threads
+
+    :param mmap_mode: `numpy.load` mmap mode for out of band arrays and buffers, they are read into memory if `None`
+    :param min_array_size: minimal size in bytes of array or buffer to store it out of band
     """
     model_filename = 'model.pkl'
     io_ext = '.io'
+    array_ext = '.npy'
+    buffer_ext = '.buf'
+    thread_safe = True
+    max_workers = 4
+
+    def __init__(self, mmap_mode: str = None, min_array_size: int = 1024 * 1024):
+        self.mmap_mode = mmap_mode
+        self.min_array_size = min_array_size
 
     @contextlib.contextmanager
     def dump(self, model) -> ArtifactCollection:
         """
-        Dumps model artifacts as :class:`~ebonite.core.objects.ArtifactCollection`
+        Dumps model artifacts as :class:`~ebonite.core.objects.ArtifactCollection`.
+        Model is pickled to a temporary file which is removed on context exit, so payload is never held in memory
 
         :return: context manager with :class:`~ebonite.core.objects.ArtifactCollection`
         """
-        model_blob, refs = self._serialize_model(model)
-        blobs = {self.model_filename: InMemoryBlob(model_blob)}
-        artifact_cms = []
-        uuids = []
-
-        for uuid, (io, obj) in refs.items():
-            blobs[uuid + self.io_ext] = InMemoryBlob(self._serialize_io(io))
-            artifact_cms.append(io.dump(obj))
-            uuids.append(uuid)
-
-        from ebonite.core.objects.artifacts import _enter_all_cm, _ExitAllCm, _RelativePathWrapper
-        additional_artifacts = _enter_all_cm(artifact_cms)
-        with _ExitAllCm(artifact_cms):
-            additional_artifacts = [_RelativePathWrapper(art, uuid) for art, uuid in zip(additional_artifacts, uuids)]
-            yield CompositeArtifactCollection([Blobs(blobs)] + additional_artifacts)
+        with tempfile.TemporaryDirectory(prefix='ebonite_pickle_dump') as tmpdir:
+            model_path = os.path.join(tmpdir, self.model_filename)
+            arrays_dir = tmpdir if self.mmap_mode is not None or OUT_OF_BAND_BUFFERS else None
+            with open(model_path, 'wb') as f:
+                refs, arrays = self._serialize_model(model, f, arrays_dir, self.min_array_size)
+            blobs = {self.model_filename: LocalFileBlob(model_path)}
+            blobs.update({name: LocalFileBlob(os.path.join(tmpdir, name)) for name in arrays})
+            artifact_cms = []
+            concurrent = []
+            uuids = []
+
+            for uuid, (io, obj) in refs.items():
+                blobs[uuid + self.io_ext] = InMemoryBlob(self._serialize_io(io))
+                artifact_cms.append(io.dump(obj))
+                concurrent.append(io.thread_safe)
+                uuids.append(uuid)
+
+            from ebonite.core.objects.artifacts import _ExitAllCm, _RelativePathWrapper
+            additional_artifacts = self._enter_ref_dumps(artifact_cms, concurrent)
+            with _ExitAllCm(artifact_cms):
+                additional_artifacts = [_RelativePathWrapper(art, uuid)
+                                        for art, uuid in zip(additional_artifacts, uuids)]
+                yield CompositeArtifactCollection([Blobs(blobs)] + additional_artifacts)
 
     def load(self, path):
         """
@@ -338,42 +415,129 @@ class PickleModelIO(ModelIO):
 
         :param path: path to load from
         """
-        refs = {}
+        ios = {}
         for entry in os.listdir(path):
             if not entry.endswith(self.io_ext):
                 continue
 
             with open(os.path.join(path, entry), 'rb') as f:
-                io = self._deserialize_io(f)
+                ios[entry[:-len(self.io_ext)]] = self._deserialize_io(f)
 
-            uuid = entry[:-len(self.io_ext)]
-            refs[uuid] = io.load(os.path.join(path, uuid))
+        refs = self._load_refs(ios, path)
 
         with open(os.path.join(path, self.model_filename), 'rb') as f:
-            return self._deserialize_model(f, refs)
+            return self._deserialize_model(f, refs, path, self.mmap_mode)
+
+    def _pool(self, size: int, name: str) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=min(self.max_workers, size), thread_name_prefix=name)
+
+    def _enter_ref_dumps(self, managers: list, concurrent: typing.List[bool]) -> typing.List[ArtifactCollection]:
+        """
+        Enters dump context managers of nested models: ones of thread-safe IOs concurrently, others one by one.
+        If any of them fails, already entered ones are exited
+
+        :param managers: dump context managers
+        :param concurrent: whether each manager may be entered in worker thread
+        :return: artifacts of nested models
+        """
+        artifacts = [None] * len(managers)
+        entered = []
+        error = None
+        parallel = [i for i, c in enumerate(concurrent) if c] if sum(concurrent) > 1 else []
+        if parallel:
+            with self._pool(len(parallel), 'ebonite_dump') as pool:
+                futures = [(i, pool.submit(managers[i].__enter__)) for i in parallel]
+            for i, future in futures:
+                try:
+                    artifacts[i] = future.result()
+                    entered.append(managers[i])
+                except Exception as e:
+                    error = error or e
+
+        for i, manager in enumerate(managers):
+            if error is not None:
+                break
+            if i in parallel:
+                continue
+            try:
+                artifacts[i] = manager.__enter__()
+                entered.append(manager)
+            except Exception as e:
+                error = e
+
+        if error is not None:
+            from ebonite.core.objects.artifacts import _ExitAllCm
+            _ExitAllCm(entered).__exit__(type(error), error, error.__traceback__)
+            raise error
+        return artifacts
+
+    def _load_refs(self, ios: typing.Dict[str, ModelIO], path: str) -> typing.Dict[str, object]:
+        """
+        Loads nested models: ones of thread-safe IOs concurrently, others one by one
+
+        :param ios: nested model uuid -> its IO
+        :param path: path to load from
+        :return: nested model uuid -> nested model object
+        """
+        parallel = [uuid for uuid, io in ios.items() if io.thread_safe]
+        if len(parallel) < 2:
+            parallel = []
+
+        refs = {}
+        if parallel:
+            with self._pool(len(parallel), 'ebonite_load') as pool:
+                futures = {uuid: pool.submit(ios[uuid].load, os.path.join(path, uuid)) for uuid in parallel}
+                refs.update({uuid: future.result() for uuid, future in futures.items()})
+        for uuid, io in ios.items():
+            if uuid not in refs:
+                refs[uuid] = io.load(os.path.join(path, uuid))
+        return refs
 
     @staticmethod
-    def _serialize_model(model):
+    def _serialize_model(model, out_file, arrays_dir=None, min_array_size=0):
         """
-        Helper method to pickle model and get payload and refs
+        Helper method to pickle model to file and get refs
 
-        :return: tuple of payload and refs
+        :param model: model to pickle
+        :param out_file: binary file-like object to write payload to
+        :param arrays_dir: dir to store large buffers out of band, they are pickled inline if `None`
+        :param min_array_size: minimal size in bytes of array or buffer to store it out of band
+        :return: refs and names of out of band array and buffer files
         """
-        f = BytesIO()
-        pklr = _ModelPickler(model, f, recurse=True)
+        pklr = _ModelPickler(model, out_file, recurse=True, arrays_dir=arrays_dir, min_array_size=min_array_size)
         pklr.dump(model)
-        return f.getvalue(), pklr.refs
+        return pklr.refs, [name for name, _ in pklr.arrays.values()] + pklr.buffers
 
     @staticmethod
-    def _deserialize_model(in_file, refs):
+    def _deserialize_model(in_file, refs, arrays_dir=None, mmap_mode=None):
         """
         Helper method to unpickle model from payload and refs
 
         :param in_file: payload
         :param refs: refs
+        :param arrays_dir: dir with out of band array and buffer files
+        :param mmap_mode: `numpy.load` mmap mode for out of band arrays and buffers
         :return: unpickled model
         """
-        return _ModelUnpickler(refs, in_file).load()
+        start = in_file.tell()
+        try:
+            return _ModelUnpickler(refs, in_file, arrays_dir=arrays_dir, mmap_mode=mmap_mode).load()
+        except _LegacyRefsError:
+            in_file.seek(start)
+            return _LegacyModelUnpickler(refs, in_file, arrays_dir=arrays_dir, mmap_mode=mmap_mode).load()
+
+    @classmethod
+    def _buffer_files(cls, path: typing.Optional[str]) -> typing.List[str]:
+        """
+        Lists out of band buffer files in order they were written
+
+        :param path: dir with model files
+        :return: buffer file names
+        """
+        if path is None:
+            return []
+        names = [name for name in os.listdir(path) if name.endswith(cls.buffer_ext)]
+        return sorted(names, key=lambda name: int(name[len('buffer_'):-len(cls.buffer_ext)]))
 
     @staticmethod
     def _serialize_io(io):
@@ -402,17 +566,27 @@ class PickleModelIO(ModelIO):
 
 class _ModelPickler(EbonitePickler):
     """
-    A class to pickle model with respect to wrappers of inner objects
+    A class to pickle model with respect to wrappers of inner objects.
+    Objects with non-pickle IO and out of band arrays are replaced with persistent ids
 
     :param model: model object to serialize
     :param args: dill.Pickler args
+    :param arrays_dir: dir to store large buffers out of band, they are pickled inline if `None`
+    :param min_array_size: minimal size in bytes of buffer to store it out of band
     :param kwargs: dill.Pickler kwargs
     """
 
-    def __init__(self, model, *args, **kwargs):
+    def __init__(self, model, *args, arrays_dir: str = None, min_array_size: int = 0, **kwargs):
+        if arrays_dir is not None and OUT_OF_BAND_BUFFERS:
+            kwargs.update(protocol=5, buffer_callback=self._save_buffer)
         super().__init__(*args, **kwargs)
         self.model = model
         self.refs = {}
+        self.ref_ids = {}
+        self.arrays_dir = arrays_dir
+        self.min_array_size = min_array_size
+        self.arrays = {}
+        self.buffers = []
 
         # we couldn't import hook and analyzer at top as it leads to circular import failure
         from ebonite.core.analyzer.model import CallableMethodModelHook, ModelAnalyzer
@@ -422,31 +596,57 @@ class _ModelPickler(EbonitePickler):
                 known_types.update(hook.valid_types)
         self.known_types = tuple(known_types)
 
-    # pickle "hook" for overriding serialization of objects
-    def save(self, obj, save_persistent_id=True):
+    def persistent_id(self, obj):
         """
-        Checks if obj has IO.
-        If it does, serializes object with :meth:`~ebonite.core.objects.wrapper.ModelIO.dump`
-        and creates a ref to it. Otherwise, saves object as default pickle would do
+        Checks if obj has non-pickle IO. If it does, creates a ref to it, so it is
+        serialized aside with :meth:`~ebonite.core.objects.wrapper.ModelIO.dump`.
+        Also stores large numpy arrays to separate `.npy` files if `arrays_dir` is set and
+        out of band buffers are not supported
 
         :param obj: obj to save
-        :param save_persistent_id:
-        :return:
+        :return: ref, array file name or None to pickle obj as usual
         """
         if obj is self.model:
             # at starting point, follow usual path not to fall into infinite loop
-            return super().save(obj, save_persistent_id)
+            return None
 
+        if id(obj) in self.ref_ids:
+            return _REF_PID, self.ref_ids[id(obj)]
         io = self._get_non_pickle_io(obj)
-        if io is None:
-            # no non-Pickle IO found, follow usual path
-            return super().save(obj, save_persistent_id)
+        if io is not None:
+            obj_uuid = str(uuid4())
+            self.refs[obj_uuid] = (io, obj)
+            self.ref_ids[id(obj)] = obj_uuid
+            return _REF_PID, obj_uuid
 
-        # found model with non-pickle serialization:
-        # replace with `_ExternalRef` stub and memorize IO to serialize model aside later
-        obj_uuid = str(uuid4())
-        self.refs[obj_uuid] = (io, obj)
-        return super().save(_ExternalRef(obj_uuid), save_persistent_id)
+        if self.arrays_dir is None or OUT_OF_BAND_BUFFERS:
+            return None
+        # numpy is not a requirement, and if it is not imported there could be no arrays in model
+        np = sys.modules.get('numpy')
+        if np is None or type(obj) is not np.ndarray or obj.dtype.hasobject or obj.nbytes < self.min_array_size:
+            return None
+        if id(obj) not in self.arrays:
+            name = f'array_{len(self.arrays)}{PickleModelIO.array_ext}'
+            np.save(os.path.join(self.arrays_dir, name), obj, allow_pickle=False)
+            # keep reference to array so its id is not reused
+            self.arrays[id(obj)] = (name, obj)
+        return self.arrays[id(obj)][0]
+
+    def _save_buffer(self, buffer) -> bool:
+        """
+        Protocol 5 buffer callback: writes large buffers to separate files
+
+        :param buffer: `pickle.PickleBuffer` instance
+        :return: whether buffer should be serialized in band
+        """
+        raw = buffer.raw()
+        if raw.nbytes < self.min_array_size:
+            return True
+        name = f'buffer_{len(self.buffers)}{PickleModelIO.buffer_ext}'
+        with open(os.path.join(self.arrays_dir, name), 'wb') as f:
+            f.write(raw)
+        self.buffers.append(name)
+        return False
 
     def _get_non_pickle_io(self, obj):
         """
@@ -471,21 +671,97 @@ class _ModelPickler(EbonitePickler):
             return None
 
 
-# We couldn't use `EboniteUnpickler` here as it (in fact `dill`) subclasses `Unpickler`
-# `Unpickler`, unlike `_Unpickler`, doesn't support `load_build` overriding
-class _ModelUnpickler(_Unpickler):
+class _LegacyRefsError(Exception):
+    """
+    Raised when payload pickled by previous ebonite versions with :class:`_ExternalRef` stubs is loaded
+    """
+
+
+def _open_buffer(path: str, mmap_mode: str = None):
     """
-    A class to unpickle model saved with :class:`_ModelPickler`
+    Opens out of band buffer file: memory-maps it if `mmap_mode` is set or reads it into writable buffer
+
+    :param path: path to buffer file
+    :param mmap_mode: `numpy.load` mmap mode
+    :return: buffer object
+    """
+    size = os.path.getsize(path)
+    if mmap_mode is None or size == 0:
+        buffer = bytearray(size)
+        with open(path, 'rb') as f:
+            f.readinto(buffer)
+        return buffer
+    access = {'r': mmap.ACCESS_READ, 'c': mmap.ACCESS_COPY, 'r+': mmap.ACCESS_WRITE}[mmap_mode]
+    with open(path, 'r+b' if access == mmap.ACCESS_WRITE else 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=access)
+
+
+class _ModelUnpickler(EboniteUnpickler):
+    """
+    A class to unpickle model saved with :class:`_ModelPickler`.
+    Based on C unpickler, refs and arrays are resolved by persistent ids
+
+    :param refs: dict of object uuid -> it's :attr:`ModelWrapper.model`
+    :param args: dill.Unpickler args
+    :param arrays_dir: dir with out of band array and buffer files
+    :param mmap_mode: `numpy.load` mmap mode for out of band arrays and buffers
+    :param kwargs: dill.Unpickler kwargs
+    """
+
+    def __init__(self, refs, *args, arrays_dir: str = None, mmap_mode: str = None, **kwargs):
+        buffers = PickleModelIO._buffer_files(arrays_dir)
+        if buffers:
+            if not OUT_OF_BAND_BUFFERS:
+                raise ValueError('Model was pickled with out of band buffers which require python 3.8 or newer')
+            kwargs['buffers'] = (_open_buffer(os.path.join(arrays_dir, name), mmap_mode) for name in buffers)
+        super().__init__(*args, **kwargs)
+        self.refs = refs
+        self.arrays_dir = arrays_dir
+        self.mmap_mode = mmap_mode
+        self.arrays = {}
+
+    def persistent_load(self, pid):
+        """
+        Loads object referenced by :class:`_ModelPickler` persistent id
+
+        :param pid: ref or array file name
+        :return: referenced model or numpy array, memory-mapped if `mmap_mode` is set
+        """
+        if isinstance(pid, tuple) and pid[0] == _REF_PID:
+            return self.refs[pid[1]]
+        if pid not in self.arrays:
+            import numpy as np
+            self.arrays[pid] = np.load(os.path.join(self.arrays_dir, pid), mmap_mode=self.mmap_mode, allow_pickle=False)
+        return self.arrays[pid]
+
+    def find_class(self, module, name):
+        if module == __name__ and name == _ExternalRef.__name__:
+            raise _LegacyRefsError()
+        return super().find_class(module, name)
+
+
+# Payloads of previous versions contain `_ExternalRef` stubs which are swapped with refs on BUILD.
+# C `Unpickler`, unlike `_Unpickler`, doesn't support `load_build` overriding, so they are loaded with this class
+class _LegacyModelUnpickler(_Unpickler):
+    """
+    A class to unpickle model saved with :class:`_ExternalRef` stubs
 
     :param refs: dict of object uuid -> it's :attr:`ModelWrapper.model`
     :param args: pickle._Unpickler args
+    :param arrays_dir: dir with out of band array files
+    :param mmap_mode: `numpy.load` mmap mode for out of band arrays
     :param kwargs: pickle._Unpickle kwargs
     """
     dispatch = _Unpickler.dispatch.copy()
 
-    def __init__(self, refs, *args, **kwargs):
+    def __init__(self, refs, *args, arrays_dir: str = None, mmap_mode: str = None, **kwargs):
         super().__init__(*args, **kwargs)
         self.refs = refs
+        self.arrays_dir = arrays_dir
+        self.mmap_mode = mmap_mode
+        self.arrays = {}
+
+    persistent_load = _ModelUnpickler.persistent_load
 
     # pickle "hook" for overriding deserialization of objects
     def load_build(self):
@@ -509,7 +785,7 @@ class _ModelUnpickler(_Unpickler):
 
 class _ExternalRef:
     """
-    A class to mark objects dumped their own :class:`ModelIO`
+    A class to mark objects dumped their own :class:`ModelIO` in payloads of previous versions
     """
 
     def __init__(self, ref: str):
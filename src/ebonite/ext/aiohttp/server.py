@@ -4,9 +4,8 @@ import yaml
 from aiohttp import web
 from aiohttp_swagger import setup_swagger
 
+from ebonite.runtime.bundle import interface_schema, interface_specs
 from ebonite.runtime.interface import Interface
-from ebonite.runtime.interface.base import InterfaceDescriptor
-from ebonite.runtime.openapi.spec import create_spec
 from ebonite.runtime.server import BaseHTTPServer, HTTPServerConfig, MalformedHTTPRequestException
 from ebonite.utils.log import rlogger
 
@@ -45,17 +44,17 @@ def create_executor_function(interface: Interface, method: str, spec: dict):
 
 
 def create_interface_routes(app, interface: Interface):
+    specs = interface_specs(interface)
     for method in interface.exposed_methods():
         sig = interface.exposed_method_signature(method)
         rlogger.debug('registering %s with input type %s and output type %s', method, sig.args, sig.output)
 
-        spec = create_spec(method, sig, str(Interface), interface.exposed_method_docs(method))
-        executor_function = create_executor_function(interface, method, spec)
+        executor_function = create_executor_function(interface, method, specs[method])
         app.router.add_post('/' + method, executor_function)
 
 
 def create_schema_route(app, interface: Interface):
-    schema = InterfaceDescriptor.from_interface(interface).to_dict()
+    schema = interface_schema(interface)
     rlogger.debug('Creating /interface.json route with schema: %s', schema)
     app.router.add_get('/interface.json', lambda request: web.json_response(schema))
 
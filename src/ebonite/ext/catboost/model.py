@@ -18,6 +18,7 @@ class CatBoostModelIO(ModelIO):
     """
     classifier_file_name = 'clf.cb'
     regressor_file_name = 'rgr.cb'
+    thread_safe = True
 
     @contextlib.contextmanager
     def dump(self, model) -> ArtifactCollection:
@@ -110,15 +110,16 @@ class ExtensionLoader:
             sys.meta_path.insert(0, hook)
 
     @classmethod
-    def load_all(cls, try_lazy=True):
+    def load_all(cls, try_lazy=True, load_forced=True):
         """
         Load all (builtin and additional) extensions
 
         :param try_lazy: if `False`, use force load for all builtin extensions
+        :param load_forced: if `False`, extensions with `force` flag are loaded lazily too
         """
         for_hook = []
         for ext in cls.builtin_extensions.values():
-            if not try_lazy or hasattr(sys, 'frozen') or ext.force:
+            if not try_lazy or hasattr(sys, 'frozen') or (ext.force and load_forced):
                 if all(module_importable(r) for r in ext.reqs):
                     cls.load(ext)
             else:
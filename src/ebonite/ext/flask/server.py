@@ -3,9 +3,8 @@ import uuid
 from io import BytesIO
 
 from ebonite.config import Config, Core, Param
+from ebonite.runtime.bundle import interface_schema, interface_specs
 from ebonite.runtime.interface import Interface
-from ebonite.runtime.interface.base import InterfaceDescriptor
-from ebonite.runtime.openapi.spec import create_spec
 from ebonite.runtime.server import BaseHTTPServer, HTTPServerConfig, MalformedHTTPRequestException
 from ebonite.utils.fs import current_module_path
 from ebonite.utils.log import rlogger
@@ -43,25 +42,26 @@ def create_executor_function(interface: Interface, method: str):
     return ef
 
 
-def _register_method(app, interface, method_name, signature):
+def _register_method(app, interface, method_name, spec):
     from flasgger import swag_from
 
-    swag = swag_from(create_spec(method_name, signature, str(Interface), interface.exposed_method_docs(method_name)))
+    swag = swag_from(spec)
     executor_function = swag(create_executor_function(interface, method_name))
     app.add_url_rule('/' + method_name, method_name, executor_function, methods=['POST'])
 
 
 def create_interface_routes(app, interface: Interface):
+    specs = interface_specs(interface)
     for method in interface.exposed_methods():
         sig = interface.exposed_method_signature(method)
         rlogger.debug('registering %s with input type %s and output type %s', method, sig.args, sig.output)
-        _register_method(app, interface, method, sig)
+        _register_method(app, interface, method, specs[method])
 
 
 def create_schema_route(app, interface: Interface):
     from flask import jsonify
 
-    schema = InterfaceDescriptor.from_interface(interface).to_dict()
+    schema = interface_schema(interface)
     rlogger.debug('Creating /interface.json route with schema: %s', schema)
     app.add_url_rule('/interface.json', 'schema', lambda: jsonify(schema))
 
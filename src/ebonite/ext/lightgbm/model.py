@@ -8,7 +8,9 @@ import lightgbm as lgb
 from ebonite.core.analyzer.base import TypeHookMixin
 from ebonite.core.analyzer.model import BindingModelHook
 from ebonite.core.objects.artifacts import Blobs, LocalFileBlob
+from ebonite.core.objects.dataset_type import DatasetType
 from ebonite.core.objects.wrapper import FilesContextManager, LibModelWrapperMixin, ModelIO, ModelWrapper
+from ebonite.ext.numpy.dataset import NumpyNdarrayDatasetType
 
 
 class LightGBMModelIO(ModelIO):
@@ -16,6 +18,7 @@ class LightGBMModelIO(ModelIO):
     :class:`.ModelIO` implementation for `lightgbm.Booster` type
     """
     model_path = 'model.lgb'
+    thread_safe = True
 
     @contextlib.contextmanager
     def dump(self, model: lgb.Booster) -> FilesContextManager:
@@ -43,6 +46,13 @@ class LightGBMModelWrapper(LibModelWrapperMixin):
             'predict': '_predict'
         }
 
+    def _static_output_type(self, wrapped: str, arg_type: DatasetType) -> typing.Optional[DatasetType]:
+        """
+        Determines shape of predictions from number of models per boosting iteration (number of classes)
+        """
+        classes = self.model.num_model_per_iteration()
+        return NumpyNdarrayDatasetType((None,) if classes == 1 else (None, classes), 'float64')
+
     @ModelWrapper.with_model
     def _predict(self, data):
         if isinstance(data, lgb.Dataset):
@@ -9,6 +9,7 @@ from ebonite.core.analyzer.base import CanIsAMustHookMixin, TypeHookMixin
 from ebonite.core.analyzer.dataset import DatasetHook
 from ebonite.core.objects.dataset_type import DatasetType, LibDatasetTypeMixin
 from ebonite.core.objects.typing import ListTypeWithSpec, SizedTypedListType
+from ebonite.utils.hashing import hash_parts
 
 
 def python_type_from_np_string_repr(string_repr: str) -> type:
@@ -67,6 +68,7 @@ class NumpyNumberHook(CanIsAMustHookMixin, DatasetHook):
     """
     :class:`.DatasetHook` implementation for `numpy.number` objects which uses :class:`NumpyNumberDatasetType`.
     """
+    type_dispatch = True
 
     def must_process(self, obj) -> bool:
         return isinstance(obj, np.number)
@@ -109,6 +111,7 @@ class NumpyNdarrayDatasetType(ListTypeWithSpec, LibDatasetTypeMixin):
 
     real_type = np.ndarray
     libraries = [np]
+    batchable = True
 
     def __init__(self, shape: Tuple[int, ...], dtype: str):
         # TODO assert shape and dtypes len
@@ -151,6 +154,14 @@ class NumpyNdarrayDatasetType(ListTypeWithSpec, LibDatasetTypeMixin):
         if tuple(array.shape)[1:] != self.shape[1:]:
             raise exc_type(f'given array is of shape: {(None,) + tuple(array.shape)[1:]}, expected: {self.shape}')
 
+    def hash_data(self, instance) -> str:
+        if instance.dtype.hasobject:
+            return super().hash_data(instance)
+        return hash_parts(instance.dtype.str, str(instance.shape), np.ascontiguousarray(instance).data)
+
+    def data_size(self, instance) -> int:
+        return instance.nbytes
+
     def get_writer(self):
         from ebonite.ext.numpy.dataset_source import NumpyNdarrayWriter
         return NumpyNdarrayWriter()
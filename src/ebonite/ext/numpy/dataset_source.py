@@ -1,15 +1,25 @@
 import io
-from typing import Tuple
+import typing
+import zipfile
+from typing import Iterator, Tuple
 
 import numpy as np
 
 from ebonite.core.objects import ArtifactCollection
-from ebonite.core.objects.artifacts import LazyBlob
+from ebonite.core.objects.artifacts import Blob, LazyBlob
 from ebonite.core.objects.dataset_source import Dataset
 from ebonite.repository.dataset.artifact import DatasetReader, DatasetWriter
+from ebonite.utils.compression import CHUNK_SIZE
 
+NPZ_FORMAT = 'npz'
+NPY_FORMAT = 'npy'
 DATA_FILE = 'data.npz'
+NPY_DATA_FILE = 'data.npy'
 DATA_KEY = 'data'
+_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0
+}
 
 
 def save_npz(data: np.array):
@@ -18,19 +28,179 @@ def save_npz(data: np.array):
     return buf
 
 
+class _NpyStream(io.RawIOBase):
+    """Readable stream with .npy payload of contiguous array, which reads array memory in place instead of copying it
+
+    :param data: C or Fortran contiguous array without objects"""
+
+    def __init__(self, data: np.ndarray):
+        header = io.BytesIO()
+        header_data = np.lib.format.header_data_from_array_1_0(data)
+        try:
+            np.lib.format.write_array_header_1_0(header, header_data)
+        except ValueError:  # header is too large for 1.0 format
+            header = io.BytesIO()
+            np.lib.format.write_array_header_2_0(header, header_data)
+        body = data.T if header_data['fortran_order'] else data
+        self._parts = [memoryview(header.getvalue()), memoryview(body).cast('B')]
+        self._part = self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('npy stream could only be rewound')
+        self._part = self._position = 0
+        return 0
+
+    def readinto(self, buffer) -> int:
+        buffer = memoryview(buffer).cast('B')
+        written = 0
+        while self._part < len(self._parts) and written < len(buffer):
+            part = self._parts[self._part]
+            size = min(len(part) - self._position, len(buffer) - written)
+            buffer[written:written + size] = part[self._position:self._position + size]
+            written += size
+            self._position += size
+            if self._position == len(part):
+                self._part += 1
+                self._position = 0
+        return written
+
+
+def save_npy(data: np.ndarray):
+    if data.dtype.hasobject or not (data.flags.c_contiguous or data.flags.f_contiguous):
+        buf = io.BytesIO()
+        np.save(buf, data, allow_pickle=False)
+        return buf
+    return _NpyStream(data)
+
+
+def _readinto(npy: typing.BinaryIO, array: np.ndarray):
+    buffer = memoryview(array).cast('B')
+    position = 0
+    while position < len(buffer):
+        if hasattr(npy, 'readinto'):
+            size = npy.readinto(buffer[position:])
+        else:
+            chunk = npy.read(min(len(buffer) - position, CHUNK_SIZE))
+            size = len(chunk)
+            buffer[position:position + size] = chunk
+        if not size:
+            raise ValueError(f'Unexpected end of npy payload after {position} of {len(buffer)} bytes')
+        position += size
+
+
+def _read_npy_header(npy: typing.BinaryIO):
+    """Returns shape and dtype of array in npy stream if it could be read by rows, otherwise None"""
+    read_header = _HEADER_READERS.get(np.lib.format.read_magic(npy))
+    if read_header is None:
+        return None
+    shape, fortran_order, dtype = read_header(npy)
+    if fortran_order or dtype.hasobject or len(shape) == 0:
+        return None
+    return shape, dtype
+
+
+def _read_npy(open_npy: typing.Callable[[], typing.ContextManager[typing.BinaryIO]]) -> np.ndarray:
+    """Reads array from npy stream directly into its memory"""
+    with open_npy() as npy:
+        header = _read_npy_header(npy)
+        if header is not None:
+            shape, dtype = header
+            data = np.empty(shape, dtype=dtype)
+            _readinto(npy, data)
+            return data
+    with open_npy() as npy:
+        return np.lib.format.read_array(npy)
+
+
+def _read_npy_batches(open_npy: typing.Callable[[], typing.ContextManager[typing.BinaryIO]],
+                      batch_size: int) -> Iterator[Dataset]:
+    """Reads array from npy stream by batches of `batch_size` rows"""
+    with open_npy() as npy:
+        header = _read_npy_header(npy)
+        if header is not None:
+            shape, dtype = header
+            for start in range(0, shape[0], batch_size):
+                batch = np.empty((min(batch_size, shape[0] - start),) + shape[1:], dtype=dtype)
+                _readinto(npy, batch)
+                yield Dataset.from_object(batch)
+            return
+    # such arrays could not be read by rows
+    with open_npy() as npy:
+        data = np.lib.format.read_array(npy)
+    yield from Dataset.from_object(data).iterate_batches(batch_size)
+
+
 class NumpyNdarrayWriter(DatasetWriter):
-    """DatasetWriter implementation for numpy ndarray"""
+    """DatasetWriter implementation for numpy ndarray
+
+    :param format: `npy` to store raw array or `npz` to store compressed one.
+        If `None`, arrays with objects are stored as `npz` and other arrays as `npy`
+    """
+
+    def __init__(self, format: str = None):
+        self.format = format
 
     def write(self, dataset: Dataset) -> Tuple[DatasetReader, ArtifactCollection]:
-        return NumpyNdarrayReader(), ArtifactCollection.from_blobs(
-            {DATA_FILE: LazyBlob(lambda: save_npz(dataset.data))})
+        format = self.format or (NPZ_FORMAT if dataset.data.dtype.hasobject else NPY_FORMAT)
+        if format == NPZ_FORMAT:
+            blobs = {DATA_FILE: LazyBlob(lambda: save_npz(dataset.data))}
+        elif format == NPY_FORMAT:
+            blobs = {NPY_DATA_FILE: LazyBlob(lambda: save_npy(dataset.data))}
+        else:
+            raise ValueError(f'Unknown numpy dataset format {format}, expected {NPY_FORMAT} or {NPZ_FORMAT}')
+        return NumpyNdarrayReader(format), ArtifactCollection.from_blobs(blobs)
 
 
 class NumpyNdarrayReader(DatasetReader):
-    """DatasetReader implementation for numpy ndarray"""
+    """DatasetReader implementation for numpy ndarray
+
+    :param format: format array is stored in, `npz` or `npy`
+    :param mmap_mode: `numpy.load` mmap mode to use for `npy` arrays in local artifacts, arrays are read to memory if `None`
+    """
+
+    def __init__(self, format: str = NPZ_FORMAT, mmap_mode: str = None):
+        self.format = format
+        self.mmap_mode = mmap_mode
 
     def read(self, artifacts: ArtifactCollection) -> Dataset:
         with artifacts.blob_dict() as blobs:
+            if self.format == NPY_FORMAT:
+                blob = blobs[NPY_DATA_FILE]
+                data = self._mmap(blob)
+                return Dataset.from_object(data if data is not None else _read_npy(blob.bytestream))
             with blobs[DATA_FILE].bytestream() as f:
+                if not (hasattr(f, 'seekable') and f.seekable()):
+                    f = io.BytesIO(f.read())
                 data = np.load(f)[DATA_KEY]
         return Dataset.from_object(data)
+
+    def read_batches(self, artifacts: ArtifactCollection, batch_size: int) -> Iterator[Dataset]:
+        with artifacts.blob_dict() as blobs:
+            if self.format == NPY_FORMAT:
+                blob = blobs[NPY_DATA_FILE]
+                data = self._mmap(blob)
+                if data is not None:
+                    yield from Dataset.from_object(data).iterate_batches(batch_size)
+                else:
+                    yield from _read_npy_batches(blob.bytestream, batch_size)
+                return
+
+            with blobs[DATA_FILE].bytestream() as f:
+                if not (hasattr(f, 'seekable') and f.seekable()):
+                    f = io.BytesIO(f.read())
+                with zipfile.ZipFile(f) as npz:
+                    yield from _read_npy_batches(lambda: npz.open(DATA_KEY + '.npy'), batch_size)
+
+    def _mmap(self, blob: Blob) -> typing.Optional[np.ndarray]:
+        """Memory-maps blob's payload if mmap mode is set and blob is a local file"""
+        path = blob.local_path() if self.mmap_mode is not None else None
+        if path is None:
+            return None
+        return np.load(path, mmap_mode=self.mmap_mode)
@@ -1,3 +1,4 @@
+import json
 import re
 from typing import List, Union
 
@@ -14,6 +15,7 @@ from ebonite.core.analyzer.base import TypeHookMixin
 from ebonite.core.analyzer.dataset import DatasetHook
 from ebonite.core.objects.dataset_type import DatasetType, LibDatasetTypeMixin
 from ebonite.ext.numpy.dataset import np_type_from_string, python_type_from_np_type
+from ebonite.utils.hashing import hash_parts
 
 _PD_EXT_TYPES = {
     DatetimeTZDtype: r'datetime64.*',
@@ -85,6 +87,7 @@ class _PandasDatasetType(LibDatasetTypeMixin):
     :param dtypes: list of string representations of pandas dtypes of columns
     :param index_cols: list of column names that are used as index"""
     libraries = [pd]
+    batchable = True
 
     def __init__(self, columns: List[str], dtypes: List[str], index_cols: List[str]):
         self.index_cols = index_cols
@@ -215,6 +218,17 @@ class DataFrameType(_PandasDatasetType):
     def row_type(self):
         return SeriesType(self.columns, self.dtypes, self.index_cols)
 
+    def hash_data(self, instance: pd.DataFrame) -> str:
+        instance = reset_index(instance)
+        try:
+            rows = pd.util.hash_pandas_object(instance, index=False).values
+        except TypeError:  # unhashable values in object columns
+            return super().hash_data(instance)
+        return hash_parts(json.dumps([list(map(str, instance.columns)), list(map(str, instance.dtypes))]), rows.data)
+
+    def data_size(self, instance: pd.DataFrame) -> int:
+        return int(instance.memory_usage(index=True, deep=True).sum())
+
     def get_writer(self):
-        from ebonite.ext.pandas.dataset_source import PandasWriter, PandasFormatCsv
-        return PandasWriter(PandasFormatCsv())  # TODO env configuration
+        from ebonite.ext.pandas.dataset_source import PandasWriter
+        return PandasWriter()
@@ -1,19 +1,119 @@
+import contextlib
 import io
+import operator
 import os
+import re
 import tempfile
 import typing
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
+import numpy as np
 import pandas as pd
+from pandas import StringDtype
+from pandas.api.types import is_extension_array_dtype, is_integer_dtype
+from pandas.core.dtypes.dtypes import CategoricalDtype, DatetimeTZDtype
 from pyjackson.decorators import type_field
 
+from ebonite.config import Config, Core, Param
 from ebonite.core.objects.artifacts import ArtifactCollection, LazyBlob
 from ebonite.core.objects.dataset_source import Dataset
 from ebonite.ext.pandas import DataFrameType
 from ebonite.ext.pandas.dataset import has_index, reset_index
 from ebonite.repository.dataset.artifact import DatasetReader, DatasetWriter
+from ebonite.utils.importing import module_importable
+from ebonite.utils.log import logger
 
 PANDAS_DATA_FILE = 'data.pd'
+PARQUET_ROW_GROUP_SIZE = 100000
+PARQUET_MIN_SIZE = 16 * 1024 * 1024
+
+Filters = List[Tuple[str, str, Any]]
+Dtypes = Dict[str, str]
+CSV_DTYPES = re.compile(r'bool|u?int\d+|U?Int\d+|float\d+|object|string|category')
+
+
+class PandasConfig(Config):
+    namespace = 'pandas'
+    DATASET_FORMAT = Param('dataset_format', default='auto',
+                           doc='format to store DataFrame datasets in: auto or one of pandas format types')
+    COMPRESSION = Param('compression', default='zstd', doc='compression codec for feather and parquet datasets')
+
+
+if Core.DEBUG:
+    PandasConfig.log_params()
+
+FILTER_OPERATORS = {
+    '==': operator.eq,
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda column, value: column.isin(value),
+    'not in': lambda column, value: ~column.isin(value)
+}
+
+
+def filter_columns(filters: Filters = None) -> List[str]:
+    """Returns list of columns used in filters
+
+    :param filters: list of (column, operator, value) conditions"""
+    return [column for column, _, _ in filters or []]
+
+
+def read_columns(columns: List[str] = None, filters: Filters = None) -> typing.Optional[List[str]]:
+    """Returns list of columns which should be read to project DataFrame to `columns` after applying `filters`
+
+    :param columns: list of columns to select, all columns if `None`
+    :param filters: list of (column, operator, value) conditions"""
+    if columns is None:
+        return None
+    return columns + [c for c in filter_columns(filters) if c not in columns]
+
+
+def apply_filters(df: pd.DataFrame, filters: Filters = None, columns: List[str] = None) -> pd.DataFrame:
+    """Selects rows which match all filters and projects result to `columns`
+
+    :param df: DataFrame to filter
+    :param filters: list of (column, operator, value) conditions, which are combined with AND
+    :param columns: list of columns to select, all columns if `None`"""
+    if filters:
+        mask = np.ones(len(df), dtype=bool)
+        for column, op, value in filters:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f'Unknown filter operator {op}, expected one of {list(FILTER_OPERATORS.keys())}')
+            mask &= np.asarray(FILTER_OPERATORS[op](df[column], value), dtype=bool)
+        df = df[mask].reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def rebatch(frames: typing.Iterable[pd.DataFrame], batch_size: int) -> Iterator[pd.DataFrame]:
+    """Splits and merges DataFrames so that all of them except the last one have `batch_size` rows
+
+    :param frames: DataFrames to rebatch
+    :param batch_size: number of rows in batch"""
+    rest = None
+    for frame in frames:
+        if rest is not None and len(rest) > 0:
+            frame = pd.concat([rest, frame])
+        full = len(frame) // batch_size * batch_size
+        for start in range(0, full, batch_size):
+            yield frame.iloc[start:start + batch_size]
+        rest = frame.iloc[full:]
+    if rest is not None and len(rest) > 0:
+        yield rest
+
+
+def ensure_seekable(file_or_path):
+    """Buffers non-seekable stream (e.g. S3 or decompressing one) in memory, paths and seekable files are returned as is
+
+    :param file_or_path: path or file-like object"""
+    if isinstance(file_or_path, str) or (hasattr(file_or_path, 'seekable') and file_or_path.seekable()):
+        return file_or_path
+    return io.BytesIO(file_or_path.read())
 
 
 @type_field('type')
@@ -27,18 +127,54 @@ class PandasFormat:
     read_func: typing.Callable = None
     write_func: typing.Callable = None
     buffer_type: typing.Type[typing.IO] = None
+    columns_arg: str = None
+    reads_paths: bool = False
+    needs_seekable: bool = False
 
     def __init__(self, read_args: Dict[str, Any] = None, write_args: Dict[str, Any] = None):
         self.write_args = write_args or {}
         self.read_args = read_args or {}
 
-    def read(self, file_or_path):
+    def read(self, file_or_path, columns: List[str] = None, filters: Filters = None, dtypes: Dtypes = None):
         """Read DataFrame
 
-        :param file_or_path: source for read function"""
+        :param file_or_path: source for read function
+        :param columns: list of columns to read, all columns if `None`
+        :param filters: list of (column, operator, value) conditions rows must match
+        :param dtypes: mapping of column name to expected dtype string representation for formats which parse values
+        """
+        if self.needs_seekable:
+            file_or_path = ensure_seekable(file_or_path)
+        df = self._read(file_or_path, read_columns(columns, filters), dtypes)
+        return apply_filters(df, filters, columns)
+
+    def _read(self, file_or_path, columns: List[str] = None, dtypes: Dtypes = None) -> pd.DataFrame:
+        kwargs = self._read_kwargs(columns, dtypes)
+        return type(self).read_func(file_or_path, **kwargs)
+
+    def _read_kwargs(self, columns: List[str] = None, dtypes: Dtypes = None) -> Dict[str, Any]:
         kwargs = self.add_read_args()
+        if dtypes:
+            kwargs.update(self.add_dtype_args(dtypes))
         kwargs.update(self.read_args)
-        return type(self).read_func(file_or_path, **kwargs)
+        if columns is not None and self.columns_arg is not None:
+            kwargs[self.columns_arg] = columns
+        return kwargs
+
+    def read_batches(self, file_or_path, batch_size: int, columns: List[str] = None,
+                     filters: Filters = None, dtypes: Dtypes = None) -> Iterator[pd.DataFrame]:
+        """Read DataFrame in batches of `batch_size` rows.
+        Reads whole DataFrame by default, child classes should override it to read data by chunks
+
+        :param file_or_path: source for read function
+        :param batch_size: number of rows in batch
+        :param columns: list of columns to read, all columns if `None`
+        :param filters: list of (column, operator, value) conditions rows must match
+        :param dtypes: mapping of column name to expected dtype string representation for formats which parse values
+        """
+        df = self.read(file_or_path, columns, filters, dtypes)
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start:start + batch_size]
 
     def write(self, dataframe) -> typing.IO:
         """Write DataFrame to buffer
@@ -61,16 +197,38 @@ class PandasFormat:
         """Fuction with additional write argumnets for child classes to override"""
         return {}
 
+    def add_dtype_args(self, dtypes: Dtypes) -> Dict[str, Any]:
+        """Fuction with read arguments to parse columns to expected dtypes for child classes to override
+
+        :param dtypes: mapping of column name to dtype string representation"""
+        return {}
+
 
 class PandasFormatCsv(PandasFormat):
     type = 'csv'
     read_func = pd.read_csv
     write_func = pd.DataFrame.to_csv
     buffer_type = io.StringIO
+    columns_arg = 'usecols'
 
     def add_write_args(self) -> Dict[str, Any]:
         return {'index': False}
 
+    def add_dtype_args(self, dtypes: Dtypes) -> Dict[str, Any]:
+        # other types (e.g. timezone-aware datetimes) are left to DataFrameType.align as parser does not support them
+        return {'dtype': {c: d for c, d in dtypes.items() if CSV_DTYPES.fullmatch(d)},
+                'parse_dates': [c for c, d in dtypes.items() if d == 'datetime64[ns]']}
+
+    def read_batches(self, file_or_path, batch_size: int, columns: List[str] = None,
+                     filters: Filters = None, dtypes: Dtypes = None) -> Iterator[pd.DataFrame]:
+        kwargs = self._read_kwargs(read_columns(columns, filters), dtypes)
+        kwargs['chunksize'] = batch_size
+        frames = pd.read_csv(file_or_path, **kwargs)
+        if not filters and columns is None:
+            yield from frames
+            return
+        yield from rebatch((apply_filters(df, filters, columns) for df in frames), batch_size)
+
 
 class PandasFormatJson(PandasFormat):
     type = 'json'
@@ -81,9 +239,9 @@ class PandasFormatJson(PandasFormat):
     def add_write_args(self) -> Dict[str, Any]:
         return {'date_format': 'iso', 'date_unit': 'ns'}
 
-    def read(self, file_or_path):
+    def _read(self, file_or_path, columns: List[str] = None, dtypes: Dtypes = None) -> pd.DataFrame:
         # read_json creates index for some reason
-        return super(PandasFormatJson, self).read(file_or_path).reset_index(drop=True)
+        return super(PandasFormatJson, self)._read(file_or_path, columns, dtypes).reset_index(drop=True)
 
 
 class PandasFormatHtml(PandasFormat):
@@ -95,9 +253,9 @@ class PandasFormatHtml(PandasFormat):
     def add_write_args(self) -> Dict[str, Any]:
         return {'index': False}
 
-    def read(self, file_or_path):
+    def _read(self, file_or_path, columns: List[str] = None, dtypes: Dtypes = None) -> pd.DataFrame:
         # read_html returns list of dataframes
-        df = super(PandasFormatHtml, self).read(file_or_path)
+        df = super(PandasFormatHtml, self)._read(file_or_path, columns, dtypes)
         return df[0]
 
 
@@ -106,6 +264,7 @@ class PandasFormatExcel(PandasFormat):
     read_func = pd.read_excel
     write_func = pd.DataFrame.to_excel
     buffer_type = io.BytesIO
+    needs_seekable = True
 
     def add_write_args(self) -> Dict[str, Any]:
         return {'index': False}
@@ -116,6 +275,7 @@ class PandasFormatHdf(PandasFormat):
     read_func = pd.read_hdf
     write_func = pd.DataFrame.to_hdf
     buffer_type = io.BytesIO
+    reads_paths = True
 
     key = 'data'
 
@@ -139,18 +299,15 @@ class PandasFormatHdf(PandasFormat):
     def add_read_args(self) -> Dict[str, Any]:
         return {'key': self.key}
 
-    def read(self, file_or_path):
-        if not isinstance(file_or_path, str):
-            path = tempfile.mktemp('.hd5', dir='.')
-            try:
-                with open(path, 'wb') as f:
-                    f.write(file_or_path.read())
-                df = super().read(path)
-            finally:
-                os.unlink(path)
+    def _read(self, file_or_path, columns: List[str] = None, dtypes: Dtypes = None) -> pd.DataFrame:
+        kwargs = self._read_kwargs(columns, dtypes)
+        if isinstance(file_or_path, str):
+            df = type(self).read_func(file_or_path, **kwargs)
         else:
-            df = super().read(file_or_path)
-
+            # open payload as in-memory HDF5 image instead of copying it to temporary file
+            with pd.HDFStore('payload.h5', mode='r', driver='H5FD_CORE', driver_core_image=file_or_path.read(),
+                             driver_core_backing_store=0) as store:
+                df = type(self).read_func(store, **kwargs)
         return df.reset_index(drop=True)
 
 
@@ -159,6 +316,18 @@ class PandasFormatFeather(PandasFormat):
     read_func = pd.read_feather
     write_func = pd.DataFrame.to_feather
     buffer_type = io.BytesIO
+    columns_arg = 'columns'
+    reads_paths = True
+    needs_seekable = True
+
+    def write(self, dataframe) -> typing.IO:
+        if not self.write_args:
+            return super().write(dataframe)
+        # DataFrame.to_feather does not pass compression options to pyarrow
+        import pyarrow.feather
+        buf = self.buffer_type()
+        pyarrow.feather.write_feather(reset_index(dataframe), buf, **self.write_args)
+        return buf
 
 
 class PandasFormatParquet(PandasFormat):
@@ -166,6 +335,68 @@ class PandasFormatParquet(PandasFormat):
     read_func = pd.read_parquet
     write_func = pd.DataFrame.to_parquet
     buffer_type = io.BytesIO
+    columns_arg = 'columns'
+    reads_paths = True
+    needs_seekable = True
+
+    def add_write_args(self) -> Dict[str, Any]:
+        if self.write_args.get('engine', 'auto') == 'fastparquet' or not module_importable('pyarrow'):
+            return {}
+        # several row groups allow to read file by chunks
+        return {'row_group_size': PARQUET_ROW_GROUP_SIZE}
+
+    def _use_pyarrow(self):
+        return self.read_args.get('engine', 'auto') != 'fastparquet' and module_importable('pyarrow')
+
+    def read(self, file_or_path, columns: List[str] = None, filters: Filters = None, dtypes: Dtypes = None):
+        # buffer stream once, as it may be read twice if no row groups match filters
+        file_or_path = ensure_seekable(file_or_path)
+        if not filters or not self._use_pyarrow():
+            return super().read(file_or_path, columns, filters, dtypes)
+        frames = list(self._read_row_groups(file_or_path, columns, filters))
+        if not frames:
+            return super().read(file_or_path, columns, filters, dtypes)
+        return pd.concat(frames, ignore_index=True)
+
+    def read_batches(self, file_or_path, batch_size: int, columns: List[str] = None,
+                     filters: Filters = None, dtypes: Dtypes = None) -> Iterator[pd.DataFrame]:
+        if not self._use_pyarrow():
+            yield from super().read_batches(file_or_path, batch_size, columns, filters, dtypes)
+            return
+        yield from rebatch(self._read_row_groups(file_or_path, columns, filters), batch_size)
+
+    def _read_row_groups(self, file_or_path, columns: List[str] = None, filters: Filters = None):
+        """Reads row groups one by one skipping those which statistics show that no rows match filters"""
+        import pyarrow.parquet as pq
+        file = pq.ParquetFile(ensure_seekable(file_or_path))
+        to_read = read_columns(columns if columns is not None else self.read_args.get('columns'), filters)
+        for i in range(file.num_row_groups):
+            if not _row_group_matches(file.metadata.row_group(i), filters):
+                continue
+            df = file.read_row_group(i, columns=to_read, use_pandas_metadata=True).to_pandas()
+            yield apply_filters(df, filters, columns)
+
+
+def _row_group_matches(row_group, filters: Filters = None) -> bool:
+    """Checks if parquet row group may contain rows matching filters using its min/max statistics"""
+    stats = {}
+    for j in range(row_group.num_columns):
+        column = row_group.column(j)
+        if column.statistics is not None and column.statistics.has_min_max:
+            stats[column.path_in_schema] = column.statistics
+    for column, op, value in filters or []:
+        if column not in stats:
+            continue
+        low, high = stats[column].min, stats[column].max
+        try:
+            if op in ('==', '=') and not low <= value <= high or \
+                    op == '<' and not low < value or op == '<=' and not low <= value or \
+                    op == '>' and not high > value or op == '>=' and not high >= value or \
+                    op == 'in' and not any(low <= v <= high for v in value):
+                return False
+        except TypeError:  # statistics type is not comparable with value
+            continue
+    return True
 
 
 # class PandasFormatStata(PandasFormat): # TODO int32 converts to int64 for some reason
@@ -185,6 +416,55 @@ class PandasFormatParquet(PandasFormat):
 
 
 PANDAS_FORMATS = {f.type: f() for f in PandasFormat._subtypes.values() if f is not PandasFormat}
+ARROW_FORMATS = {PandasFormatFeather.type, PandasFormatParquet.type}
+
+
+def _arrow_compatible_dtype(column: pd.Series) -> bool:
+    dtype = column.dtype
+    if isinstance(dtype, (CategoricalDtype, DatetimeTZDtype, StringDtype)):
+        return True
+    if is_extension_array_dtype(dtype):
+        return is_integer_dtype(dtype)
+    if dtype.kind == 'O':
+        return pd.api.types.infer_dtype(column, skipna=True) in ('string', 'bytes', 'empty')
+    return dtype.kind in 'biufM'
+
+
+def arrow_compatible(df: pd.DataFrame) -> bool:
+    """Returns true if DataFrame can be written to arrow-based formats without loosing column types
+
+    :param df: DataFrame with reset index"""
+    return all(isinstance(c, str) for c in df.columns) and all(_arrow_compatible_dtype(df[c]) for c in df.columns)
+
+
+def _has_datetimes(df: pd.DataFrame) -> bool:
+    # parquet stores timestamps with at most microsecond precision
+    return any(isinstance(d, DatetimeTZDtype) or d.kind == 'M' for d in df.dtypes)
+
+
+def choose_format(df: pd.DataFrame) -> PandasFormat:
+    """Chooses format to store DataFrame in according to `PANDAS_DATASET_FORMAT` configuration.
+    In `auto` mode compressed parquet is used for large DataFrames and compressed feather for others.
+    Falls back to csv if pyarrow is not installed or some column types are not supported by arrow
+
+    :param df: DataFrame to store
+    :return: :class:`PandasFormat` instance"""
+    format_type = PandasConfig.DATASET_FORMAT
+    if format_type != 'auto' and format_type not in PANDAS_FORMATS:
+        raise ValueError(f'Unknown pandas dataset format {format_type}, expected auto or one of '
+                         f'{list(PANDAS_FORMATS.keys())}')
+    if format_type == 'auto' or format_type in ARROW_FORMATS:
+        df = reset_index(df)
+        if not module_importable('pyarrow') or not arrow_compatible(df):
+            if format_type != 'auto':
+                logger.warning('Cannot store dataset in %s format, falling back to csv', format_type)
+            return PandasFormatCsv()
+        compression = PandasConfig.COMPRESSION
+        if format_type == PandasFormatParquet.type or \
+                format_type == 'auto' and df.memory_usage(index=False).sum() >= PARQUET_MIN_SIZE and not _has_datetimes(df):
+            return PandasFormatParquet(write_args={'compression': compression})
+        return PandasFormatFeather(write_args={'compression': compression})
+    return type(PANDAS_FORMATS[format_type])()
 
 
 class PandasReader(DatasetReader):
@@ -198,20 +478,67 @@ class PandasReader(DatasetReader):
         self.data_type = data_type
         self.format = format
 
-    def read(self, artifacts: ArtifactCollection) -> Dataset:
-        with artifacts.blob_dict() as blobs, blobs[PANDAS_DATA_FILE].bytestream() as b:
-            return Dataset.from_object(self.data_type.align(self.format.read(b)))
+    def read(self, artifacts: ArtifactCollection, columns: List[str] = None, filters: Filters = None) -> Dataset:
+        """Reads dataset from artifacts
+
+        :param artifacts: artifacts to read
+        :param columns: list of columns (including index columns) to read, all columns if `None`
+        :param filters: list of (column, operator, value) conditions rows must match"""
+        data_type = self._select(columns)
+        with self._open(artifacts) as b:
+            df = self.format.read(b, columns, filters, self._dtypes(data_type))
+            return Dataset(data_type.align(df), data_type)
+
+    def read_batches(self, artifacts: ArtifactCollection, batch_size: int, columns: List[str] = None,
+                     filters: Filters = None) -> Iterator[Dataset]:
+        """Reads dataset from artifacts in batches of `batch_size` rows
+
+        :param artifacts: artifacts to read
+        :param batch_size: number of rows in batch
+        :param columns: list of columns (including index columns) to read, all columns if `None`
+        :param filters: list of (column, operator, value) conditions rows must match"""
+        data_type = self._select(columns)
+        with self._open(artifacts) as b:
+            for df in self.format.read_batches(b, batch_size, columns, filters, self._dtypes(data_type)):
+                yield Dataset(data_type.align(df), data_type)
+
+    @contextlib.contextmanager
+    def _open(self, artifacts: ArtifactCollection):
+        """Yields path to local payload file if format can read it in place, otherwise payload stream"""
+        with artifacts.blob_dict() as blobs:
+            blob = blobs[PANDAS_DATA_FILE]
+            path = blob.local_path() if self.format.reads_paths else None
+            if path is not None:
+                yield path
+                return
+            with blob.bytestream() as b:
+                yield b
+
+    @staticmethod
+    def _dtypes(data_type: DataFrameType) -> Dtypes:
+        return dict(zip(data_type.columns, data_type.dtypes))
+
+    def _select(self, columns: List[str] = None) -> DataFrameType:
+        if columns is None:
+            return self.data_type
+        dtypes = dict(zip(self.data_type.columns, self.data_type.dtypes))
+        missing = [c for c in columns if c not in dtypes]
+        if missing:
+            raise ValueError(f'Dataset has no columns {missing}, available columns: {self.data_type.columns}')
+        return DataFrameType(list(columns), [dtypes[c] for c in columns],
+                             [c for c in self.data_type.index_cols if c in columns])
 
 
 class PandasWriter(DatasetWriter):
     """DatasetWriter for pandas dataframes
 
-    :param format: PandasFormat instance to use
+    :param format: PandasFormat instance to use, chosen by :func:`choose_format` for each dataset if `None`
     """
 
-    def __init__(self, format: PandasFormat):
+    def __init__(self, format: PandasFormat = None):
         self.format = format
 
     def write(self, dataset: Dataset) -> Tuple[DatasetReader, ArtifactCollection]:
-        blob = LazyBlob(lambda: self.format.write(dataset.data))
-        return PandasReader(self.format, dataset.dataset_type), ArtifactCollection.from_blobs({PANDAS_DATA_FILE: blob})
+        format = self.format or choose_format(dataset.data)
+        blob = LazyBlob(lambda: format.write(dataset.data))
+        return PandasReader(format, dataset.dataset_type), ArtifactCollection.from_blobs({PANDAS_DATA_FILE: blob})
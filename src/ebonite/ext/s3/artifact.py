@@ -1,5 +1,4 @@
 import contextlib
-import io
 import os
 import typing
 
@@ -11,6 +10,7 @@ from ebonite.config import Config, Core, Param
 from ebonite.core.errors import ArtifactExistsError, NoSuchArtifactError
 from ebonite.core.objects.artifacts import ArtifactCollection, Blob, Blobs, StreamContextManager
 from ebonite.repository.artifact import ArtifactRepository
+from ebonite.repository.artifact.base import ArtifactManifest
 from ebonite.utils.log import logger
 
 
@@ -105,15 +105,33 @@ class S3ArtifactRepository(ArtifactRepository, _WithS3Client):
             return {}
         return {o['Key']: o for o in bs['Contents']}
 
+    def _read_manifest(self, artifact_id: str, keys) -> typing.Optional[ArtifactManifest]:
+        manifest_key = os.path.join(artifact_id, ArtifactManifest.file_name)
+        if manifest_key not in keys:
+            return None
+        payload = self._s3.get_object(Bucket=self.bucket_name, Key=manifest_key)['Body'].read()
+        return ArtifactManifest.from_bytes(payload)
+
     def get_artifact(self, artifact_type, artifact_id: str) -> ArtifactCollection:
         artifact_id = f'{artifact_type}/{artifact_id}'
         if not self._bucket_exists():
             raise NoSuchArtifactError(artifact_id, self)
 
-        keys = list(self._list_blobs(artifact_id).keys())
+        objects = self._list_blobs(artifact_id)
+        keys = list(objects.keys())
         if len(keys) == 0:
             raise NoSuchArtifactError(artifact_id, self)
-        elif len(keys) == 1 and keys[0] == '.':
+
+        manifest = self._read_manifest(artifact_id, objects)
+        if manifest is not None:
+            manifest.check(artifact_id, {os.path.relpath(key, artifact_id): o['Size'] for key, o in objects.items()})
+            return manifest.wrap({
+                name: S3Blob(os.path.join(artifact_id, name), self.bucket_name, self.endpoint)
+                for name in manifest.files
+            })
+
+        # artifact pushed before manifests were introduced
+        if len(keys) == 1 and keys[0] == '.':
             return Blobs({})
         else:
             return Blobs({
@@ -125,21 +143,27 @@ class S3ArtifactRepository(ArtifactRepository, _WithS3Client):
         artifact_id = f'{artifact_type}/{artifact_id}'
         self._ensure_bucket()
 
-        if len(self._list_blobs(artifact_id)) > 0:
-            raise ArtifactExistsError(artifact_id, self)
-
-        if len(blobs) == 0:
-            self._s3.upload_fileobj(io.BytesIO(b''), self.bucket_name, artifact_id)
-            return Blobs({})
-
-        result = {}
-        for filepath, blob in blobs.items():
-            join = os.path.join(artifact_id, filepath)
-            with blob.bytestream() as b:
-                logger.debug('Uploading %s to s3 %s/%s', blob, self.endpoint, self.bucket_name)
-                self._s3.upload_fileobj(b, self.bucket_name, join)
-            result[filepath] = S3Blob(join, self.bucket_name, self.endpoint)
-        return Blobs(result)
+        manifest = ArtifactManifest()
+        objects = self._list_blobs(artifact_id)
+        if len(objects) > 0:
+            manifest = self._read_manifest(artifact_id, objects)
+            if manifest is None or manifest.complete:
+                raise ArtifactExistsError(artifact_id, self)
+            logger.debug('Resuming interrupted push of artifact %s', artifact_id)
+
+        def write_blob(filepath, stream):
+            logger.debug('Uploading %s to s3 %s/%s', filepath, self.endpoint, self.bucket_name)
+            self._s3.upload_fileobj(stream, self.bucket_name, os.path.join(artifact_id, filepath))
+
+        def write_manifest(payload):
+            self._s3.put_object(Bucket=self.bucket_name, Key=os.path.join(artifact_id, ArtifactManifest.file_name),
+                                Body=payload)
+
+        manifest.push(blobs, write_blob, write_manifest)
+        return manifest.wrap({
+            filepath: S3Blob(os.path.join(artifact_id, filepath), self.bucket_name, self.endpoint)
+            for filepath in blobs
+        })
 
     def delete_artifact(self, artifact_type, artifact_id: str):
         artifact_id = f'{artifact_type}/{artifact_id}'
@@ -1,5 +1,208 @@
+from collections import Counter
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.stats import rankdata
+from sklearn.metrics import (accuracy_score, confusion_matrix, f1_score, mean_absolute_error, mean_squared_error,
+                             precision_score, recall_score, roc_auc_score)
+from sklearn.utils.multiclass import type_of_target, unique_labels
+
 from ebonite.core.analyzer.metric import LibFunctionMixin
+from ebonite.core.objects.metric import (ARRAY_LIBRARIES, SHARED_METRICS, STREAMING_ACCUMULATORS, MetricAccumulator,
+                                         MetricBatch)
+
+CLASSIFICATION_TARGETS = ('binary', 'multiclass')
 
 
 class SklearnMetricHook(LibFunctionMixin):
     base_module_name = 'sklearn'
+
+
+def _compute_confusion(truth: np.ndarray, prediction: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    if truth.ndim != 1 or prediction.ndim != 1 or len(truth) != len(prediction):
+        return None
+    # leave inputs sklearn may reject (continuous or mixed labels) to sklearn itself
+    if truth.dtype.kind != prediction.dtype.kind or \
+            type_of_target(truth) not in CLASSIFICATION_TARGETS or type_of_target(prediction) not in CLASSIFICATION_TARGETS:
+        return None
+    try:
+        labels, codes = np.unique(np.concatenate([truth, prediction]), return_inverse=True)
+    except TypeError:  # labels of different types could not be sorted
+        return None
+    size = len(labels)
+    matrix = np.bincount(codes[:len(truth)] * size + codes[len(truth):], minlength=size * size)
+    return labels, matrix.reshape(size, size)
+
+
+def shared_confusion(batch: MetricBatch) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Returns sorted labels and confusion matrix of batch with 1-dimensional targets and predictions, otherwise `None`"""
+    return batch.shared('confusion_matrix', lambda: _compute_confusion(batch.truth_array, batch.prediction_array))
+
+
+def shared_error(batch: MetricBatch) -> Optional[np.ndarray]:
+    """Returns difference between targets and predictions of batch if they have the same shape, otherwise `None`"""
+    def compute():
+        truth, prediction = batch.truth_array, batch.prediction_array
+        if truth.shape != prediction.shape or truth.ndim == 0:
+            return None
+        try:
+            return truth.astype(float) - prediction.astype(float)
+        except (TypeError, ValueError):
+            return None
+    return batch.shared('error', compute)
+
+
+class AccuracyAccumulator(MetricAccumulator):
+    """Incremental `sklearn.metrics.accuracy_score`"""
+
+    def __init__(self):
+        self.correct = 0
+        self.total = 0
+
+    def update(self, truth, prediction):
+        # normalize=False fails on some inputs which default accuracy_score handles (e.g. numbers vs strings)
+        self.correct += int(round(accuracy_score(truth, prediction) * len(truth))) if len(truth) else 0
+        self.total += len(truth)
+
+    def update_batch(self, batch: MetricBatch):
+        confusion = shared_confusion(batch)
+        if confusion is None:
+            self.update(batch.truth_array, batch.prediction_array)
+            return
+        _, matrix = confusion
+        self.correct += int(np.trace(matrix))
+        self.total += int(matrix.sum())
+
+    def result(self):
+        if self.total == 0:
+            # sklearn returns nan with warning for empty dataset
+            return accuracy_score([], [])
+        return self.correct / self.total
+
+
+class MeanErrorAccumulator(MetricAccumulator):
+    """Incremental `sklearn.metrics.mean_squared_error` and `sklearn.metrics.mean_absolute_error`
+
+    :param function: sklearn function to compute batch error
+    :param transform: elementwise function which turns difference between targets and predictions into errors"""
+
+    def __init__(self, function, transform):
+        self.function = function
+        self.transform = transform
+        self.errors = 0
+        self.total = 0
+
+    def update(self, truth, prediction):
+        self.errors = self.errors + self.function(truth, prediction, multioutput='raw_values') * len(truth)
+        self.total += len(truth)
+
+    def update_batch(self, batch: MetricBatch):
+        error = shared_error(batch)
+        if error is None:
+            self.update(batch.truth_array, batch.prediction_array)
+            return
+        self.errors = self.errors + np.atleast_1d(self.transform(error).sum(axis=0))
+        self.total += len(error)
+
+    def result(self):
+        return float(np.average(self.errors / self.total))
+
+
+class ConfusionMatrixAccumulator(MetricAccumulator):
+    """Incremental `sklearn.metrics.confusion_matrix`"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def update(self, truth, prediction):
+        labels = unique_labels(truth, prediction)
+        self._add(labels, confusion_matrix(truth, prediction, labels=labels))
+
+    def update_batch(self, batch: MetricBatch):
+        confusion = shared_confusion(batch)
+        if confusion is None:
+            self.update(batch.truth_array, batch.prediction_array)
+        else:
+            self._add(*confusion)
+
+    def _add(self, labels, matrix):
+        for i, j in zip(*np.nonzero(matrix)):
+            self.counts[labels[i], labels[j]] += matrix[i, j]
+
+    def result(self):
+        labels = sorted({label for pair in self.counts for label in pair})
+        index = {label: i for i, label in enumerate(labels)}
+        matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        for (true_label, pred_label), count in self.counts.items():
+            matrix[index[true_label], index[pred_label]] = count
+        return matrix
+
+
+def _binary_counts(batch: MetricBatch) -> Optional[Tuple[int, int, int]]:
+    """Returns true positives, false positives and false negatives for batch with 0 and 1 labels"""
+    confusion = shared_confusion(batch)
+    if confusion is None:
+        return None
+    labels, matrix = confusion
+    if len(labels) == 0 or not set(labels.tolist()) <= {0, 1}:
+        return None
+    if 1 not in labels.tolist():
+        return 0, 0, 0
+    positive = labels.tolist().index(1)
+    tp = int(matrix[positive, positive])
+    return tp, int(matrix[:, positive].sum()) - tp, int(matrix[positive, :].sum()) - tp
+
+
+def _ratio(numerator, denominator):
+    # sklearn returns 0 with warning on zero division
+    return numerator / denominator if denominator else 0.
+
+
+def _precision(batch: MetricBatch):
+    counts = _binary_counts(batch)
+    return None if counts is None else _ratio(counts[0], counts[0] + counts[1])
+
+
+def _recall(batch: MetricBatch):
+    counts = _binary_counts(batch)
+    return None if counts is None else _ratio(counts[0], counts[0] + counts[2])
+
+
+def _f1(batch: MetricBatch):
+    counts = _binary_counts(batch)
+    return None if counts is None else _ratio(2 * counts[0], 2 * counts[0] + counts[1] + counts[2])
+
+
+def _roc_auc(batch: MetricBatch):
+    truth, prediction = batch.truth_array, batch.prediction_array
+    if truth.ndim != 1 or prediction.ndim != 1 or len(truth) != len(prediction) or prediction.dtype.kind not in 'biuf':
+        return None
+    positive = truth == 1
+    positives = int(positive.sum())
+    negatives = len(truth) - positives
+    if positives == 0 or negatives == 0 or not np.all(positive | (truth == 0)):
+        return None
+    # Mann-Whitney statistic on tie-averaged ranks of sorted scores
+    ranks = batch.shared('prediction_ranks', lambda: rankdata(prediction))
+    return float((ranks[positive].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def _full_name(function):
+    return f'{function.__module__}.{function.__name__}'
+
+
+STREAMING_ACCUMULATORS.update({
+    _full_name(accuracy_score): AccuracyAccumulator,
+    _full_name(mean_squared_error): lambda: MeanErrorAccumulator(mean_squared_error, np.square),
+    _full_name(mean_absolute_error): lambda: MeanErrorAccumulator(mean_absolute_error, np.abs),
+    _full_name(confusion_matrix): ConfusionMatrixAccumulator
+})
+
+SHARED_METRICS.update({
+    _full_name(precision_score): _precision,
+    _full_name(recall_score): _recall,
+    _full_name(f1_score): _f1,
+    _full_name(roc_auc_score): _roc_auc
+})
+
+ARRAY_LIBRARIES.add('sklearn')
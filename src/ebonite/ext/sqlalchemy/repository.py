@@ -1,5 +1,5 @@
 import contextlib
-from typing import List, Optional, Type, TypeVar, Union
+from typing import List, Optional, Sequence, Type, TypeVar, Union
 
 from sqlalchemy import create_engine
 from sqlalchemy.exc import IntegrityError
@@ -299,6 +299,10 @@ class SQLAlchemyMetaRepository(MetadataRepository):
 
             return pipeline
 
+    def update_models_and_pipelines(self, objects: Sequence[Union[Model, Pipeline]]):
+        with self._session():
+            super().update_models_and_pipelines(objects)
+
     def delete_pipeline(self, pipeline: Pipeline):
         self._delete_object(self.pipelines, pipeline, NonExistingPipelineError, AssertionError)
         pipeline.unbind_meta_repo()
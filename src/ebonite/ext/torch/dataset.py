@@ -77,6 +77,9 @@ class TorchTensorDatasetType(ListTypeWithSpec, LibDatasetTypeMixin):
         self._check_shape(instance, SerializationError)
         return instance.tolist()
 
+    def head(self, instance: torch.Tensor, size: int):
+        return instance[:size]
+
     def _check_shape(self, tensor, exc_type):
         if tuple(tensor.shape)[1:] != self.shape[1:]:
             raise exc_type(f'given tensor is of shape: {(None,) + tuple(tensor.shape)[1:]}, expected: {self.shape}')
@@ -1,14 +1,14 @@
 import contextlib
 import os
+import tempfile
 import typing
-from io import BytesIO
 
 import torch
 from pyjackson.decorators import make_string
 
 from ebonite.core.analyzer import TypeHookMixin
 from ebonite.core.analyzer.model import BindingModelHook
-from ebonite.core.objects.artifacts import ArtifactCollection, Blobs, InMemoryBlob
+from ebonite.core.objects.artifacts import ArtifactCollection, Blobs, LocalFileBlob
 from ebonite.core.objects.wrapper import ModelIO, ModelWrapper
 
 
@@ -18,11 +18,12 @@ class TorchModelIO(ModelIO):
     """
     model_file_name = 'model.pth'
     model_jit_file_name = 'model.jit.pth'
+    thread_safe = True
 
     @contextlib.contextmanager
     def dump(self, model) -> ArtifactCollection:
         """
-        Dumps `torch.nn.Module` instance to :class:`.InMemoryBlob` and creates :class:`.ArtifactCollection` from it
+        Dumps `torch.nn.Module` instance to :class:`.LocalFileBlob` and creates :class:`.ArtifactCollection` from it
 
         :return: context manager with :class:`~ebonite.core.objects.ArtifactCollection`
         """
@@ -30,9 +31,10 @@ class TorchModelIO(ModelIO):
         save = torch.jit.save if is_jit else torch.save
         model_name = self.model_jit_file_name if is_jit else self.model_file_name
 
-        buffer = BytesIO()
-        save(model, buffer)
-        yield Blobs({model_name: InMemoryBlob(buffer.getvalue())})
+        with tempfile.TemporaryDirectory(prefix='ebonite_torch_dump') as tmpdir:
+            path = os.path.join(tmpdir, model_name)
+            save(model, path)
+            yield Blobs({model_name: LocalFileBlob(path)})
 
     def load(self, path):
         """
@@ -1,4 +1,5 @@
 import contextlib
+import json
 import os
 import tempfile
 import typing
@@ -8,7 +9,9 @@ import xgboost
 from ebonite.core.analyzer.base import TypeHookMixin
 from ebonite.core.analyzer.model import BindingModelHook
 from ebonite.core.objects.artifacts import Blobs, LocalFileBlob
+from ebonite.core.objects.dataset_type import DatasetType
 from ebonite.core.objects.wrapper import FilesContextManager, LibModelWrapperMixin, ModelIO, ModelWrapper
+from ebonite.ext.numpy.dataset import NumpyNdarrayDatasetType
 
 
 class XGBoostModelIO(ModelIO):
@@ -16,6 +19,7 @@ class XGBoostModelIO(ModelIO):
     :class:`~.ModelIO` implementation for XGBoost models
     """
     model_path = 'model.xgb'
+    thread_safe = True
 
     @contextlib.contextmanager
     def dump(self, model: xgboost.Booster) -> FilesContextManager:
@@ -44,6 +48,18 @@ class XGBoostModelWrapper(LibModelWrapperMixin):
             'predict': '_predict'
         }
 
+    def _static_output_type(self, wrapped: str, arg_type: DatasetType) -> typing.Optional[DatasetType]:
+        """
+        Determines shape of predictions from booster objective, predictions are always `float32`
+        """
+        try:
+            config = json.loads(self.model.save_config())['learner']
+        except (AttributeError, KeyError, ValueError):  # config is not available in xgboost < 1.0
+            return None
+        if config['objective']['name'] == 'multi:softprob':
+            return NumpyNdarrayDatasetType((None, int(config['learner_model_param']['num_class'])), 'float32')
+        return NumpyNdarrayDatasetType((None,), 'float32')
+
     @ModelWrapper.with_model
     def _predict(self, data):
         if not isinstance(data, xgboost.DMatrix):
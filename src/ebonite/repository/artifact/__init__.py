@@ -1,3 +1,4 @@
 from .base import ArtifactRepository, RepoArtifactBlob
+from .compressed import CompressedArtifactRepository
 
-__all__ = ['ArtifactRepository', 'RepoArtifactBlob']
+__all__ = ['ArtifactRepository', 'RepoArtifactBlob', 'CompressedArtifactRepository']
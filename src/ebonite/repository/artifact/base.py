@@ -1,10 +1,16 @@
 import typing
 from abc import abstractmethod
 
+from pyjackson import dumps, loads
 from pyjackson.decorators import type_field
 
+from ebonite.core import errors
 from ebonite.core.objects import core
-from ebonite.core.objects.artifacts import ArtifactCollection, Blob
+from ebonite.core.objects.artifacts import ArtifactCollection, Blob, Blobs, VerifiedBlob
+from ebonite.core.objects.base import EboniteParams
+from ebonite.core.objects.requirements import CustomRequirement, Requirements
+from ebonite.utils.hashing import HashingReader
+from ebonite.utils.log import logger
 
 
 @type_field('type')
@@ -15,6 +21,8 @@ class ArtifactRepository:
 
     type = None
     MODEL_TYPE = 'model'
+    SOURCES_TYPE = 'sources'
+    SOURCES_PUSH_ATTEMPTS = 3
 
     def get_model_id(self, model: 'core.Model') -> str:
         model_id = model.id
@@ -35,9 +43,45 @@ class ArtifactRepository:
             with artifact.blob_dict() as files:
                 return self.push_model_artifact(model, files)
 
+        if model.requirements is not None:
+            model.requirements = self.push_requirements_sources(model.requirements)
         model.persist_artifacts(_persister)
         model.bind_artifact_repo(self)
 
+    def push_requirements_sources(self, requirements: Requirements) -> Requirements:
+        """
+        Stores sources of custom requirements as artifacts addressed by their hash, so models with same
+        custom requirements share one copy of them. Corrupted sources artifacts are deleted and pushed again.
+        Sources artifacts are not reference counted and are never deleted with models, so sources no longer used
+        by any model stay in the repository until deleted with
+        :meth:`.ArtifactRepository.delete_artifact` (`SOURCES_TYPE` artifact named by requirement digest)
+
+        :param requirements: requirements to store sources for
+        :return: :class:`.Requirements` where custom requirements reference stored sources
+        """
+        return Requirements([self._push_requirement_sources(r)
+                             if isinstance(r, CustomRequirement) and r.source64zip is not None else r
+                             for r in requirements.requirements])
+
+    def _push_requirement_sources(self, requirement: CustomRequirement) -> CustomRequirement:
+        for _ in range(self.SOURCES_PUSH_ATTEMPTS):
+            try:
+                return requirement.with_artifact(self.get_artifact(self.SOURCES_TYPE, requirement.digest))
+            except errors.NoSuchArtifactError:
+                pass
+            except errors.ArtifactIntegrityError:
+                logger.warning('Sources artifact %s is corrupted, pushing it again', requirement.digest)
+                try:
+                    self.delete_artifact(self.SOURCES_TYPE, requirement.digest)
+                except errors.NoSuchArtifactError:
+                    pass
+            try:
+                return requirement.with_artifact(self.push_artifact(self.SOURCES_TYPE, requirement.digest,
+                                                                    requirement.sources_blobs()))
+            except errors.ArtifactExistsError:
+                continue  # pushed concurrently by other model
+        return requirement.with_artifact(self.get_artifact(self.SOURCES_TYPE, requirement.digest))
+
     def push_model_artifact(self, model: 'core.Model', blobs: typing.Dict[str, Blob]) -> ArtifactCollection:
         """
         Stores given :class:`.Blob` artifacts in the repository and associates them with given model
@@ -88,3 +132,103 @@ class ArtifactRepository:
 class RepoArtifactBlob(Blob):
     def __init__(self, repository: ArtifactRepository):
         self.repository = repository
+
+
+class BlobInfo(EboniteParams):
+    """
+    Size and hash of blob payload
+
+    :param size: payload size
+    :param digest: payload hash hex digest
+    """
+
+    def __init__(self, size: int, digest: str):
+        self.size = size
+        self.digest = digest
+
+
+class ArtifactManifest(EboniteParams):
+    """
+    Manifest which is stored alongside artifact blobs and describes their payloads.
+    It is saved periodically while blobs are pushed, so interrupted pushes may be resumed
+
+    :param files: dict of blob name -> :class:`BlobInfo`
+    :param complete: whether all blobs were pushed
+    """
+    file_name = '.ebonite_manifest.json'
+    save_every_blobs = 16
+    save_every_bytes = 256 * 1024 * 1024
+
+    def __init__(self, files: typing.Dict[str, BlobInfo] = None, complete: bool = False):
+        self.files = files or {}
+        self.complete = complete
+
+    def to_bytes(self) -> bytes:
+        return dumps(self).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'ArtifactManifest':
+        return loads(payload.decode('utf-8'), cls)
+
+    def check(self, artifact_id: str, sizes: typing.Dict[str, int]):
+        """
+        Cheaply checks that artifact is complete and stored blobs have expected sizes
+
+        :param artifact_id: artifact id for error messages
+        :param sizes: dict of stored blob name -> size
+        :exception: :exc:`.ArtifactIntegrityError` if artifact is incomplete or blob is missing or has wrong size
+        """
+        if not self.complete:
+            raise errors.ArtifactIntegrityError(f'Artifact {artifact_id} push was not completed')
+        for name, info in self.files.items():
+            if sizes.get(name) != info.size:
+                raise errors.ArtifactIntegrityError(f'Artifact {artifact_id} blob {name} is missing or has wrong size')
+
+    def wrap(self, blobs: typing.Dict[str, Blob]) -> Blobs:
+        """
+        Wraps stored blobs to verify them on read
+
+        :param blobs: dict of blob name -> stored blob
+        :return: :class:`.Blobs` of :class:`.VerifiedBlob`
+        """
+        return Blobs({name: VerifiedBlob(blobs[name], info.size, info.digest) for name, info in self.files.items()})
+
+    def push(self, blobs: typing.Dict[str, Blob], write_blob: typing.Callable[[str, typing.BinaryIO], None],
+             write_manifest: typing.Callable[[bytes], None]):
+        """
+        Helper method for artifact repositories which writes blobs computing their sizes and hashes on the fly.
+        Manifest is written before and after pushing blobs, and in between only after every
+        :attr:`save_every_blobs` blobs or :attr:`save_every_bytes` bytes and when push fails.
+        Blobs which are already in manifest (after interrupted push) are skipped without reading them
+        unless their known content hash differs
+
+        :param blobs: dict of blob name -> blob to push
+        :param write_blob: function which writes payload read from given file-like object to blob with given name
+        :param write_manifest: function which writes manifest payload
+        """
+        self.files = {name: info for name, info in self.files.items() if name in blobs}
+        self.complete = False
+        write_manifest(self.to_bytes())
+        unsaved_blobs = unsaved_bytes = 0
+        try:
+            for name, blob in blobs.items():
+                known = self.files.get(name)
+                if known is not None and blob.content_digest() in (None, known.digest):
+                    logger.debug('Skipping already pushed blob %s', name)
+                    continue
+                with blob.bytestream() as b:
+                    reader = HashingReader(b)
+                    write_blob(name, reader)
+                    reader.read_to_end()
+                self.files[name] = BlobInfo(reader.size, reader.digest)
+                unsaved_blobs += 1
+                unsaved_bytes += reader.size
+                if unsaved_blobs >= self.save_every_blobs or unsaved_bytes >= self.save_every_bytes:
+                    write_manifest(self.to_bytes())
+                    unsaved_blobs = unsaved_bytes = 0
+        except BaseException:
+            if unsaved_blobs > 0:
+                write_manifest(self.to_bytes())
+            raise
+        self.complete = True
+        write_manifest(self.to_bytes())
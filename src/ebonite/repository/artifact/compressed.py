@@ -0,0 +1,123 @@
+import io
+import os
+import shutil
+import tempfile
+import typing
+
+from pyjackson.decorators import cached_property
+
+from ebonite.core.objects.artifacts import ArtifactCollection, Blob, Blobs, CompressedBlob, InMemoryBlob, LocalFileBlob
+from ebonite.repository.artifact import ArtifactRepository
+from ebonite.utils.compression import CHUNK_SIZE, CODECS, Codec, get_codec
+from ebonite.utils.log import logger
+
+COMPRESSED_SUFFIX = '.ebnt-'
+ALREADY_COMPRESSED_EXTENSIONS = {
+    '.gz', '.tgz', '.zip', '.bz2', '.xz', '.lzma', '.zst', '.lz4', '.7z', '.rar',
+    '.npz', '.parquet', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4'
+}
+
+
+class CompressedArtifactRepository(ArtifactRepository):
+    """
+    :class:`.ArtifactRepository` wrapper which transparently compresses blobs before pushing them to underlying
+    repository. Compressed blobs are stored with codec name in their suffix and are returned as
+    :class:`.CompressedBlob` which remembers the codec, so artifacts pushed without compression stay readable.
+
+    Small blobs, blobs with known compressed formats and blobs which sample does not compress well are stored as is.
+
+    :param repo: underlying repository to store blobs in
+    :param codec: compression codec type name, first available of zstd, lz4 and gzip if `None`
+    :param level: compression level, codec default if `None`
+    :param min_size: blobs smaller than this number of bytes are not compressed
+    :param max_ratio: blobs are not compressed if their sample compression ratio is greater than this
+    """
+    type = 'compressed'
+    SAMPLE_SIZE = 64 * 1024
+
+    def __init__(self, repo: ArtifactRepository, codec: str = None, level: int = None,
+                 min_size: int = 4096, max_ratio: float = 0.9):
+        self.repo = repo
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+        self.max_ratio = max_ratio
+
+    @cached_property
+    def _codec(self) -> Codec:
+        return get_codec(self.codec, self.level)
+
+    def _should_compress(self, sample: bytes) -> bool:
+        if len(sample) < self.min_size:
+            return False
+        return len(self._codec.compress(sample)) <= len(sample) * self.max_ratio
+
+    def _prepare_blob(self, name: str, blob: Blob, path: str) -> typing.Tuple[str, Blob]:
+        if os.path.splitext(name)[1].lower() in ALREADY_COMPRESSED_EXTENSIONS:
+            return name, blob
+        # blob stream is opened once: lazy blobs serialize and verified blobs are hashed only once
+        with blob.bytestream() as src:
+            sample = src.read(self.SAMPLE_SIZE)
+            if len(sample) < self.SAMPLE_SIZE:  # whole payload is already read
+                if not self._should_compress(sample):
+                    return name, InMemoryBlob(sample)
+                return name + COMPRESSED_SUFFIX + self._codec.type, InMemoryBlob(self._codec.compress(sample))
+            compress = self._should_compress(sample)
+            if not compress and isinstance(blob, (LocalFileBlob, InMemoryBlob)):
+                return name, blob  # cheap to read again, no need to copy
+            stream = _PrefixedReader(sample, src)
+            with open(path, 'wb') as dst:
+                if not compress:
+                    shutil.copyfileobj(stream, dst, CHUNK_SIZE)
+                    return name, LocalFileBlob(path)
+                logger.debug('Compressing %s with %s', name, self._codec.type)
+                self._codec.compress_stream(stream, dst)
+        return name + COMPRESSED_SUFFIX + self._codec.type, LocalFileBlob(path)
+
+    @staticmethod
+    def _wrap(artifact: ArtifactCollection) -> ArtifactCollection:
+        result = {}
+        with artifact.blob_dict() as blobs:
+            for name, blob in blobs.items():
+                original, sep, codec = name.rpartition(COMPRESSED_SUFFIX)
+                if sep and codec in CODECS:
+                    result[original] = CompressedBlob(blob, codec)
+                else:
+                    result[name] = blob
+        return Blobs(result)
+
+    def push_artifact(self, artifact_type: str, artifact_id: str, blobs: typing.Dict[str, Blob]) -> ArtifactCollection:
+        with tempfile.TemporaryDirectory(prefix='ebonite_compress') as tmpdir:
+            to_push = dict(self._prepare_blob(name, blob, os.path.join(tmpdir, str(i)))
+                           for i, (name, blob) in enumerate(blobs.items()))
+            pushed = self.repo.push_artifact(artifact_type, artifact_id, to_push)
+        return self._wrap(pushed)
+
+    def get_artifact(self, artifact_type: str, artifact_id: str) -> ArtifactCollection:
+        return self._wrap(self.repo.get_artifact(artifact_type, artifact_id))
+
+    def delete_artifact(self, artifact_type: str, artifact_id: str):
+        self.repo.delete_artifact(artifact_type, artifact_id)
+
+
+class _PrefixedReader(io.RawIOBase):
+    """
+    Readable stream of already read `prefix` followed by the rest of `stream`
+    """
+
+    def __init__(self, prefix: bytes, stream: typing.BinaryIO):
+        self.prefix = memoryview(prefix)
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.prefix:
+            n = min(len(b), len(self.prefix))
+            b[:n] = self.prefix[:n]
+            self.prefix = self.prefix[n:]
+            return n
+        data = self.stream.read(len(b))
+        b[:len(data)] = data
+        return len(data)
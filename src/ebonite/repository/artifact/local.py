@@ -6,6 +6,8 @@ import typing
 from ebonite.core.errors import ArtifactExistsError, NoSuchArtifactError
 from ebonite.core.objects.artifacts import ArtifactCollection, Blob, Blobs, LocalFileBlob
 from ebonite.repository.artifact import ArtifactRepository
+from ebonite.repository.artifact.base import ArtifactManifest
+from ebonite.utils.compression import CHUNK_SIZE
 from ebonite.utils.fs import get_lib_path
 from ebonite.utils.log import logger
 
@@ -22,31 +24,58 @@ class LocalArtifactRepository(ArtifactRepository):
     def __init__(self, path: str = None):
         self.path = os.path.abspath(path or get_lib_path('local_storage'))
 
+    @staticmethod
+    def _read_manifest(path: str) -> typing.Optional[ArtifactManifest]:
+        manifest_path = os.path.join(path, ArtifactManifest.file_name)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, 'rb') as f:
+            return ArtifactManifest.from_bytes(f.read())
+
     def get_artifact(self, artifact_type, artifact_id: str) -> ArtifactCollection:
         artifact_id = f'{artifact_type}/{artifact_id}'
         path = os.path.join(self.path, artifact_id)
         if not os.path.exists(path):
             raise NoSuchArtifactError(artifact_id, self)
-        return Blobs({
-            os.path.relpath(file, path): LocalFileBlob(os.path.join(self.path, file)) for file in
-            glob.glob(os.path.join(path, '**'), recursive=True) if os.path.isfile(file)
-        })
+        manifest = self._read_manifest(path)
+        if manifest is None:
+            # artifact pushed before manifests were introduced
+            return Blobs({
+                os.path.relpath(file, path): LocalFileBlob(os.path.join(self.path, file)) for file in
+                glob.glob(os.path.join(path, '**'), recursive=True) if os.path.isfile(file)
+            })
+        files = {name: os.path.join(path, name) for name in manifest.files}
+        manifest.check(artifact_id, {name: os.path.getsize(file) for name, file in files.items()
+                                     if os.path.isfile(file)})
+        return manifest.wrap({name: LocalFileBlob(file) for name, file in files.items()})
 
     def push_artifact(self, artifact_type, artifact_id: str, blobs: typing.Dict[str, Blob]) -> ArtifactCollection:
         artifact_id = f'{artifact_type}/{artifact_id}'
         path = os.path.join(self.path, artifact_id)
+        manifest = ArtifactManifest()
         if os.path.exists(path):
-            raise ArtifactExistsError(artifact_id, self)
+            manifest = self._read_manifest(path)
+            if manifest is None or manifest.complete:
+                raise ArtifactExistsError(artifact_id, self)
+            logger.debug('Resuming interrupted push of artifact %s', artifact_id)
 
         os.makedirs(path, exist_ok=True)
-        result = {}
-        for filepath, blob in blobs.items():
+
+        def write_blob(filepath, stream):
             join = os.path.join(path, filepath)
             os.makedirs(os.path.dirname(join), exist_ok=True)
-            logger.debug('Writing artifact %s to %s', blob, join)
-            blob.materialize(join)
-            result[filepath] = LocalFileBlob(join)
-        return Blobs(result)
+            logger.debug('Writing artifact %s to %s', filepath, join)
+            with open(join, 'wb') as f:
+                shutil.copyfileobj(stream, f, CHUNK_SIZE)
+
+        def write_manifest(payload):
+            manifest_path = os.path.join(path, ArtifactManifest.file_name)
+            with open(manifest_path + '.tmp', 'wb') as f:
+                f.write(payload)
+            os.replace(manifest_path + '.tmp', manifest_path)
+
+        manifest.push(blobs, write_blob, write_manifest)
+        return manifest.wrap({filepath: LocalFileBlob(os.path.join(path, filepath)) for filepath in blobs})
 
     def delete_artifact(self, artifact_type, artifact_id: str):
         artifact_id = f'{artifact_type}/{artifact_id}'
@@ -1,16 +1,24 @@
+import datetime
 import pickle
+import uuid
 from abc import abstractmethod
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from pyjackson import dumps, loads, serialize
 from pyjackson.decorators import type_field
+from pyjackson.errors import SerializationError
 
-from ebonite.core.errors import ArtifactExistsError, DatasetExistsError, NoSuchArtifactError, NoSuchDataset
+from ebonite.core.errors import (ArtifactExistsError, ArtifactIntegrityError, DatasetExistsError, NoSuchArtifactError,
+                                 NoSuchDataset)
 from ebonite.core.objects import ArtifactCollection, DatasetType
 from ebonite.core.objects.artifacts import Blobs, InMemoryBlob
 from ebonite.core.objects.base import EboniteParams
 from ebonite.core.objects.dataset_source import Dataset, DatasetSource
+from ebonite.core.objects.metric import concat_batches
 from ebonite.repository import ArtifactRepository
 from ebonite.repository.dataset.base import DatasetRepository
+from ebonite.utils.hashing import hash_parts, params_digest
 
 
 @type_field('type')
@@ -23,6 +31,14 @@ class DatasetReader(EboniteParams):
 
         :param artifacts: artifacts to read"""
 
+    def read_batches(self, artifacts: ArtifactCollection, batch_size: int) -> Iterator[Dataset]:
+        """Method to read Dataset from artifacts in batches of `batch_size` rows.
+        Reads whole dataset by default, subclasses should override it to read data by chunks
+
+        :param artifacts: artifacts to read
+        :param batch_size: number of rows in batch"""
+        yield from self.read(artifacts).iterate_batches(batch_size)
+
 
 @type_field('type')
 class DatasetWriter(EboniteParams):
@@ -42,7 +58,8 @@ class OneFileDatasetReader(DatasetReader):
         self.dataset_type = dataset_type
 
     def read(self, artifacts: ArtifactCollection) -> Dataset:
-        payload = artifacts.bytes_dict()[OneFileDatasetWriter.FILENAME]
+        with artifacts.blob_dict() as blobs:
+            payload = blobs[OneFileDatasetWriter.FILENAME].bytes()
         return Dataset(self.convert(payload), self.dataset_type)
 
     @abstractmethod
@@ -87,6 +104,8 @@ class ArtifactDatasetRepository(DatasetRepository):
     :param repo: underlying ArtifactRepository"""
 
     ARTIFACT_TYPE = 'datasets'
+    PARTITIONS_FILE = 'partitions.json'
+    manifest_read_workers = 8
 
     def __init__(self, repo: ArtifactRepository):
         self.repo = repo
@@ -102,13 +121,158 @@ class ArtifactDatasetRepository(DatasetRepository):
                 pushed = self.repo.push_artifact(self.ARTIFACT_TYPE, dataset_id, blobs)
             except ArtifactExistsError as e:
                 raise DatasetExistsError(dataset_id, self, e)
-        return ArtifactDatasetSource(reader, pushed, dataset.dataset_type)
+        return ArtifactDatasetSource(reader, pushed, dataset.dataset_type, dataset_id)
+
+    def append(self, dataset_id: str, dataset: Dataset, partition: str = None) -> DatasetSource:
+        """Pushes dataset as a new partition of append-only dataset. Only new partition and a small manifest
+        describing it are uploaded. Manifests are never overwritten: every append pushes next manifest version
+        under a new key, so failed append leaves previous versions intact.
+        Appends to one dataset must not run concurrently: artifact repositories have no atomic create operation,
+        so concurrent append is only detected on a best effort basis
+
+        :param dataset_id: dataset identifier
+        :param dataset: data of new partition
+        :param partition: partition key, current UTC timestamp is used if `None`.
+            Keys are compared as strings to filter partitions, so they should be sortable (e.g. ISO dates)
+        :returns: :class:`PartitionedDatasetSource` with all partitions of dataset"""
+        partition = partition or datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        if '/' in partition:
+            raise ValueError(f'Partition key {partition} must not contain "/"')
+        manifests = self._read_manifests(dataset_id)
+        manifest = _PartitionsManifest.merge(manifests)
+        if manifest is not None and manifest.dataset_type != dataset.dataset_type:
+            raise ValueError(f'Partition type {dataset.dataset_type} differs from dataset type '
+                             f'{manifest.dataset_type}')
+        if manifest is not None and partition in manifest.partitions:
+            raise DatasetExistsError(f'{dataset_id}/{partition}', self)
+
+        # partition artifacts get unique ids, so partitions of failed appends never clash with later ones
+        partition_id = f'{self._partition_id(dataset_id, partition)}.{uuid.uuid4().hex[:12]}'
+        pushed = self.save(partition_id, dataset)
+        info = _PartitionInfo(partition_id, pushed.reader, _serializable_or_none(pushed.artifacts))
+        delta = _PartitionsManifest(dataset.dataset_type, {partition: info})
+        try:
+            self.repo.push_artifact(self.ARTIFACT_TYPE, self._manifest_id(dataset_id, len(manifests)),
+                                    {self.PARTITIONS_FILE: InMemoryBlob(delta.to_bytes())})
+        except ArtifactExistsError as e:
+            self.repo.delete_artifact(self.ARTIFACT_TYPE, partition_id)
+            raise DatasetExistsError(f'{dataset_id}/{partition}', self,
+                                     RuntimeError(f'Dataset {dataset_id} was appended concurrently: {e}'))
+        except BaseException:
+            self.repo.delete_artifact(self.ARTIFACT_TYPE, partition_id)
+            raise
+        return self._partitioned_source(_PartitionsManifest.merge(manifests + [delta]))
+
+    def _manifest_id(self, dataset_id: str, version: int) -> str:
+        # first version is stored as dataset itself, so it clashes with non-partitioned dataset with the same id
+        return dataset_id if version == 0 else f'{dataset_id}.manifests/{version}'
+
+    def _read_manifest(self, dataset_id: str, version: int) -> Optional['_PartitionsManifest']:
+        try:
+            artifacts = self.repo.get_artifact(self.ARTIFACT_TYPE, self._manifest_id(dataset_id, version))
+        except (NoSuchArtifactError, ArtifactIntegrityError):
+            # integrity error means that push of this version was interrupted, next append pushes it again
+            return None
+        with artifacts.blob_dict() as blobs:
+            if self.PARTITIONS_FILE not in blobs:
+                raise ValueError(f'Dataset {dataset_id} is not partitioned, it could not be appended')
+            return _PartitionsManifest.from_bytes(blobs[self.PARTITIONS_FILE].bytes())
+
+    def _read_manifests(self, dataset_id: str) -> List['_PartitionsManifest']:
+        """Reads manifest versions concurrently in chunks until the first missing one
+
+        :returns: list of manifests, each of them describes partitions added by one append"""
+        manifests = []
+        with ThreadPoolExecutor(max_workers=self.manifest_read_workers) as executor:
+            while True:
+                versions = range(len(manifests), len(manifests) + self.manifest_read_workers)
+                for manifest in executor.map(lambda v: self._read_manifest(dataset_id, v), versions):
+                    if manifest is None:
+                        return manifests
+                    manifests.append(manifest)
+
+    def _partitioned_source(self, manifest: '_PartitionsManifest') -> 'PartitionedDatasetSource':
+        partitions = {}
+        for key, info in manifest.partitions.items():
+            artifacts = info.artifacts
+            if artifacts is None:
+                artifacts = self.repo.get_artifact(self.ARTIFACT_TYPE, info.artifact_id)
+            partitions[key] = ArtifactDatasetSource(info.reader, artifacts, manifest.dataset_type, info.artifact_id)
+        return PartitionedDatasetSource(partitions, manifest.dataset_type)
+
+    @staticmethod
+    def _partition_id(dataset_id: str, partition: str):
+        return f'{dataset_id}.partitions/{partition}'
 
     def delete(self, dataset_id: str):
         try:
-            self.repo.delete_artifact(self.ARTIFACT_TYPE, dataset_id)
+            artifacts = self.repo.get_artifact(self.ARTIFACT_TYPE, dataset_id)
         except NoSuchArtifactError as e:
             raise NoSuchDataset(dataset_id, self, e)
+        with artifacts.blob_dict() as blobs:
+            partitioned = self.PARTITIONS_FILE in blobs
+        if partitioned:
+            manifests = self._read_manifests(dataset_id)
+            for info in _PartitionsManifest.merge(manifests).partitions.values():
+                self.repo.delete_artifact(self.ARTIFACT_TYPE, info.artifact_id)
+            for version in range(len(manifests), 0, -1):
+                try:
+                    self.repo.delete_artifact(self.ARTIFACT_TYPE, self._manifest_id(dataset_id, version))
+                except NoSuchArtifactError:
+                    pass
+        self.repo.delete_artifact(self.ARTIFACT_TYPE, dataset_id)
+
+
+def _serializable_or_none(artifacts: ArtifactCollection) -> Optional[ArtifactCollection]:
+    try:
+        serialize(artifacts, ArtifactCollection)
+    except SerializationError:
+        return None
+    return artifacts
+
+
+class _PartitionInfo(EboniteParams):
+    """Partition of append-only dataset
+
+    :param artifact_id: id of partition artifact
+    :param reader: DatasetReader for partition
+    :param artifacts: partition artifacts if they are serializable, otherwise they are got from repository by id"""
+
+    def __init__(self, artifact_id: str, reader: DatasetReader, artifacts: ArtifactCollection = None):
+        self.artifact_id = artifact_id
+        self.reader = reader
+        self.artifacts = artifacts
+
+
+class _PartitionsManifest(EboniteParams):
+    """Manifest of partitions added to append-only dataset by one append
+
+    :param dataset_type: DatasetType of dataset
+    :param partitions: mapping of partition key to partition in order of appending"""
+
+    def __init__(self, dataset_type: DatasetType, partitions: Dict[str, _PartitionInfo]):
+        self.dataset_type = dataset_type
+        self.partitions = partitions
+
+    def to_bytes(self) -> bytes:
+        return dumps(self).encode('utf8')
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> '_PartitionsManifest':
+        return loads(payload.decode('utf8'), cls)
+
+    @staticmethod
+    def merge(manifests: List['_PartitionsManifest']) -> Optional['_PartitionsManifest']:
+        """Merges manifests of successive appends
+
+        :param manifests: manifests in order of appending
+        :returns: manifest with all partitions or `None` if there are no manifests"""
+        if not manifests:
+            return None
+        partitions = {}
+        for manifest in manifests:
+            partitions.update(manifest.partitions)
+        return _PartitionsManifest(manifests[0].dataset_type, partitions)
 
 
 class ArtifactDatasetSource(DatasetSource):
@@ -116,12 +280,76 @@ class ArtifactDatasetSource(DatasetSource):
 
     :param reader: DatasetReader for this dataset
     :param artifacts: ArtifactCollection with actual files
-    :param dataset_type: DatasetType of contained dataset"""
+    :param dataset_type: DatasetType of contained dataset
+    :param artifact_id: id of artifacts in ArtifactDatasetRepository"""
 
-    def __init__(self, reader: DatasetReader, artifacts: ArtifactCollection, dataset_type: DatasetType):
+    def __init__(self, reader: DatasetReader, artifacts: ArtifactCollection, dataset_type: DatasetType,
+                 artifact_id: str = None):
         super(ArtifactDatasetSource, self).__init__(dataset_type)
         self.reader = reader
         self.artifacts = artifacts
+        self.artifact_id = artifact_id
+        self._fingerprint: Optional[str] = None
 
     def read(self) -> Dataset:
         return self.reader.read(self.artifacts)
+
+    def read_batches(self, batch_size: int) -> Iterator[Dataset]:
+        yield from self.reader.read_batches(self.artifacts, batch_size)
+
+    def fingerprint(self) -> Optional[str]:
+        """Computes hash from reader and artifacts without reading datasets if artifacts have integrity manifests"""
+        if self._fingerprint is None:
+            self._fingerprint = hash_parts(params_digest(self.dataset_type, DatasetType),
+                                           params_digest(self.reader, DatasetReader), self.artifacts.fingerprint())
+        return self._fingerprint
+
+
+class PartitionedDatasetSource(DatasetSource):
+    """DatasetSource for append-only datasets from ArtifactDatasetRepository which consist of partitions.
+    Partitions are read lazily and concurrently using at most :attr:`max_workers` threads
+
+    :param partitions: mapping of partition key to partition source in order of appending
+    :param dataset_type: DatasetType of contained dataset"""
+
+    max_workers = 4
+
+    def __init__(self, partitions: Dict[str, DatasetSource], dataset_type: DatasetType):
+        super(PartitionedDatasetSource, self).__init__(dataset_type)
+        self.partitions = partitions
+
+    def select(self, keys: Iterable[str] = None, since: str = None, until: str = None) -> 'PartitionedDatasetSource':
+        """Selects subset of partitions without reading them
+
+        :param keys: partition keys to select, all partitions if `None`
+        :param since: if set, only partitions with keys greater or equal to it are selected
+        :param until: if set, only partitions with keys less or equal to it are selected
+        :returns: :class:`PartitionedDatasetSource` with selected partitions"""
+        keys = set(keys) if keys is not None else None
+        return PartitionedDatasetSource({
+            key: source for key, source in self.partitions.items()
+            if (keys is None or key in keys) and (since is None or key >= since) and (until is None or key <= until)
+        }, self.dataset_type)
+
+    def read(self) -> Dataset:
+        if not self.partitions:
+            raise ValueError('No partitions to read')
+        sources = list(self.partitions.values())
+        if len(sources) == 1:
+            return sources[0].read()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources))) as executor:
+            datasets = list(executor.map(lambda source: source.read(), sources))
+        return Dataset(concat_batches([d.data for d in datasets]), self.dataset_type)
+
+    def read_batches(self, batch_size: int) -> Iterator[Dataset]:
+        """Reads partitions one by one in batches of at most `batch_size` rows
+
+        :param batch_size: number of rows in batch"""
+        for source in self.partitions.values():
+            yield from source.read_batches(batch_size)
+
+    def fingerprint(self) -> Optional[str]:
+        fingerprints = [source.fingerprint() for source in self.partitions.values()]
+        if any(f is None for f in fingerprints):
+            return None
+        return hash_parts(params_digest(self.dataset_type, DatasetType), *self.partitions.keys(), *fingerprints)
@@ -14,6 +14,16 @@ class DatasetRepository:
         :param dataset: dataset to save
         :returns: DatasetSource that produces same Dataset"""
 
+    def append(self, dataset_id: str, dataset: Dataset, partition: str = None) -> DatasetSource:
+        """Method to add dataset as a new partition of append-only dataset in this repository.
+        Not supported by default
+
+        :param dataset_id: string identifier
+        :param dataset: data of new partition
+        :param partition: partition key
+        :returns: DatasetSource that produces all partitions of dataset"""
+        raise NotImplementedError(f'{type(self).__name__} does not support partitioned datasets')
+
     @abstractmethod
     def delete(self, dataset_id: str):
         """Method to delete dataset from this repository
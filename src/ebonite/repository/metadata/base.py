@@ -423,6 +423,22 @@ class MetadataRepository:
                 raise errors.ExistingPipelineError(pipeline)
         return self.update_pipeline(pipeline)
 
+    def update_models_and_pipelines(self, objects: Sequence[Union[Model, Pipeline]]):
+        """
+        Updates several models and pipelines in the repository at once.
+        Implementations write them in one batch if they can
+
+        :param objects: models and pipelines to update
+        :return: nothing
+        :exception: :exc:`.errors.NonExistingModelError` or :exc:`.errors.NonExistingPipelineError`
+          if some object doesn't exist in the repository
+        """
+        for obj in objects:
+            if isinstance(obj, core.Model):
+                self.update_model(obj)
+            else:
+                self.update_pipeline(obj)
+
     # _______________
     @abstractmethod
     @ExposedMetadataMethod()
@@ -1,6 +1,6 @@
 import copy
 import os
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import pyjackson
 
@@ -236,6 +236,7 @@ class LocalMetadataRepository(MetadataRepository):
     """
 
     type = 'local'
+    _save_deferred = False
 
     def __init__(self, path=None):
         self.path = path
@@ -255,7 +256,7 @@ class LocalMetadataRepository(MetadataRepository):
             self.data = _LocalContainer()
 
     def save(self):
-        if self.path is None:
+        if self.path is None or self._save_deferred:
             return
         with open(self.path, 'w', encoding='utf8') as f:
             logger.debug('Saving metadata to %s', self.path)
@@ -458,6 +459,14 @@ class LocalMetadataRepository(MetadataRepository):
         self.save()
         return pipeline
 
+    def update_models_and_pipelines(self, objects: Sequence[Union[Model, Pipeline]]):
+        self._save_deferred = True
+        try:
+            super().update_models_and_pipelines(objects)
+        finally:
+            self._save_deferred = False
+            self.save()
+
     def update_pipeline(self, pipeline: Pipeline) -> Pipeline:
         self._validate_pipeline(pipeline)
 
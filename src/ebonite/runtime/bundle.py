@@ -0,0 +1,125 @@
+import json
+import os
+from typing import Dict, Optional
+
+from pyjackson.errors import DeserializationError
+
+from ebonite.runtime.interface import Interface
+from ebonite.runtime.interface.base import InterfaceDescriptor
+from ebonite.runtime.openapi.spec import create_spec
+from ebonite.utils.log import rlogger
+
+RUNTIME_BUNDLE_PATH = 'runtime.json'
+#: errors expected when bundle is built outside of model environment: libraries or ebonite extensions of
+#: wrappers and dataset types are not installed or wrapper has no model, runtime creates bundle on startup then
+BUNDLE_BUILD_ERRORS = (ImportError, DeserializationError, ValueError)
+
+
+def method_spec(interface: Interface, method: str) -> dict:
+    """
+    Generates OpenAPI spec for interface method
+
+    :param interface: interface to generate spec for
+    :param method: method name
+    :return: dict with OpenAPI schema definition
+    """
+    return create_spec(method, interface.exposed_method_signature(method), str(Interface),
+                       interface.exposed_method_docs(method))
+
+
+class RuntimeBundle:
+    """
+    Interface metadata precomputed at build time, so runtime servers load it instead of generating it on startup
+
+    :param version: ebonite version bundle was built with
+    :param descriptor: serialized :class:`.InterfaceDescriptor` of interface
+    :param specs: method name -> OpenAPI spec of method
+    """
+
+    def __init__(self, version: str, descriptor: dict, specs: Dict[str, dict]):
+        self.version = version
+        self.descriptor = descriptor
+        self.specs = specs
+
+    @staticmethod
+    def from_interface(interface: Interface) -> 'RuntimeBundle':
+        """
+        Precomputes bundle for given interface
+
+        :param interface: interface to create bundle for
+        :return: bundle
+        """
+        descriptor = InterfaceDescriptor.from_interface(interface)
+        return RuntimeBundle(descriptor.version, descriptor.to_dict(),
+                             {method: method_spec(interface, method) for method in interface.exposed_methods()})
+
+    def matches(self, interface: Interface) -> bool:
+        """Checks that bundle describes exactly the methods given interface exposes
+
+        :param interface: interface to check
+        """
+        return set(self.specs) == set(interface.exposed_methods())
+
+    def dumps(self) -> str:
+        return json.dumps({'version': self.version, 'descriptor': self.descriptor, 'specs': self.specs})
+
+    @staticmethod
+    def read(path: str = RUNTIME_BUNDLE_PATH) -> Optional['RuntimeBundle']:
+        """
+        Reads bundle from file, plain json is used as this is done on every runtime startup
+
+        :param path: path to bundle file
+        :return: bundle or `None` if file does not exist or was built with other ebonite version
+        """
+        if not os.path.exists(path):
+            return None
+        import ebonite
+        with open(path, 'r') as f:
+            payload = json.load(f)
+        if payload['version'] != ebonite.__version__:
+            rlogger.warning('Ignoring runtime bundle built with ebonite %s, running %s',
+                            payload['version'], ebonite.__version__)
+            return None
+        return RuntimeBundle(payload['version'], payload['descriptor'], payload['specs'])
+
+    @staticmethod
+    def attach(interface: Interface, path: str = RUNTIME_BUNDLE_PATH) -> Interface:
+        """
+        Attaches bundle from file to interface if it matches interface
+
+        :param interface: interface to attach bundle to
+        :param path: path to bundle file
+        :return: given interface
+        """
+        bundle = RuntimeBundle.read(path)
+        if bundle is not None:
+            if bundle.matches(interface):
+                interface.bundle = bundle
+            else:
+                rlogger.warning('Ignoring runtime bundle for methods %s, interface exposes %s',
+                                sorted(bundle.specs), sorted(interface.exposed_methods()))
+        return interface
+
+
+def interface_specs(interface: Interface) -> Dict[str, dict]:
+    """
+    Returns OpenAPI specs of interface methods from its bundle or generates them
+
+    :param interface: interface to get specs for
+    :return: method name -> OpenAPI spec of method
+    """
+    if interface.bundle is not None:
+        return interface.bundle.specs
+    return {method: method_spec(interface, method) for method in interface.exposed_methods()}
+
+
+def interface_schema(interface: Interface) -> dict:
+    """
+    Returns serialized :class:`.InterfaceDescriptor` of interface from its bundle or creates it
+
+    :param interface: interface to get descriptor for
+    :return: serialized descriptor
+    """
+    if interface.bundle is not None:
+        return interface.bundle.descriptor
+    return InterfaceDescriptor.from_interface(interface).to_dict()
@@ -50,6 +50,8 @@ class Interface(metaclass=InterfaceMetaclass):
 
     exposed: Dict[str, Signature] = {}
     executors: Dict[str, Callable] = {}
+    #: :class:`~ebonite.runtime.bundle.RuntimeBundle` precomputed for this interface at build time, set by loaders
+    bundle = None
 
     def execute(self, method: str, args: Dict[str, object]):
         """
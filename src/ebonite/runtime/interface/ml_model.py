@@ -5,6 +5,7 @@ from pyjackson import read
 from pyjackson.core import Field, Signature
 
 from ebonite.core.objects import Model
+from ebonite.runtime.bundle import RuntimeBundle
 from ebonite.runtime.interface import Interface
 from ebonite.runtime.interface.base import InterfaceLoader
 from ebonite.runtime.interface.utils import merge
@@ -66,7 +67,7 @@ class ModelLoader(InterfaceLoader):
     def load(self) -> Interface:
         meta = read(MODEL_META_PATH, Model)
         meta.wrapper.load(MODEL_BIN_PATH)
-        return model_interface(meta)
+        return RuntimeBundle.attach(model_interface(meta))
 
 
 class MultiModelLoader(InterfaceLoader):
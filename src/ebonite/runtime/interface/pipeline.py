@@ -4,6 +4,7 @@ from typing import Dict
 from pyjackson import read
 
 from ebonite.core.objects import Model, Pipeline
+from ebonite.runtime.bundle import RuntimeBundle
 from ebonite.runtime.interface import Interface, expose
 from ebonite.runtime.interface.base import InterfaceLoader
 from ebonite.utils.log import rlogger
@@ -54,4 +55,4 @@ class PipelineLoader(InterfaceLoader):
         for name, model in meta.models.items():
             model.wrapper.load(os.path.join(MODEL_BIN_PATH, name))
         meta.pipeline.models = meta.models
-        return pipeline_interface(meta.pipeline)
+        return RuntimeBundle.attach(pipeline_interface(meta.pipeline))
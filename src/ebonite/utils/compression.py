@@ -0,0 +1,149 @@
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+import shutil
+import typing
+from abc import abstractmethod
+
+from ebonite.utils.importing import module_importable
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class Codec:
+    """
+    Base class for streaming compression codecs
+
+    :param level: compression level, codec default if `None`
+    """
+    type: str = None
+    requirements: typing.List[str] = []
+
+    def __init__(self, level: int = None):
+        self.level = level
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Returns True if all modules required for this codec are importable"""
+        return all(module_importable(r) for r in cls.requirements)
+
+    @abstractmethod
+    def compress_stream(self, src: typing.BinaryIO, dst: typing.BinaryIO):
+        """
+        Must read `src` to the end and write compressed payload to `dst` chunk by chunk
+
+        :param src: readable binary file-like object
+        :param dst: writable binary file-like object
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def decompress_stream(self, src: typing.BinaryIO) -> typing.ContextManager[typing.BinaryIO]:
+        """
+        Must be a context manager which yields readable file-like object with decompressed payload of `src`
+
+        :param src: readable binary file-like object with compressed payload
+        """
+        pass  # pragma: no cover
+
+    def compress(self, payload: bytes) -> bytes:
+        """
+        Compresses bytes in memory
+
+        :param payload: bytes to compress
+        :return: compressed bytes
+        """
+        dst = io.BytesIO()
+        self.compress_stream(io.BytesIO(payload), dst)
+        return dst.getvalue()
+
+
+class _FileObjCodec(Codec):
+    """
+    Codec for stdlib-like modules which provide file objects wrapping other file objects
+    """
+    level_arg = 'compresslevel'
+
+    @abstractmethod
+    def _open(self, fileobj, mode, **kwargs):
+        pass  # pragma: no cover
+
+    def compress_stream(self, src: typing.BinaryIO, dst: typing.BinaryIO):
+        kwargs = {self.level_arg: self.level} if self.level is not None else {}
+        with self._open(dst, 'wb', **kwargs) as f:
+            shutil.copyfileobj(src, f, CHUNK_SIZE)
+
+    @contextlib.contextmanager
+    def decompress_stream(self, src: typing.BinaryIO) -> typing.ContextManager[typing.BinaryIO]:
+        with self._open(src, 'rb') as f:
+            yield f
+
+
+class GzipCodec(_FileObjCodec):
+    type = 'gzip'
+
+    def _open(self, fileobj, mode, **kwargs):
+        return gzip.GzipFile(fileobj=fileobj, mode=mode, **kwargs)
+
+
+class Bz2Codec(_FileObjCodec):
+    type = 'bz2'
+
+    def _open(self, fileobj, mode, **kwargs):
+        return bz2.BZ2File(fileobj, mode, **kwargs)
+
+
+class LzmaCodec(_FileObjCodec):
+    type = 'lzma'
+    level_arg = 'preset'
+
+    def _open(self, fileobj, mode, **kwargs):
+        return lzma.LZMAFile(fileobj, mode, **kwargs)
+
+
+class Lz4Codec(_FileObjCodec):
+    type = 'lz4'
+    requirements = ['lz4']
+    level_arg = 'compression_level'
+
+    def _open(self, fileobj, mode, **kwargs):
+        import lz4.frame
+        return lz4.frame.LZ4FrameFile(fileobj, mode, **kwargs)
+
+
+class ZstdCodec(Codec):
+    type = 'zstd'
+    requirements = ['zstandard']
+
+    def compress_stream(self, src: typing.BinaryIO, dst: typing.BinaryIO):
+        import zstandard
+        cctx = zstandard.ZstdCompressor(level=self.level) if self.level is not None else zstandard.ZstdCompressor()
+        cctx.copy_stream(src, dst)
+
+    @contextlib.contextmanager
+    def decompress_stream(self, src: typing.BinaryIO) -> typing.ContextManager[typing.BinaryIO]:
+        import zstandard
+        yield zstandard.ZstdDecompressor().stream_reader(src)
+
+
+CODECS: typing.Dict[str, typing.Type[Codec]] = {c.type: c for c in [ZstdCodec, Lz4Codec, GzipCodec, Bz2Codec, LzmaCodec]}
+
+
+def get_codec(codec: str = None, level: int = None) -> Codec:
+    """
+    Creates codec instance by it's type name
+
+    :param codec: codec type name, first available of zstd, lz4 and gzip if `None`
+    :param level: compression level
+    :return: :class:`Codec` instance
+    """
+    if codec is None:
+        codec = next(c.type for c in CODECS.values() if c.is_available())
+    if codec not in CODECS:
+        raise ValueError(f'Unknown compression codec {codec}, expected one of {list(CODECS.keys())}')
+    codec_type = CODECS[codec]
+    if not codec_type.is_available():
+        raise ValueError(f'Compression codec {codec} requires {codec_type.requirements} to be installed')
+    return codec_type(level)
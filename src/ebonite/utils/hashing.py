@@ -0,0 +1,145 @@
+import hashlib
+import io
+import json
+import typing
+
+from pyjackson import serialize
+
+from ebonite.utils.compression import CHUNK_SIZE
+
+HASH_ALGORITHM = 'sha256'
+
+
+class HashingReader(io.RawIOBase):
+    """
+    File-like wrapper which computes size and hash of payload while it is being read sequentially.
+    If underlying stream is seekable, seeking away from current position first reads and hashes the rest of payload,
+    then seeks underlying stream, so random access readers (e.g. zip files) still get complete hash
+
+    :param stream: readable binary file-like object
+    """
+
+    def __init__(self, stream: typing.BinaryIO):
+        super().__init__()
+        self.stream = stream
+        self.size = 0
+        self.finished = False
+        self._hash = hashlib.new(HASH_ALGORITHM)
+
+    @property
+    def digest(self) -> str:
+        """Hex digest of payload read so far"""
+        return self._hash.hexdigest()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return hasattr(self.stream, 'seekable') and self.stream.seekable()
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b''
+        read_all = size is None or size < 0
+        data = self.stream.read() if read_all else self.stream.read(size)
+        if self.finished:
+            return data
+        self._update(data)
+        if read_all or not data:
+            self._on_finish()
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def tell(self) -> int:
+        if self.seekable():
+            return self.stream.tell()
+        return self.size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if not self.seekable():
+            raise io.UnsupportedOperation('seek')
+        if not self.finished:
+            if (whence == io.SEEK_SET and offset == self.size) or (whence == io.SEEK_CUR and offset == 0):
+                return self.size
+            self.read_to_end()
+        return self.stream.seek(offset, whence)
+
+    def read_to_end(self):
+        """Reads the rest of payload to compute its size and hash"""
+        while not self.finished:
+            self.read(CHUNK_SIZE)
+
+    def _update(self, data: bytes):
+        self._hash.update(data)
+        self.size += len(data)
+
+    def _on_finish(self):
+        self.finished = True
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            self.stream.close()
+
+    def __del__(self):
+        # underlying stream is owned and closed by whoever opened it
+        pass
+
+
+def file_digest(path: str) -> str:
+    """
+    Computes hash of local file
+
+    :param path: path to file
+    :return: hex digest
+    """
+    with open(path, 'rb') as f:
+        reader = HashingReader(f)
+        reader.read_to_end()
+        return reader.digest
+
+
+def payload_digest(payload: bytes) -> str:
+    """
+    Computes hash of payload the same way as :class:`HashingReader` does
+
+    :param payload: bytes to hash
+    :return: hex digest
+    """
+    return hashlib.new(HASH_ALGORITHM, payload).hexdigest()
+
+
+def hash_parts(*parts: typing.Union[str, bytes, memoryview]) -> str:
+    """
+    Computes hash of sequence of strings or byte buffers. Parts are length-prefixed, so different splits of the
+    same payload have different hashes
+
+    :param parts: parts to hash
+    :return: hex digest
+    """
+    hash = hashlib.new(HASH_ALGORITHM)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf8')
+        part = memoryview(part).cast('B')
+        hash.update(len(part).to_bytes(8, 'little'))
+        hash.update(part)
+    return hash.hexdigest()
+
+
+def params_digest(obj, as_class: typing.Type = None) -> str:
+    """
+    Computes hash of pyjackson representation of object
+
+    :param obj: pyjackson-serializable object
+    :param as_class: type to serialize object as
+    :return: hex digest
+    """
+    return hash_parts(json.dumps(serialize(obj, as_class), sort_keys=True, default=str))
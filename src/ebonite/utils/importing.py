@@ -1,5 +1,8 @@
+import os
+import subprocess
 import sys
 from importlib import _bootstrap
+from typing import Dict, List, Tuple
 
 
 """
@@ -63,3 +66,28 @@ def module_imported(module_name):
     :return: `True` or `False`
     """
     return sys.modules.get(module_name) is not None
+
+
+def import_time_report(module_name: str = 'ebonite', top: int = 20, env: Dict[str, str] = None) -> List[Tuple[str, int]]:
+    """
+    Imports module in a separate interpreter with `-X importtime` option and returns modules
+    which took the most time to import
+
+    :param module_name: module to import
+    :param top: number of modules to return
+    :param env: additional environment variables for interpreter
+    :return: list of module names and cumulative import times in microseconds, slowest first
+    """
+    process_env = dict(os.environ, PYTHONPATH=os.pathsep.join(p or '.' for p in sys.path))
+    process_env.update(env or {})
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                            env=process_env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return sorted(times.items(), key=lambda x: -x[1])[:top]
@@ -1,6 +1,5 @@
 import ast
 import inspect
-import io
 import os
 import re
 import sys
@@ -9,17 +8,16 @@ import warnings
 from collections import namedtuple
 from functools import wraps
 from pickle import PickleError
-from types import FunctionType, LambdaType, MethodType, ModuleType
-
-import requests
-from isort.finders import FindersManager
-from isort.settings import default
+from types import BuiltinFunctionType, FunctionType, LambdaType, MethodType, ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from ebonite.core.objects.requirements import (MODULE_PACKAGE_MAPPING, CustomRequirement, InstallableRequirement,
                                                Requirements)
 from ebonite.utils import importing
 from ebonite.utils.importing import import_module
 from ebonite.utils.log import logger
+from ebonite.utils.module_index import ModuleIndex, canonical_package_name
 from ebonite.utils.pickling import EbonitePickler
 
 PYTHON_BASE = os.path.dirname(threading.__file__)
@@ -49,6 +47,7 @@ def check_pypi_module(module_name, module_version=None, raise_on_error=False, wa
     :param warn_on_error: print a warning if module is not found in PyPi
     :return: `True` if module found in PyPi, `False` otherwise
     """
+    import requests
     r = requests.get('https://pypi.org/pypi/{}/json'.format(module_name))
     if r.status_code != 200:
         msg = 'Cant find package {} in PyPi'.format(module_name)
@@ -119,13 +118,7 @@ def get_object_module(obj: object) -> ModuleType:
 
 def _create_section(section):
     def is_section(cls: 'ISortModuleFinder', module: str):
-        cls.init()
-        if module in cls.instance.module2section:
-            mod_section = cls.instance.module2section[module]
-        else:
-            mod_section = cls.instance.finder.find(module)
-            cls.instance.module2section[module] = mod_section
-        return mod_section == section
+        return ModuleIndex.get().section(module, cls.find) == section
 
     return is_section
 
@@ -135,10 +128,15 @@ class ISortModuleFinder:
     Determines type of module: standard library (:meth:`ISortModuleFinder.is_stdlib`) or
     third party (:meth:`ISortModuleFinder.is_thirdparty`).
     This class uses `isort` library heuristics with some modifications.
+    Classification of installed and standard library modules is persisted in module index.
     """
     instance: 'ISortModuleFinder' = None
 
     def __init__(self):
+        # isort is imported on first classification, it is not needed when module index is warm
+        from isort.finders import FindersManager
+        from isort.settings import default
+
         config = default.copy()
         config['known_first_party'].append('ebonite')
         config['known_third_party'].append('xgboost')
@@ -154,13 +152,21 @@ class ISortModuleFinder:
         section_names = config['sections']
         sections = namedtuple('Sections', section_names)(*[name for name in section_names])
         self.finder = FindersManager(config, sections)
-        self.module2section = {}
 
     @classmethod
     def init(cls):
         if cls.instance is None:
             cls.instance = cls()
 
+    @classmethod
+    def find(cls, module: str) -> str:
+        """Classifies module with isort. Results are cached in :class:`~ebonite.utils.module_index.ModuleIndex`
+
+        :param module: module name
+        :return: isort section name"""
+        cls.init()
+        return cls.instance.finder.find(module)
+
     is_stdlib = classmethod(_create_section('STDLIB'))
     is_thirdparty = classmethod(_create_section('THIRDPARTY'))
 
@@ -262,6 +268,9 @@ def get_module_version(mod: ModuleType):
     try:
         return mod.__version__
     except AttributeError:
+        package = ModuleIndex.get().package(mod.__name__)
+        if package is not None:
+            return package[1]
         for name in os.listdir(os.path.dirname(mod.__file__)):
             m = re.match(re.escape(mod.__name__) + '-(.+)\\.dist-info', name)
             if m:
@@ -287,7 +296,10 @@ def get_package_name(mod: ModuleType) -> str:
     if mod is None:
         raise ValueError('mod must not be None')
     name = mod.__name__
-    return MODULE_PACKAGE_MAPPING.get(name, name)
+    if name in MODULE_PACKAGE_MAPPING:
+        return MODULE_PACKAGE_MAPPING[name]
+    package = ModuleIndex.get().package(name) if '.' not in name else None
+    return package[0] if package is not None else name
 
 
 def get_module_repr(mod: ModuleType, validate_pypi=False) -> str:
@@ -317,13 +329,25 @@ def get_module_as_requirement(mod: ModuleType, validate_pypi=False) -> Installab
     :return: representation as :class:`.InstallableRequirement`
     """
     mod_version = get_module_version(mod)
+    mod_name = get_package_name(mod)
     if validate_pypi:
-        mod_name = get_package_name(mod)
         check_pypi_module(mod_name, mod_version, raise_on_error=True)
-    return InstallableRequirement(mod.__name__, mod_version)
+    default_name = MODULE_PACKAGE_MAPPING.get(mod.__name__, mod.__name__)
+    package_name = mod_name if canonical_package_name(mod_name) != canonical_package_name(default_name) else None
+    return InstallableRequirement(mod.__name__, mod_version, package_name)
 
 
-def get_local_module_reqs(mod):
+#: (module name, source file modification time) -> imports of local module, cached for processes lifetime
+_LOCAL_MODULE_IMPORTS: Dict[Tuple[str, int], List[Tuple[str, Optional[str]]]] = {}
+
+
+def _get_local_module_imports(mod) -> List[Tuple[str, Optional[str]]]:
+    try:
+        key = (mod.__name__, os.stat(mod.__file__).st_mtime_ns)
+    except (AttributeError, TypeError, OSError):
+        key = None
+    if key in _LOCAL_MODULE_IMPORTS:
+        return _LOCAL_MODULE_IMPORTS[key]
     tree = ast.parse(inspect.getsource(mod))
     imports = []
     for statement in tree.body:
@@ -335,8 +359,13 @@ def get_local_module_reqs(mod):
             else:
                 imp = ('.' + statement.module, mod.__package__)
             imports.append(imp)
+    if key is not None:
+        _LOCAL_MODULE_IMPORTS[key] = imports
+    return imports
+
 
-    result = [import_module(i, p) for i, p in imports]
+def get_local_module_reqs(mod):
+    result = [import_module(i, p) for i, p in _get_local_module_imports(mod)]
     if mod.__file__.endswith('__init__.py'):
         # add loaded subpackages
         prefix = mod.__name__ + '.'
@@ -377,6 +406,49 @@ def add_closure_inspection(f):
     return wrapper
 
 
+#: full names of types which instances are data payloads (e.g. arrays) -> predicate whether instance may be skipped,
+#: such instances are not traversed by requirement analysis as they cannot reference other packages
+PAYLOAD_TYPES: Dict[str, Optional[Callable[[object], bool]]] = {
+    'numpy.ndarray': lambda obj: not obj.dtype.hasobject,
+    'torch.Tensor': None,
+    'torch.nn.parameter.Parameter': None
+}
+_ATOMIC_TYPES = {type(None), bool, int, float, complex, str, bytes, bytearray}
+_OBJECTS_WITH_MODULE = (ModuleType, type, FunctionType, BuiltinFunctionType, MethodType, staticmethod, classmethod)
+#: type -> module of its instances, shared between analysis runs.
+#: Weak keys let dynamically created and local classes be collected
+_TYPE_MODULES: 'WeakKeyDictionary[type, Optional[ModuleType]]' = WeakKeyDictionary()
+
+
+def _get_instance_module(obj) -> Optional[ModuleType]:
+    """Same as :func:`get_object_module` for instances, but module is looked up once per type.
+    It saves module lookups only: instances are still traversed as they may reference other packages"""
+    obj_type = type(obj)
+    try:
+        return _TYPE_MODULES[obj_type]
+    except KeyError:
+        module = _TYPE_MODULES[obj_type] = get_object_module(obj)
+        return module
+
+
+def _is_payload(obj) -> bool:
+    obj_type = type(obj)
+    if obj_type.__module__ is None:
+        return False
+    name = f'{obj_type.__module__}.{obj_type.__qualname__}'
+    if name not in PAYLOAD_TYPES:
+        return False
+    predicate = PAYLOAD_TYPES[name]
+    return predicate is None or predicate(obj)
+
+
+class _NullFile:
+    """File object which discards written data"""
+
+    def write(self, data):
+        pass
+
+
 class _EboniteRequirementAnalyzer(EbonitePickler):
     ignoring = (
         'dill',
@@ -391,7 +463,7 @@ class _EboniteRequirementAnalyzer(EbonitePickler):
     })
 
     def __init__(self, *args, **kwargs):
-        super().__init__(io.BytesIO(), *args, **kwargs)  # TODO maybe patch memo and other stuff too
+        super().__init__(_NullFile(), *args, **kwargs)  # TODO maybe patch memo and other stuff too
         self.framer.write = self.skip_write
         self.write = self.skip_write
         self.memoize = self.skip_write
@@ -419,7 +491,10 @@ class _EboniteRequirementAnalyzer(EbonitePickler):
     def _add_requirement(self, obj_or_module):
         if not isinstance(obj_or_module, ModuleType):
             try:
-                module = get_object_module(obj_or_module)
+                if isinstance(obj_or_module, _OBJECTS_WITH_MODULE):
+                    module = get_object_module(obj_or_module)
+                else:
+                    module = _get_instance_module(obj_or_module)
             except AttributeError as e:
                 # Some internal Tensorflow 2.x object crashes `inspect` module on Python 3.6
                 logger.debug('Skipping dependency analysis for %s because of %s: %s', obj_or_module,
@@ -428,7 +503,9 @@ class _EboniteRequirementAnalyzer(EbonitePickler):
         else:
             module = obj_or_module
 
-        if module is not None and not self._should_ignore(module):
+        if module is None or module in self._modules:
+            return
+        if not self._should_ignore(module):
             self._modules.add(module)
             if is_local_module(module):
                 # add imports of this module
@@ -438,10 +515,16 @@ class _EboniteRequirementAnalyzer(EbonitePickler):
                     self._add_requirement(local_req)
 
     def save(self, obj, save_persistent_id=True):
+        if type(obj) in _ATOMIC_TYPES:
+            return
         if id(obj) in self.seen:
             return
         self.seen.add(id(obj))
         self._add_requirement(obj)
+        if _is_payload(obj):
+            # requirement comes from type as payload is not reduced to its reconstructor
+            self._add_requirement(type(obj))
+            return
         try:
             return super(EbonitePickler, self).save(obj, save_persistent_id)
         except (ValueError, TypeError, PickleError) as e:
@@ -458,10 +541,15 @@ def get_object_requirements(obj) -> Requirements:
     This function uses `pickle`/`dill` libraries serialization hooks internally.
     Thus result of this function depend on given object being serializable by `pickle`/`dill` libraries:
     all nodes in objects graph which can't be serialized are skipped and their dependencies are lost.
+    Data payloads from :data:`PAYLOAD_TYPES` are not traversed, which is the main saving for large models.
+    Other instances are traversed even if their module is already classified, as they may reference other packages,
+    only lookup of their module is done once per type
 
     :param obj: obj to analyze
     :return: :class:`.Requirements` object containing all required packages
     """
     a = _EboniteRequirementAnalyzer(recurse=True)
     a.dump(obj)
-    return a.to_requirements()
+    requirements = a.to_requirements()
+    ModuleIndex.get().flush()
+    return requirements
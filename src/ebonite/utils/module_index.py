@@ -0,0 +1,163 @@
+import json
+import os
+import re
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+
+from ebonite.config import Core
+from ebonite.utils.hashing import hash_parts
+from ebonite.utils.log import logger
+
+#: sections which depend only on environment and may be persisted
+PERSISTENT_SECTIONS = ('STDLIB', 'THIRDPARTY')
+
+
+def _site_dirs() -> List[str]:
+    return [p for p in sys.path if os.path.basename(p) in ('site-packages', 'dist-packages') and os.path.isdir(p)]
+
+
+def canonical_package_name(name: str) -> str:
+    """Normalizes package name as pip does
+
+    :param name: package name
+    :return: normalized name"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def _top_level_modules(dist) -> List[str]:
+    top_level = dist.read_text('top_level.txt')
+    if top_level:
+        return [m.strip() for m in top_level.splitlines() if m.strip()]
+    modules = set()
+    for file in dist.files or []:
+        parts = file.parts
+        if len(parts) > 1 and not parts[0].endswith(('.dist-info', '.egg-info')) and parts[0] != '..':
+            modules.add(parts[0])
+        elif len(parts) == 1 and parts[0].endswith('.py'):
+            modules.add(parts[0][:-3])
+    return sorted(modules) or [dist.metadata['Name'].replace('-', '_')]
+
+
+def _installed_packages() -> Dict[str, List[str]]:
+    try:
+        from importlib import metadata
+    except ImportError:  # python < 3.8
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            logger.debug('importlib_metadata is not installed, module index will not contain packages')
+            return {}
+    packages = {}
+    for dist in metadata.distributions():
+        name = dist.metadata['Name']
+        if name is None:
+            continue
+        for module in _top_level_modules(dist):
+            # first distribution on sys.path wins, as it does on import
+            packages.setdefault(module, [name, dist.version])
+    return packages
+
+
+class ModuleIndex:
+    """Module classification index built once per environment and persisted to
+    :attr:`ebonite.config.Core.MODULE_INDEX_CACHE` directory
+
+    :param key: key of environment (interpreter and site-packages modification times) index is built for
+    :param packages: top-level module name -> [package name, version] of installed distributions
+    :param sections: module name -> isort section of modules which classification does not depend on working directory
+    """
+    _instance: Optional['ModuleIndex'] = None
+    _lock = threading.Lock()
+
+    def __init__(self, key: str, packages: Dict[str, List[str]], sections: Dict[str, str] = None):
+        self.key = key
+        self.packages = packages
+        self.sections = sections or {}
+        self._local_sections = {}
+        self._dirty = False
+
+    @staticmethod
+    def environment_key() -> str:
+        """Key which changes when interpreter changes or packages are installed or removed"""
+        return hash_parts(sys.executable, sys.version, *[f'{p}:{os.stat(p).st_mtime_ns}' for p in _site_dirs()])
+
+    @classmethod
+    def build(cls) -> 'ModuleIndex':
+        """Builds index of installed distributions"""
+        return ModuleIndex(cls.environment_key(), _installed_packages())
+
+    @classmethod
+    def get(cls) -> 'ModuleIndex':
+        """Returns index for current environment, loading it from cache file or building it once per process"""
+        with cls._lock:
+            if cls._instance is None:
+                key = cls.environment_key()
+                instance = cls._load(key)
+                if instance is None:
+                    instance = cls.build()
+                    instance.save()
+                cls._instance = instance
+            return cls._instance
+
+    @staticmethod
+    def _path(key: str) -> Optional[str]:
+        if not Core.MODULE_INDEX_CACHE:
+            return None
+        return os.path.join(Core.MODULE_INDEX_CACHE, f'module_index_{key}.json')
+
+    @classmethod
+    def _load(cls, key: str) -> Optional['ModuleIndex']:
+        path = cls._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                payload = json.load(f)
+            return ModuleIndex(key, payload['packages'], payload['sections'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug('Failed to load module index from %s: %s', path, e)
+            return None
+
+    def save(self):
+        """Writes index to cache file if persistence is enabled"""
+        path = self._path(self.key)
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'packages': self.packages, 'sections': self.sections}, f)
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug('Failed to save module index to %s: %s', path, e)
+
+    def flush(self):
+        """Saves index if new modules were classified since last save"""
+        if self._dirty:
+            self.save()
+
+    def section(self, module: str, classify: Callable[[str], str]) -> str:
+        """Returns cached section of module, classifying it on first request
+
+        :param module: module name
+        :param classify: function to compute section of module
+        :return: section name"""
+        section = self.sections.get(module) or self._local_sections.get(module)
+        if section is None:
+            section = classify(module)
+            if section in PERSISTENT_SECTIONS:
+                self.sections[module] = section
+                self._dirty = True
+            else:
+                self._local_sections[module] = section
+        return section
+
+    def package(self, module: str) -> Optional[List[str]]:
+        """Returns package name and version of distribution which provides top-level module
+
+        :param module: module name
+        :return: [package name, version] or `None` if module is not provided by installed distribution"""
+        return self.packages.get(module.split('.')[0])
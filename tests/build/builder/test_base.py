@@ -7,11 +7,12 @@ import json
 import numpy as np
 import psutil
 import pytest
+from pyjackson import serialize
 import platform
 
 from ebonite.build.builder.base import PythonBuildContext, use_local_installation
 from ebonite.build.provider import LOADER_ENV, PythonProvider, SERVER_ENV
-from ebonite.build.provider.ml_model import ModelBuildable
+from ebonite.build.provider.ml_model import MLModelProvider, ModelBuildable
 from ebonite.build.provider.ml_model_multi import MultiModelBuildable
 from ebonite.core.objects.artifacts import Blobs, InMemoryBlob
 from ebonite.core.objects.core import Buildable
@@ -19,6 +20,7 @@ from ebonite.core.objects.requirements import Requirements
 from ebonite.ext.aiohttp import AIOHTTPServer
 from ebonite.ext.flask import FlaskServer
 from ebonite.ext.flask.client import HTTPClient
+from ebonite.runtime.bundle import RuntimeBundle
 from ebonite.runtime.interface.ml_model import ModelLoader, MultiModelLoader
 from tests.build.conftest import check_ebonite_port_free
 from ebonite.core.objects.core import Model, Task, Project
@@ -80,6 +82,43 @@ def test_pipeline_provider(pipeline):
     assert 'docker' in provider.get_options()
 
 
+def test_pipeline_provider__runtime_bundle(created_model):
+    provider = PipelineProvider(created_model.as_pipeline('predict'), FlaskServer)
+    bundle = json.loads(provider.get_sources()['runtime.json'])
+    assert set(bundle['specs']) == {'run'}
+    assert [m['name'] for m in bundle['descriptor']['methods']] == ['run']
+
+
+def test_model_provider__runtime_bundle(created_model):
+    provider = MLModelProvider(created_model, FlaskServer)
+    expected = json.loads(provider.get_sources()['runtime.json'])
+    assert set(expected['specs']) == {'predict', 'predict_proba'}
+
+    # model from repository has no methods loaded, they are read from its artifacts
+    model = Model(created_model.name, serialize(created_model.wrapper), created_model.artifact_any,
+                  created_model.requirements)
+    assert model.wrapper.methods is None
+
+    sources = MLModelProvider(model, FlaskServer).get_sources()
+    assert json.loads(sources['runtime.json']) == expected
+    assert model.wrapper.methods is None
+
+
+def test_model_provider__runtime_bundle_errors(created_model, monkeypatch):
+    model = Model(created_model.name, serialize(created_model.wrapper),
+                  Blobs({k: v for k, v in created_model.artifact_any.bytes_dict().items()
+                         if k != created_model.wrapper.methods_json}),
+                  created_model.requirements)
+    with pytest.raises(KeyError):
+        MLModelProvider(model, FlaskServer).get_sources()
+
+    def not_installed(interface):
+        raise ImportError('library is not installed')
+
+    monkeypatch.setattr(RuntimeBundle, 'from_interface', not_installed)
+    assert 'runtime.json' not in MLModelProvider(created_model, FlaskServer).get_sources()
+
+
 @pytest.fixture
 def python_build_context_mock() -> PythonBuildContext:
     return PythonBuildContext(ProviderMock())
@@ -222,6 +261,14 @@ def test_python_multi_builder__distr_loadable(tmpdir, python_multi_build_context
     np.testing.assert_almost_equal(prediction, prediction2)
 
 
+def _distribution_version(name):
+    try:
+        from importlib.metadata import version
+    except ImportError:  # python 3.7
+        from importlib_metadata import version
+    return version(name)
+
+
 def _load(loader, tmpdir):
     cwd = os.getcwd()
     os.chdir(tmpdir)
@@ -245,6 +292,7 @@ def test_python_build_context_flask_distr_runnable(tmpdir, python_build_context,
     args, env = _prepare_distribution(tmpdir, python_build_context)
 
     from setup import setup_args
+    server_reqs = {f'{r}=={_distribution_version(r)}' for r in server_reqs}
     _check_requirements(tmpdir, {*setup_args['install_requires'], *server_reqs,
                                  'pandas==1.0.3', 'scikit-learn==0.22.2', 'numpy==1.18.2'})  # model reqs
 
@@ -0,0 +1,103 @@
+import pytest
+
+from ebonite.core.analyzer.base import CanIsAMustHookMixin, Hook, LibHookMixin, TypeHookMixin, analyzer_class
+
+
+class _TestHook(Hook):
+    def process(self, obj, **kwargs):
+        return type(self).__name__
+
+
+_TestAnalyzer = analyzer_class(_TestHook, str)
+
+calls = []
+
+
+class IntHook(TypeHookMixin, _TestHook):
+    valid_types = [int]
+
+    def must_process(self, obj) -> bool:
+        calls.append(type(self).__name__)
+        return super(IntHook, self).must_process(obj)
+
+
+class PositiveHook(CanIsAMustHookMixin, _TestHook):
+    def must_process(self, obj) -> bool:
+        calls.append(type(self).__name__)
+        return isinstance(obj, float) and obj > 0
+
+
+class NumberHook(TypeHookMixin, _TestHook):
+    valid_types = [int, float]
+
+
+class LocalModuleHook(LibHookMixin, _TestHook):
+    base_module_name = 'tests'
+
+
+class Local:
+    pass
+
+
+class CanHook(_TestHook):
+    type_dispatch = True
+
+    def can_process(self, obj) -> bool:
+        return isinstance(obj, str)
+
+    def must_process(self, obj) -> bool:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_type_dispatch_flags():
+    assert IntHook.type_dispatch is False
+    assert PositiveHook.type_dispatch is False
+    assert NumberHook.type_dispatch is True
+    assert LocalModuleHook.type_dispatch is True
+    assert CanHook.type_dispatch is True
+
+
+def test_find_hook__order():
+    assert _TestAnalyzer.analyze(1) == 'IntHook'
+    assert _TestAnalyzer.analyze(1.) == 'PositiveHook'
+    assert _TestAnalyzer.analyze(-1.) == 'NumberHook'
+    assert _TestAnalyzer.analyze(Local()) == 'LocalModuleHook'
+    assert _TestAnalyzer.analyze(Local) == 'LocalModuleHook'
+    assert _TestAnalyzer.analyze(test_find_hook__order) == 'LocalModuleHook'
+    assert _TestAnalyzer.analyze('a') == 'CanHook'
+    with pytest.raises(ValueError):
+        _TestAnalyzer.analyze(object())
+
+
+def test_find_hook__memoized_per_type(monkeypatch):
+    _TestAnalyzer.analyze(-1.)
+    checks = []
+    original = NumberHook.must_process
+    monkeypatch.setattr(NumberHook, 'must_process', lambda self, obj: checks.append(obj) or original(self, obj))
+
+    for value in [-2., -3., -4.]:
+        assert _TestAnalyzer.analyze(value) == 'NumberHook'
+    assert checks == []
+    # predicate hooks are checked for each object
+    assert calls.count('PositiveHook') == 2 * 4  # can_process of this hook calls must_process
+
+
+def test_find_hook__invalidated_on_register():
+    with pytest.raises(ValueError):
+        _TestAnalyzer.analyze(b'a')
+
+    class BytesHook(TypeHookMixin, _TestHook):
+        valid_types = [bytes]
+
+    try:
+        assert _TestAnalyzer.analyze(b'a') == 'BytesHook'
+    finally:
+        _TestAnalyzer.hooks = [h for h in _TestAnalyzer.hooks if not isinstance(h, BytesHook)]
+
+    with pytest.raises(ValueError):
+        _TestAnalyzer.analyze(b'a')
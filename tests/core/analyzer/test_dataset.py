@@ -1,5 +1,10 @@
+import pytest
+from pyjackson import deserialize, serialize
+
 from ebonite.core.analyzer.dataset import DatasetAnalyzer, DatasetHook
 from ebonite.core.objects import DatasetType
+from ebonite.core.objects.dataset_type import (DictDatasetType, ListDatasetType, PrimitiveDatasetType,
+                                               TupleLikeListDatasetType)
 
 
 class MyDataset:
@@ -28,3 +33,77 @@ def test_dataset_analyzer():
     data_type = DatasetAnalyzer.analyze(data)
 
     assert issubclass(data_type, MyDatasetType)
+
+
+@pytest.fixture
+def sample_size(monkeypatch):
+    monkeypatch.setenv('EBONITE_DATASET_ANALYSIS_SAMPLE_SIZE', '10')
+
+
+def test_dataset_analyzer__sampled_list(sample_size, monkeypatch):
+    data = [{'a': i, 'b': str(i)} for i in range(1000)]
+    analyzed = []
+    original = DatasetAnalyzer.analyze
+    monkeypatch.setattr(DatasetAnalyzer, 'analyze', lambda obj, **kwargs: analyzed.append(obj) or original(obj))
+
+    data_type = original(data)
+
+    item_type = DictDatasetType({'a': PrimitiveDatasetType('int'), 'b': PrimitiveDatasetType('str')})
+    assert data_type == ListDatasetType(item_type, 1000)
+    assert len([o for o in analyzed if isinstance(o, dict)]) == 10
+    assert deserialize(serialize(data, data_type), data_type) == data
+
+
+def test_dataset_analyzer__sampled_list_mixed(sample_size):
+    data = [1, 'a'] * 10
+    assert DatasetAnalyzer.analyze(data) == TupleLikeListDatasetType([PrimitiveDatasetType('int'),
+                                                                      PrimitiveDatasetType('str')] * 10)
+
+
+def test_dataset_analyzer__short_list(sample_size):
+    data = [{'a': 1}] * 10
+    assert DatasetAnalyzer.analyze(data) == TupleLikeListDatasetType([DictDatasetType({'a': PrimitiveDatasetType('int')})] * 10)
+
+
+def test_dataset_analyzer__sampled_list_other_type(sample_size):
+    data = [{'a': i} for i in range(1000)]
+    data[501] = 'a'
+    data[502] = {'b': 1}
+
+    data_type = DatasetAnalyzer.analyze(data)
+
+    assert issubclass(data_type, TupleLikeListDatasetType)
+    assert data_type.items[501] == PrimitiveDatasetType('str')
+    assert data_type.items[502] == DictDatasetType({'b': PrimitiveDatasetType('int')})
+    assert deserialize(serialize(data, data_type), data_type) == data
+
+
+def test_dataset_analyzer__sampled_list_mixed_groups_sampled(sample_size, monkeypatch):
+    data = [{'a': i} if i % 2 else i for i in range(1000)]
+    analyzed = []
+    original = DatasetAnalyzer.analyze
+    monkeypatch.setattr(DatasetAnalyzer, 'analyze', lambda obj, **kwargs: analyzed.append(obj) or original(obj))
+
+    data_type = original(data)
+
+    assert issubclass(data_type, TupleLikeListDatasetType)
+    assert len(analyzed) == 20 + 10  # sample of both groups, nested ints of sampled dicts
+    assert len({id(t) for t in data_type.items}) == 2
+    assert deserialize(serialize(data, data_type), data_type) == data
+
+
+def test_dataset_analyzer__sampled_list_nested_type_mismatch(sample_size):
+    data = [{'a': i} for i in range(1000)]
+    data[501] = {'a': 'a'}
+
+    data_type = DatasetAnalyzer.analyze(data)
+
+    assert issubclass(data_type, TupleLikeListDatasetType)
+    assert data_type.items[501] == DictDatasetType({'a': PrimitiveDatasetType('str')})
+    assert deserialize(serialize(data, data_type), data_type) == data
+
+
+def test_dataset_analyzer__sampling_disabled_by_default(monkeypatch):
+    monkeypatch.delenv('EBONITE_DATASET_ANALYSIS_SAMPLE_SIZE', raising=False)
+    data = [{'a': 1}] * 1000
+    assert issubclass(DatasetAnalyzer.analyze(data), TupleLikeListDatasetType)
@@ -1,8 +1,15 @@
+import contextlib
+import io
 import os
+import threading
 
 import pytest
 
-from ebonite.core.objects.artifacts import Blobs, InMemoryBlob, _RelativePathWrapper
+from ebonite.core.errors import ArtifactIntegrityError
+from ebonite.core.objects.artifacts import (Blob, Blobs, CompositeArtifactCollection, InMemoryBlob, LazyBlob,
+                                            LocalFileBlob, VerifiedBlob, _RelativePathWrapper)
+from ebonite.core.objects.wrapper import PickleModelIO
+from ebonite.utils.hashing import HashingReader
 
 
 @pytest.fixture
@@ -53,3 +60,124 @@ def test_artifact_collection__blob_dict(artifact_collection):
             assert blob_dict[path] == InMemoryBlob(value)
 
         _check(condition, [])
+
+
+@pytest.mark.parametrize('source', [
+    lambda: 'payload',
+    lambda: b'payload',
+    lambda: io.StringIO('payload'),
+    lambda: io.BytesIO(b'payload')
+])
+def test_lazy_blob(source, tmpdir):
+    blob = LazyBlob(source)
+    assert blob.bytes() == b'payload'
+
+    path = os.path.join(tmpdir, 'sub', 'blob')
+    blob.materialize(path)
+    with open(path, 'rb') as f:
+        assert f.read() == b'payload'
+
+
+def test_pickle_model_io__dumps_to_file():
+    with PickleModelIO().dump({'a': 1}) as artifact, artifact.blob_dict() as blobs:
+        blob = blobs[PickleModelIO.model_filename]
+        assert isinstance(blob, LocalFileBlob)
+        path = blob.path
+        assert os.path.exists(path)
+    assert not os.path.exists(path)
+
+
+class _BarrierBlob(Blob):
+    def __init__(self, barrier: threading.Barrier, fail=False):
+        self.barrier = barrier
+        self.fail = fail
+
+    def materialize(self, path):
+        InMemoryBlob(b'payload').materialize(path)
+        self.barrier.wait()
+        if self.fail:
+            raise ValueError('failed')
+
+    @contextlib.contextmanager
+    def bytestream(self):
+        yield io.BytesIO(b'payload')
+
+
+def test_composite_artifact_collection__materialize_concurrently(tmpdir):
+    barrier = threading.Barrier(3, timeout=10)
+    ac = CompositeArtifactCollection([_RelativePathWrapper(Blobs({'blob': _BarrierBlob(barrier)}), str(i))
+                                      for i in range(3)])
+    ac.materialize(tmpdir)
+    assert sorted(os.listdir(tmpdir)) == ['0', '1', '2']
+    assert all(os.listdir(os.path.join(tmpdir, str(i))) == ['blob'] for i in range(3))
+
+
+def test_composite_artifact_collection__materialize_cleanup(tmpdir):
+    with open(os.path.join(tmpdir, 'existing'), 'w'):
+        pass
+    os.makedirs(os.path.join(tmpdir, 'sub'))
+    barrier = threading.Barrier(2, timeout=10)
+    ac = CompositeArtifactCollection([Blobs({'ok': _BarrierBlob(barrier)}),
+                                      _RelativePathWrapper(Blobs({'fail': _BarrierBlob(barrier, fail=True)}), 'sub')])
+    with pytest.raises(ValueError):
+        ac.materialize(tmpdir)
+    assert sorted(os.listdir(tmpdir)) == ['existing', 'sub']
+    assert os.listdir(os.path.join(tmpdir, 'sub')) == []
+
+    path = os.path.join(tmpdir, 'new')
+    barrier.reset()
+    with pytest.raises(ValueError):
+        ac.materialize(path)
+    assert not os.path.exists(path)
+
+
+def _verified(payload: bytes, expected: bytes) -> VerifiedBlob:
+    with InMemoryBlob(expected).bytestream() as f:
+        reader = HashingReader(f)
+        reader.read_to_end()
+    return VerifiedBlob(InMemoryBlob(payload), reader.size, reader.digest)
+
+
+def test_verified_blob__seek():
+    blob = _verified(b'payload', b'payload')
+    with blob.bytestream() as f:
+        assert f.seekable()
+        assert f.read(3) == b'pay'
+        f.seek(-2, io.SEEK_END)
+        assert f.read() == b'ad'
+        f.seek(0)
+        assert f.read(3) == b'pay'
+
+    with pytest.raises(ArtifactIntegrityError), _verified(b'payloaD', b'payload').bytestream() as f:
+        f.read(3)
+        f.seek(0)
+
+
+@pytest.mark.parametrize('payload', [b'payloaD', b'payload!'])
+def test_verified_blob__exact_size_read(payload):
+    with pytest.raises(ArtifactIntegrityError), _verified(payload, b'payload').bytestream() as f:
+        f.read(len(b'payload'))
+
+    with _verified(b'payload', b'payload').bytestream() as f:
+        assert f.read(len(b'payload')) == b'payload'
+
+
+def test_verified_blob__partial_read():
+    with _verified(b'payloaD', b'payload').bytestream() as f:
+        assert f.read(3) == b'pay'
+        f.close()
+    assert not f.finished
+
+    with pytest.raises(ArtifactIntegrityError), _verified(b'payloaD', b'payload').bytestream() as f:
+        f.read(3)
+        f.read()
+
+
+def test_artifact_collection__fingerprint():
+    def unreadable():
+        raise AssertionError('payload is read')
+
+    assert Blobs({'a': LazyBlob(unreadable)}).fingerprint() is None
+    verified = _verified(b'payload', b'payload')
+    assert Blobs({'a': verified}).fingerprint() == Blobs({'a': InMemoryBlob(b'payload')}).fingerprint()
+    assert Blobs({'a': verified}).fingerprint() != Blobs({'b': verified}).fingerprint()
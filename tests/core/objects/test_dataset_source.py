@@ -0,0 +1,156 @@
+import copy
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ebonite.core.objects import dataset_source
+from ebonite.core.objects.artifacts import VerifiedBlob
+from ebonite.core.objects.dataset_source import CachedDatasetSource, Dataset, DatasetCache, DatasetSource
+from ebonite.repository.artifact.local import LocalArtifactRepository
+from ebonite.repository.dataset.artifact import ArtifactDatasetRepository, ArtifactDatasetSource
+
+
+class _CountingSource(DatasetSource):
+    def __init__(self, data):
+        self.data = data
+        self.reads = 0
+        super().__init__(Dataset.from_object(data).dataset_type)
+
+    def read(self) -> Dataset:
+        self.reads += 1
+        return Dataset.from_object(self.data)
+
+
+@pytest.mark.parametrize('data, batches', [
+    (np.arange(5), [[0, 1], [2, 3], [4]]),
+    (np.array([]), []),
+    ([1, 2, 3], [[1, 2, 3]]),
+    (1, [1])
+])
+def test_dataset_iterate_batches(data, batches):
+    assert [list(np.atleast_1d(b.data)) if isinstance(b.data, np.ndarray) else b.data
+            for b in Dataset.from_object(data).iterate_batches(2)] == batches
+
+
+def test_cached_dataset_source__read_batches():
+    source = _CountingSource(np.arange(3))
+    cached = CachedDatasetSource(source)
+
+    assert [list(b.data) for b in cached.read_batches(2)] == [[0, 1], [2]]
+    assert [list(b.data) for b in cached.read_batches(2)] == [[0, 1], [2]]
+    assert source.reads == 1
+
+
+@pytest.mark.parametrize('data, other', [
+    (np.arange(5), np.arange(1, 6)),
+    (np.arange(6).reshape((2, 3)), np.arange(6).reshape((3, 2))),
+    (pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}), pd.DataFrame({'a': [1, 2], 'b': ['x', 'z']})),
+    ([1, 2, 3], [1, 2, 4])
+])
+def test_dataset_source__fingerprint(data, other):
+    fingerprint = _CountingSource(data).fingerprint()
+    assert fingerprint == _CountingSource(copy.deepcopy(data)).fingerprint()
+    assert fingerprint != _CountingSource(other).fingerprint()
+
+
+def test_cached_dataset_source__fingerprint():
+    source = _CountingSource(np.arange(3))
+    cached = source.cache()
+    assert cached.fingerprint() == cached.fingerprint() == source.fingerprint()
+    cached.read()
+    assert source.reads == 2  # one for cached source and one for source itself
+
+    source.is_dynamic = True
+    assert source.fingerprint() is None
+    assert CachedDatasetSource(source).fingerprint() is None
+
+
+def test_artifact_dataset_source__fingerprint(tmpdir):
+    repo = ArtifactDatasetRepository(LocalArtifactRepository(str(tmpdir)))
+    saved = repo.save('data', Dataset.from_object(np.arange(5)))
+    with saved.artifacts.blob_dict() as blobs:
+        assert all(isinstance(b, VerifiedBlob) for b in blobs.values())
+
+    fingerprint = saved.fingerprint()
+    assert fingerprint == ArtifactDatasetSource(saved.reader, saved.artifacts, saved.dataset_type).fingerprint()
+    other = repo.save('other', Dataset.from_object(np.arange(1, 6)))
+    assert fingerprint != other.fingerprint()
+
+
+class _NamedSource(DatasetSource):
+    reads = {}
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        super().__init__(Dataset.from_object(np.zeros(size, dtype=np.uint8)).dataset_type)
+
+    def read(self) -> Dataset:
+        _NamedSource.reads[self.name] = _NamedSource.reads.get(self.name, 0) + 1
+        return Dataset.from_object(np.zeros(self.size, dtype=np.uint8))
+
+
+@pytest.fixture
+def dataset_cache(monkeypatch):
+    cache = DatasetCache(100)
+    monkeypatch.setattr(dataset_source, 'DATASET_CACHE', cache)
+    _NamedSource.reads = {}
+    return cache
+
+
+def test_dataset_cache__shared(dataset_cache):
+    first = _NamedSource('a', 10).cache().read()
+    assert _NamedSource('a', 10).cache().read() is first
+    assert _NamedSource.reads == {'a': 1}
+
+    stats = dataset_cache.stats()
+    assert (stats.hits, stats.misses, stats.size, stats.count) == (1, 1, 10, 1)
+
+
+def test_dataset_cache__lru(dataset_cache):
+    _NamedSource('a', 40).cache().read()
+    _NamedSource('b', 40).cache().read()
+    _NamedSource('a', 40).cache().read()
+    _NamedSource('c', 40).cache().read()  # evicts b
+    _NamedSource('a', 40).cache().read()
+    _NamedSource('b', 40).cache().read()
+    assert _NamedSource.reads == {'a': 1, 'b': 2, 'c': 1}
+    assert dataset_cache.stats().evictions == 2
+
+
+def test_dataset_cache__in_use(dataset_cache):
+    large = _NamedSource('large', 1000).cache().read()
+    _NamedSource('a', 60).cache().read()
+    in_use = _NamedSource('a', 60).cache().read()
+    _NamedSource('b', 60).cache().read()  # evicts a, which is still referenced
+
+    assert _NamedSource('large', 1000).cache().read() is large
+    assert _NamedSource('a', 60).cache().read() is in_use
+    assert _NamedSource.reads == {'large': 1, 'a': 1, 'b': 1}
+    assert dataset_cache.stats().size <= 100
+
+    del large, in_use
+    gc.collect()
+    _NamedSource('large', 1000).cache().read()
+    assert _NamedSource.reads['large'] == 2
+
+
+def test_dataset_cache__pinned_by_wrapper(dataset_cache):
+    large, evicted = _NamedSource('large', 1000).cache(), _NamedSource('a', 60).cache()
+    large.read()
+    evicted.read()
+    _NamedSource('b', 60).cache().read()  # evicts a
+    gc.collect()
+
+    assert large.read() is large.read()
+    evicted.read()
+    assert _NamedSource.reads == {'large': 1, 'a': 1, 'b': 1}
+
+
+def test_dataset_cache__not_shared(dataset_cache):
+    source = _CountingSource(np.arange(3))
+    assert source.cache_key() is None
+    source.cache().read()
+    assert dataset_cache.stats().misses == 0
@@ -1,12 +1,18 @@
+import multiprocessing
+import tempfile
 import typing
 
 import numpy as np
+import pandas as pd
 import pytest
+from pyjackson import deserialize, serialize
 
-from ebonite.core.objects import Model, ModelWrapper
+from ebonite.core.analyzer.metric import MetricAnalyzer
+from ebonite.core.objects import Model, ModelWrapper, core
 from ebonite.core.objects.artifacts import Blobs
-from ebonite.core.objects.core import EvaluationResults
-from ebonite.core.objects.metric import Metric
+from ebonite.core.objects.core import EvaluationResult, EvaluationResultCollection, EvaluationResults
+from ebonite.core.objects.dataset_source import Dataset
+from ebonite.core.objects.metric import Metric, concat_batches, evaluate_metrics
 from ebonite.core.objects.wrapper import PickleModelIO
 
 
@@ -145,6 +151,8 @@ def test_task_evaluation(task_with_evals):
 
 def test_evaluation_no_save(task_with_evals):
     task_with_evals.evaluate_all(save_result=False)
+    assert all(len(m.evaluations) == 0 for m in task_with_evals.models.values())
+    assert all(len(p.evaluations) == 0 for p in task_with_evals.pipelines.values())
     pipeline = task_with_evals._meta.get_pipeline_by_name('pipeline', task_with_evals)
     assert len(pipeline.evaluations) == 0
     model = task_with_evals._meta.get_model_by_name('model', task_with_evals)
@@ -181,3 +189,149 @@ def test_wrong_evaluation_raise(task_with_evals):
         model.evaluate_set('aaa')
     with pytest.raises(ValueError):
         model.evaluate_set('test_bool', method_name='predict1', raise_on_error=True)
+
+
+def test_evaluate__batches(eval_model, float_data, float_target, accuracy_metric, mae_metric):
+    input = Dataset.from_object(float_data).to_inmemory_source()
+    output = Dataset.from_object(float_target).to_inmemory_source()
+    metrics = {'accuracy_score': accuracy_metric, 'mean_absolute_error': mae_metric}
+
+    full = eval_model.evaluate(input, output, metrics, method_name='predict1', save=False)
+    batched = eval_model.evaluate(input, output, metrics, method_name='predict1', save=False, batch_size=2)
+    assert batched.scores == full.scores
+
+
+def test_evaluate__different_sizes(eval_model, float_data, float_target, accuracy_metric):
+    input = Dataset.from_object(float_data).to_inmemory_source()
+    output = Dataset.from_object(float_target[:3]).to_inmemory_source()
+    with pytest.raises(ValueError):
+        eval_model.evaluate(input, output, {'acc': accuracy_metric}, method_name='predict1', save=False, batch_size=2)
+
+
+@pytest.mark.parametrize('batches', [
+    [[1, 2], [3]],
+    [np.array([1, 2]), np.array([3])],
+    [pd.Series([1, 2]), pd.Series([3])]
+])
+def test_concat_batches(batches):
+    assert list(concat_batches(batches)) == [1, 2, 3]
+
+
+def test_task_evaluation__parallel(task_with_evals):
+    result = task_with_evals.evaluate_all(workers=2, save_result=False)
+    sequential = task_with_evals.evaluate_all(save_result=False)
+    assert {k: r.scores for k, r in result.items()} == {k: r.scores for k, r in sequential.items()}
+    assert set(result.keys()) == {'pipeline', 'model.predict1', 'model.predict2', 'model'}
+
+
+def test_task_evaluation__saves_once(task_with_evals, monkeypatch):
+    meta = task_with_evals._meta
+    updated, saved = [], []
+    update = meta.update_models_and_pipelines
+    monkeypatch.setattr(meta, 'update_models_and_pipelines',
+                        lambda objects: updated.append(sorted(o.name for o in objects)) or update(objects))
+    save = meta.save
+    monkeypatch.setattr(meta, 'save', lambda: saved.append(meta._save_deferred) or save())
+    task_with_evals.evaluate_all(workers=2)
+
+    assert updated == [['model', 'pipeline']]
+    assert saved.count(False) == 1
+    model = meta.get_model_by_name('model', task_with_evals)
+    _check_float_eval(model.evaluations['predict1'], 'test_float2', False)
+
+
+def test_task_evaluation__parallel_without_fork(task_with_evals, monkeypatch):
+    monkeypatch.setattr(multiprocessing, 'get_start_method', lambda allow_none=False: 'spawn')
+    monkeypatch.setattr(core, 'ProcessPoolExecutor', None)
+
+    result = task_with_evals.evaluate_all(workers=2, save_result=False)
+    assert set(result.keys()) == {'pipeline', 'model.predict1', 'model.predict2', 'model'}
+
+
+def test_model_evaluation__memoized(eval_model_saved, float_data, float_target, accuracy_metric, mae_metric):
+    input, output = Dataset.from_object(float_data).to_inmemory_source(), \
+        Dataset.from_object(float_target).to_inmemory_source()
+    metrics = {'accuracy_score': accuracy_metric}
+    first = eval_model_saved.evaluate(input, output, metrics, 'eval', 'predict1', timestamp=1)
+    assert first.fingerprint is not None
+
+    assert eval_model_saved.evaluate(input, output, metrics, 'eval', 'predict1', timestamp=2) == first
+    assert eval_model_saved.evaluate(Dataset.from_object(float_data.copy()).to_inmemory_source(), output, metrics,
+                                     'eval', 'predict1', timestamp=3) == first
+
+    changed_data = eval_model_saved.evaluate(Dataset.from_object(float_data * 2).to_inmemory_source(), output,
+                                             metrics, 'eval', 'predict1', timestamp=4)
+    assert changed_data.timestamp == 4
+    changed_metrics = eval_model_saved.evaluate(input, output, {'accuracy_score': mae_metric}, 'eval', 'predict1',
+                                                timestamp=5)
+    assert changed_metrics.timestamp == 5
+    assert eval_model_saved.evaluate(input, output, metrics, 'eval', 'predict1', timestamp=6) == first
+    assert eval_model_saved.evaluate(input, output, metrics, 'eval', 'predict1', timestamp=7, force=True).timestamp == 7
+    assert len(eval_model_saved.evaluations['predict1']['eval'].results) == 4
+
+
+def test_model_fingerprint__memoized(eval_model_saved, monkeypatch):
+    calls = []
+    original = Blobs.blob_dict
+    monkeypatch.setattr(Blobs, 'blob_dict', lambda self: calls.append(1) or original(self))
+
+    fingerprint = eval_model_saved.fingerprint()
+    assert fingerprint is not None
+    assert eval_model_saved.fingerprint() == fingerprint
+    assert len(calls) == 1
+
+    eval_model_saved._persisted_artifacts = Blobs({})
+    assert eval_model_saved.fingerprint() == fingerprint
+    assert len(calls) == 2
+
+
+class _UnreadableArtifacts(Blobs):
+    def blob_dict(self):
+        raise AssertionError('unpersisted artifacts are dumped')
+
+
+def test_model_fingerprint__unpersisted(eval_model):
+    eval_model._persisted_artifacts = None
+    eval_model._unpersisted_artifacts = _UnreadableArtifacts({})
+    assert eval_model.fingerprint() is None
+
+
+def test_model_evaluation__force_skips_fingerprint(eval_model_saved, float_data, float_target, accuracy_metric,
+                                                   monkeypatch):
+    input, output = Dataset.from_object(float_data).to_inmemory_source(), \
+        Dataset.from_object(float_target).to_inmemory_source()
+
+    def fingerprint():
+        raise AssertionError('fingerprint is computed')
+
+    monkeypatch.setattr(eval_model_saved, 'fingerprint', fingerprint)
+    result = eval_model_saved.evaluate(input, output, {'acc': accuracy_metric}, 'eval', 'predict1', force=True)
+    assert result.fingerprint is None
+
+
+def test_task_evaluation__memoized(task_with_evals):
+    first = task_with_evals.evaluate_all()
+    assert task_with_evals.evaluate_all() == first
+
+    task_with_evals.metrics['mean_absolute_error'] = AccMetric()
+    second = task_with_evals.evaluate_all()
+    assert all(second[key] != first[key] for key in first)
+
+
+def test_evaluation_result_collection__find():
+    collection = EvaluationResultCollection([EvaluationResult(1, fingerprint='a'), EvaluationResult(2),
+                                             EvaluationResult(3, fingerprint='b'), EvaluationResult(4, fingerprint='a')])
+    assert collection.find('a').timestamp == 4
+    assert collection.find('b').timestamp == 3
+    assert collection.find('c') is None
+    assert collection.find(None).timestamp == 4
+
+
+def test_evaluate_metrics(accuracy_metric, mae_metric, monkeypatch):
+    truth, prediction = pd.Series([1, 0, 1]), pd.Series([1, 1, 1])
+    callable_metric = MetricAnalyzer.analyze(lambda t, p: int(isinstance(t, pd.Series)))
+    callable_metric = deserialize(serialize(callable_metric, Metric), Metric)
+    monkeypatch.setattr(tempfile, 'TemporaryDirectory', None)  # callable metric is loaded from memory
+
+    scores = evaluate_metrics({'acc': accuracy_metric, 'mae': mae_metric, 'custom': callable_metric}, truth, prediction)
+    assert scores == {'acc': pytest.approx(2 / 3), 'mae': pytest.approx(1 / 3), 'custom': 1}
@@ -1,5 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 
+from ebonite.core.objects.artifacts import Blobs, InMemoryBlob
 from ebonite.core.objects.requirements import (CustomRequirement, InstallableRequirement, Requirements,
                                                resolve_requirements)
 
@@ -61,3 +64,35 @@ def test_custom_requirement__source():
     assert module.source is not None
     with pytest.raises(AttributeError):
         module.sources  # noqa
+
+
+def test_custom_requirement__digest():
+    from ebonite.core import objects
+    package = CustomRequirement.from_module(objects)
+    assert CustomRequirement.from_module(objects).source64zip is package.source64zip
+    assert package.digest == CustomRequirement(package.name, package.source64zip, True).digest
+
+    module = CustomRequirement.from_module(objects.requirements)
+    assert module.digest != package.digest
+
+
+def test_custom_requirement__decompressed_once():
+    from ebonite.core import objects
+    package = CustomRequirement.from_module(objects)
+    sources = package.to_sources_dict()
+
+    with patch.object(CustomRequirement, 'decompress_package', wraps=CustomRequirement.decompress_package) as decompress:
+        same = CustomRequirement(package.name, package.source64zip, True)
+        assert same.to_sources_dict() == sources
+        decompress.assert_not_called()
+
+
+def test_custom_requirement__with_artifact():
+    from ebonite.core.objects import requirements
+    module = CustomRequirement.from_module(requirements)
+    stored = module.with_artifact(Blobs({k: InMemoryBlob(v.bytes()) for k, v in module.sources_blobs().items()}))
+
+    assert stored.source64zip is None
+    assert stored.digest == module.digest
+    assert stored.sources_blobs()[CustomRequirement.sources_file].bytes() == module.source64zip.encode('utf8')
+    assert stored.to_sources_dict() == module.to_sources_dict()
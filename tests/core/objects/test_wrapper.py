@@ -0,0 +1,204 @@
+import contextlib
+import io
+import mmap
+import os
+import threading
+import typing
+
+import numpy as np
+import pytest
+
+from ebonite.core.analyzer import TypeHookMixin
+from ebonite.core.analyzer.model import BindingModelHook
+from ebonite.core.objects.artifacts import Blobs, InMemoryBlob
+from ebonite.core.objects.requirements import Requirements
+from ebonite.core.objects.wrapper import OUT_OF_BAND_BUFFERS, ModelIO, ModelWrapper, PickleModelIO, _ExternalRef
+from ebonite.ext.numpy.dataset import NumpyNdarrayDatasetType
+from ebonite.utils.pickling import EbonitePickler
+
+
+@pytest.fixture
+def np_model():
+    weights = np.arange(1000, dtype=np.float64)
+    return {'weights': weights, 'same_weights': weights, 'small': np.arange(3), 'objects': np.array([None] * 1000)}
+
+
+def _dump_and_load(io, model, path):
+    with io.dump(model) as artifact:
+        artifact.materialize(path)
+    return io.load(path)
+
+
+def _is_mapped(array):
+    while isinstance(array, np.ndarray) and not isinstance(array, np.memmap):
+        array = array.base
+    return isinstance(array, (np.memmap, mmap.mmap))
+
+
+def _files(path, ext):
+    return sorted(f for f in os.listdir(path) if f.endswith(ext))
+
+
+def test_pickle_model_io__mmap(np_model, tmpdir):
+    loaded = _dump_and_load(PickleModelIO(mmap_mode='r', min_array_size=1000), np_model, tmpdir)
+
+    if OUT_OF_BAND_BUFFERS:
+        assert _files(tmpdir, PickleModelIO.buffer_ext) == ['buffer_0.buf']
+        assert _files(tmpdir, PickleModelIO.array_ext) == []
+    else:
+        assert _files(tmpdir, PickleModelIO.array_ext) == ['array_0.npy']
+    assert _is_mapped(loaded['weights'])
+    assert not loaded['weights'].flags.writeable
+    assert loaded['weights'] is loaded['same_weights']
+    np.testing.assert_array_equal(loaded['weights'], np_model['weights'])
+    assert not _is_mapped(loaded['small'])
+    assert not _is_mapped(loaded['objects'])
+
+
+@pytest.mark.skipif(not OUT_OF_BAND_BUFFERS, reason='pickle protocol 5 requires python 3.8+')
+def test_pickle_model_io__out_of_band_buffers(np_model, tmpdir):
+    loaded = _dump_and_load(PickleModelIO(min_array_size=1000), np_model, tmpdir)
+
+    assert _files(tmpdir, PickleModelIO.buffer_ext) == ['buffer_0.buf']
+    assert not _is_mapped(loaded['weights'])
+    assert loaded['weights'].flags.writeable
+    assert loaded['weights'] is loaded['same_weights']
+    np.testing.assert_array_equal(loaded['weights'], np_model['weights'])
+
+
+def test_pickle_model_io__legacy_refs():
+    # previous versions pickled stubs which are replaced with nested models on load
+    payload = io.BytesIO()
+    EbonitePickler(payload, recurse=True).dump({'model': _ExternalRef('ref'), 'other': [1]})
+    payload.seek(0)
+
+    loaded = PickleModelIO._deserialize_model(payload, {'ref': SubModel('a')})
+    assert loaded['model'].value == 'a'
+    assert loaded['other'] == [1]
+
+
+def test_pickle_model_io__no_mmap(np_model, tmpdir):
+    loaded = _dump_and_load(PickleModelIO(), np_model, tmpdir)
+
+    assert not any(f.endswith(PickleModelIO.array_ext) for f in os.listdir(tmpdir))
+    assert not isinstance(loaded['weights'], np.memmap)
+    np.testing.assert_array_equal(loaded['weights'], np_model['weights'])
+
+
+class SubModel:
+    def __init__(self, value):
+        self.value = value
+
+
+class SerialSubModel(SubModel):
+    pass
+
+
+class SubModelIO(ModelIO):
+    thread_safe = True
+    barrier = None
+    threads = []
+
+    @contextlib.contextmanager
+    def dump(self, model):
+        self._wait()
+        yield Blobs({'value': InMemoryBlob(model.value.encode('utf8'))})
+
+    def load(self, path):
+        self._wait()
+        with open(os.path.join(path, 'value')) as f:
+            return SubModel(f.read())
+
+    def _wait(self):
+        SubModelIO.threads.append(threading.current_thread().name)
+        if SubModelIO.barrier is not None:
+            SubModelIO.barrier.wait()
+
+
+class SerialSubModelIO(SubModelIO):
+    thread_safe = False
+
+
+class SubModelWrapper(ModelWrapper):
+    type = 'test_sub_model'
+
+    def _exposed_methods_mapping(self) -> typing.Dict[str, typing.Optional[str]]:
+        return {}
+
+
+class SerialSubModelHook(BindingModelHook, TypeHookMixin):
+    valid_types = [SerialSubModel]
+
+    def _wrapper_factory(self) -> ModelWrapper:
+        return SubModelWrapper(SerialSubModelIO())
+
+
+class SubModelHook(BindingModelHook, TypeHookMixin):
+    valid_types = [SubModel]
+
+    def _wrapper_factory(self) -> ModelWrapper:
+        return SubModelWrapper(SubModelIO())
+
+
+@pytest.fixture
+def sub_model_io():
+    SubModelIO.threads = []
+    yield SubModelIO
+    SubModelIO.barrier = None
+
+
+def test_pickle_model_io__concurrent_refs(sub_model_io, tmpdir):
+    # every dump and load waits for the other one, so they deadlock unless run concurrently
+    sub_model_io.barrier = threading.Barrier(2, timeout=10)
+    loaded = _dump_and_load(PickleModelIO(), {'a': SubModel('a'), 'b': SubModel('b')}, tmpdir)
+
+    assert {k: v.value for k, v in loaded.items()} == {'a': 'a', 'b': 'b'}
+    assert len(sub_model_io.threads) == 4
+    assert all(name.startswith(('ebonite_dump', 'ebonite_load')) for name in sub_model_io.threads)
+
+
+def test_pickle_model_io__serial_refs(sub_model_io, tmpdir):
+    loaded = _dump_and_load(PickleModelIO(), {'a': SerialSubModel('a'), 'b': SerialSubModel('b')}, tmpdir)
+
+    assert {k: v.value for k, v in loaded.items()} == {'a': 'a', 'b': 'b'}
+    assert sub_model_io.threads == [threading.current_thread().name] * 4
+
+
+class ProbedModelWrapper(ModelWrapper):
+    def __init__(self):
+        super().__init__(PickleModelIO())
+        self.calls = []
+
+    def _exposed_methods_mapping(self) -> typing.Dict[str, str]:
+        return {'predict': 'predict', 'check': 'check'}
+
+    def _model_requirements(self) -> Requirements:
+        return Requirements()
+
+    def predict(self, data):
+        self.calls.append(('predict', len(data)))
+        return data.sum(axis=1)
+
+    def check(self, data):
+        self.calls.append(('check', len(data)))
+        if len(data) < 100:
+            raise ValueError('too few rows')
+        return data > 0
+
+
+def test_wrapper__probe_rows(monkeypatch):
+    monkeypatch.setenv('EBONITE_MODEL_PROBE_SIZE', '5')
+    wrapper = ProbedModelWrapper().bind_model('model', input_data=np.ones((1000, 3)))
+
+    assert wrapper.calls == [('predict', 5), ('check', 5), ('check', 1000)]
+    assert wrapper.method_signature('predict')[1] == NumpyNdarrayDatasetType((None,), 'float64')
+    assert wrapper.method_signature('check')[1] == NumpyNdarrayDatasetType((None, 3), 'bool')
+
+
+def test_wrapper__declared_output_types():
+    out_type = NumpyNdarrayDatasetType((None,), 'float32')
+    wrapper = ProbedModelWrapper().bind_model('model', input_data=np.ones((1000, 3)),
+                                              output_types={'predict': out_type})
+
+    assert wrapper.calls == [('check', 10), ('check', 1000)]
+    assert wrapper.method_signature('predict')[1] == out_type
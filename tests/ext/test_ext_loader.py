@@ -108,3 +108,17 @@ def test_extension_loader__lazy_defered(ext_loader, two_temp_modules, temp_modul
 
     assert module_imported(module1)
     assert module_imported(module2)
+
+
+def test_extension_loader__force_lazy(ext_loader, two_temp_modules):
+    module1, module2 = two_temp_modules
+    ext_loader.builtin_extensions[module1] = Extension(module1, [module2], force=True)
+
+    ext_loader.load_all(load_forced=False)
+
+    assert not module_imported(module1)
+    assert not module_imported(module2)
+
+    import_module(module2)  # noqa
+
+    assert module_imported(module1)
@@ -1,6 +1,9 @@
+import lightgbm as lgb
 import numpy as np
 import pytest
 
+from ebonite.core.analyzer.dataset import DatasetAnalyzer
+from ebonite.core.analyzer.model import ModelAnalyzer
 from ebonite.core.objects import ModelWrapper
 from ebonite.ext.lightgbm.model import LightGBMModelWrapper
 
@@ -37,3 +40,14 @@ def test_wrapper__dump_load(tmpdir, wrapper: ModelWrapper, dataset_np):
     test_wrapper__predict(wrapper, dataset_np)
 
     assert set(wrapper.requirements.modules) == expected_requirements
+
+
+@pytest.mark.parametrize('params', [{}, {'objective': 'multiclass', 'num_class': 3}])
+def test_wrapper__static_output_type(params, np_payload, monkeypatch):
+    data = lgb.Dataset(np_payload, label=np.arange(len(np_payload)) % 3, free_raw_data=False)
+    booster = lgb.train(params, data, 1)
+    monkeypatch.setattr(ModelWrapper, '_call_method', lambda *args: pytest.fail('method should not be called'))
+
+    wrapper = ModelAnalyzer.analyze(booster, input_data=data)
+
+    assert wrapper.method_signature('predict')[1] == DatasetAnalyzer.analyze(booster.predict(np_payload))
@@ -1,6 +1,12 @@
 import numpy as np
+import pytest
+from pyjackson import deserialize
 
+from ebonite.core.objects.artifacts import Blobs, InMemoryBlob, LocalFileBlob
 from ebonite.core.objects.dataset_source import Dataset
+from ebonite.ext.numpy.dataset_source import (DATA_FILE, NPY_DATA_FILE, NPY_FORMAT, NPZ_FORMAT, NumpyNdarrayWriter,
+                                              save_npz)
+from ebonite.repository.dataset.artifact import DatasetReader
 from tests.conftest import dataset_write_read_check
 
 
@@ -8,3 +14,82 @@ def test_ndarray_source():
     data = np.array([1, 2, 3])
     dataset = Dataset.from_object(data)
     dataset_write_read_check(dataset, custom_eq=np.array_equal)
+
+
+@pytest.mark.parametrize('data', [
+    np.arange(10),
+    np.arange(30, dtype=np.float32).reshape((10, 3)),
+    np.asfortranarray(np.arange(30).reshape((10, 3)))
+])
+def test_ndarray_source__read_batches(data):
+    reader, artifacts = Dataset.from_object(data).get_writer().write(Dataset.from_object(data))
+
+    batches = [b.data for b in reader.read_batches(artifacts, 4)]
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert np.array_equal(np.concatenate(batches), data)
+
+
+@pytest.mark.parametrize('format', [NPY_FORMAT, NPZ_FORMAT])
+@pytest.mark.parametrize('data', [
+    np.arange(10),
+    np.arange(30, dtype=np.float32).reshape((10, 3)),
+    np.asfortranarray(np.arange(30).reshape((10, 3))),
+    np.arange(60).reshape((10, 6))[:, ::2],
+    np.array(5)
+])
+def test_ndarray_source__formats(data, format):
+    reader, artifacts = NumpyNdarrayWriter(format).write(Dataset.from_object(data))
+    assert reader.format == format
+
+    assert np.array_equal(reader.read(artifacts).data, data)
+    assert np.array_equal(np.concatenate([np.atleast_1d(b.data) for b in reader.read_batches(artifacts, 4)]),
+                          np.atleast_1d(data))
+
+
+def test_ndarray_source__default_format():
+    reader, artifacts = NumpyNdarrayWriter().write(Dataset.from_object(np.arange(10)))
+    assert reader.format == NPY_FORMAT
+    reader, artifacts = NumpyNdarrayWriter().write(Dataset.from_object(np.array([1, 'a'], dtype=object)))
+    assert reader.format == NPZ_FORMAT
+
+
+def test_ndarray_source__old_reader():
+    reader = deserialize({'type': 'ebonite.ext.numpy.dataset_source.NumpyNdarrayReader'}, DatasetReader)
+    assert reader.format == NPZ_FORMAT
+    data = np.arange(10)
+    artifacts = Blobs({DATA_FILE: InMemoryBlob(save_npz(data).getvalue())})
+    assert np.array_equal(reader.read(artifacts).data, data)
+
+
+def test_ndarray_source__mmap(tmpdir):
+    data = np.arange(30, dtype=np.float32).reshape((10, 3))
+    reader, artifacts = NumpyNdarrayWriter(NPY_FORMAT).write(Dataset.from_object(data))
+    artifacts.materialize(str(tmpdir))
+    local = Blobs({NPY_DATA_FILE: LocalFileBlob(str(tmpdir.join(NPY_DATA_FILE)))})
+
+    reader.mmap_mode = 'r'
+    result = reader.read(local).data
+    assert isinstance(result, np.memmap)
+    assert np.array_equal(result, data)
+    assert [len(b.data) for b in reader.read_batches(local, 4)] == [4, 4, 2]
+
+    in_memory = Blobs({NPY_DATA_FILE: InMemoryBlob(artifacts.bytes_dict()[NPY_DATA_FILE])})
+    result = reader.read(in_memory).data
+    assert not isinstance(result, np.memmap)
+    assert np.array_equal(result, data)
+
+
+@pytest.mark.parametrize('format', [NPY_FORMAT, NPZ_FORMAT])
+def test_ndarray_source__artifact_repository(tmpdir, format):
+    from ebonite.repository.artifact.local import LocalArtifactRepository
+    from ebonite.repository.dataset.artifact import ArtifactDatasetRepository
+
+    data = np.arange(30).reshape((10, 3))
+    repo = ArtifactDatasetRepository(LocalArtifactRepository(str(tmpdir)))
+    dataset = Dataset.from_object(data)
+    reader, artifacts = NumpyNdarrayWriter(format).write(dataset)
+    with artifacts.blob_dict() as blobs:
+        pushed = repo.repo.push_artifact(repo.ARTIFACT_TYPE, 'a', blobs)
+
+    np.testing.assert_array_equal(reader.read(pushed).data, data)
+    np.testing.assert_array_equal(np.concatenate([b.data for b in reader.read_batches(pushed, 4)]), data)
@@ -1,10 +1,16 @@
+import io
+import os
 from typing import List
 
 import pandas as pd
 import pytest
 
+from ebonite.core.objects.artifacts import ArtifactCollection, LocalFileBlob
 from ebonite.core.objects.dataset_source import Dataset
-from ebonite.ext.pandas.dataset_source import PANDAS_FORMATS, PandasReader, PandasWriter
+from ebonite.ext.pandas import dataset_source
+from ebonite.ext.pandas.dataset_source import (PANDAS_DATA_FILE, PANDAS_FORMATS, PandasFormatCsv, PandasFormatHdf,
+                                               PandasFormatParquet, PandasReader, PandasWriter, _row_group_matches,
+                                               choose_format, rebatch)
 from tests.conftest import dataset_write_read_check
 from tests.ext.test_pandas.conftest import PD_DATA_FRAME, PD_DATA_FRAME_INDEX, PD_DATA_FRAME_MULTIINDEX, pandas_assert
 
@@ -46,3 +52,168 @@ def test_with_multiindex(data, format):
 def test_with_index_complex(data, format):
     writer = PandasWriter(format)
     dataset_write_read_check(Dataset.from_object(data), writer, PandasReader, custom_assert=pandas_assert)
+
+
+@for_all_formats
+def test_read_batches(format):
+    data = pd.DataFrame({'a': range(10), 'b': [f'b{i}' for i in range(10)]})
+    reader, artifacts = PandasWriter(format).write(Dataset.from_object(data))
+
+    batches = [b.data for b in reader.read_batches(artifacts, 4)]
+    assert [len(b) for b in batches] == [4, 4, 2]
+    pandas_assert(pd.concat(batches).reset_index(drop=True), data)
+
+
+def test_rebatch():
+    frames = [pd.DataFrame({'a': range(n)}) for n in [3, 0, 5, 1]]
+    assert [len(b) for b in rebatch(frames, 2)] == [2, 2, 2, 2, 1]
+
+
+def test_parquet_read_batches__row_groups():
+    data = pd.DataFrame({'a': range(10)})
+    format = PandasFormatParquet(write_args={'row_group_size': 3})
+
+    assert [len(b) for b in format.read_batches(format.write(data), 4)] == [4, 4, 2]
+
+
+@for_all_formats
+def test_read_columns_and_filters(format):
+    data = pd.DataFrame({'a': range(10), 'b': [f'b{i}' for i in range(10)], 'c': [i / 2 for i in range(10)]})
+    dataset = Dataset.from_object(data.set_index('a'))
+    reader, artifacts = PandasWriter(format).write(dataset)
+
+    filters = [('a', '>=', 3), ('b', 'not in', ['b5'])]
+    result = reader.read(artifacts, columns=['c', 'a'], filters=filters)
+    expected = data[['c', 'a']].iloc[[3, 4, 6, 7, 8, 9]].set_index('a')
+    pandas_assert(result.data, expected)
+    assert result.dataset_type.columns == ['c', 'a']
+    assert result.dataset_type.index_cols == ['a']
+
+    batches = [b.data for b in reader.read_batches(artifacts, 4, columns=['c', 'a'], filters=filters)]
+    assert [len(b) for b in batches] == [4, 2]
+    pandas_assert(pd.concat(batches), expected)
+
+
+def test_read_unknown_column(data):
+    reader, artifacts = PandasWriter(PandasFormatCsv()).write(Dataset.from_object(data))
+    with pytest.raises(ValueError):
+        reader.read(artifacts, columns=['d'])
+
+
+def test_parquet_filters__skip_row_groups():
+    import pyarrow.parquet as pq
+    data = pd.DataFrame({'a': range(10)})
+    format = PandasFormatParquet(write_args={'row_group_size': 3})
+    file = pq.ParquetFile(format.write(data))
+
+    row_groups = [file.metadata.row_group(i) for i in range(file.num_row_groups)]
+
+    assert [_row_group_matches(rg, [('a', '>', 4)]) for rg in row_groups] == [False, True, True, True]
+    assert [_row_group_matches(rg, [('a', 'in', [1, 9])]) for rg in row_groups] == [True, False, False, True]
+    assert list(format.read(format.write(data), filters=[('a', '>', 7)])['a']) == [8, 9]
+
+
+@pytest.mark.parametrize('df, format_type', [
+    (pd.DataFrame({'a': range(10)}), 'feather'),
+    (PD_DATA_FRAME, 'feather'),
+    (pd.DataFrame({'a': [1, 'a']}), 'csv'),
+    (pd.DataFrame({1: [1, 2]}), 'csv')
+])
+def test_choose_format(df, format_type):
+    assert choose_format(df).type == format_type
+
+
+def test_choose_format__large(monkeypatch):
+    monkeypatch.setattr(dataset_source, 'PARQUET_MIN_SIZE', 0)
+    assert choose_format(pd.DataFrame({'a': range(10)})).type == 'parquet'
+    assert choose_format(PD_DATA_FRAME).type == 'feather'
+
+
+def test_choose_format__no_pyarrow(monkeypatch):
+    monkeypatch.setattr(dataset_source, 'module_importable', lambda name: False)
+    assert choose_format(pd.DataFrame({'a': range(10)})).type == 'csv'
+
+
+@pytest.mark.parametrize('format_type', ['csv', 'parquet'])
+def test_choose_format__configured(monkeypatch, format_type):
+    monkeypatch.setenv('PANDAS_DATASET_FORMAT', format_type)
+    assert choose_format(pd.DataFrame({'a': range(10)})).type == format_type
+
+
+@pytest.mark.parametrize('data', [PD_DATA_FRAME, PD_DATA_FRAME_INDEX])
+def test_default_writer(data):
+    dataset = Dataset.from_object(data)
+    dataset_write_read_check(dataset, dataset.get_writer(), PandasReader, custom_assert=pandas_assert)
+
+
+def test_default_writer__sliced():
+    data = pd.DataFrame({'a': range(10)}).iloc[3:]
+    reader, artifacts = Dataset.from_object(data).get_writer().write(Dataset.from_object(data))
+    assert reader.format.type == 'feather'
+    pandas_assert(reader.read(artifacts).data, data.reset_index(drop=True))
+
+
+def test_csv_dtype_hints():
+    data = pd.DataFrame({'a': pd.Series([1, 2, 3], dtype='int32'), 'b': pd.Categorical(['x', 'y', 'x']),
+                         'c': pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03'])})
+    format = PandasFormatCsv()
+    payload = format.write(data).getvalue()
+    dtypes = {'a': 'int32', 'b': 'category', 'c': 'datetime64[ns]'}
+
+    pandas_assert(format.read(io.StringIO(payload), dtypes=dtypes), data)
+    batches = list(format.read_batches(io.StringIO(payload), 2, dtypes=dtypes))
+    assert all([d.name for d in b.dtypes] == ['int32', 'category', 'datetime64[ns]'] for b in batches)
+
+
+@pytest.mark.parametrize('format_type', ['hdf', 'feather', 'parquet'])
+def test_read_local_file(tmpdir, monkeypatch, format_type):
+    data = pd.DataFrame({'a': range(10), 'b': [f'b{i}' for i in range(10)]})
+    reader, artifacts = PandasWriter(PANDAS_FORMATS[format_type]).write(Dataset.from_object(data))
+    path = str(tmpdir.join('data'))
+    artifacts.materialize(path)
+    local = ArtifactCollection.from_blobs({PANDAS_DATA_FILE: LocalFileBlob(os.path.join(path, PANDAS_DATA_FILE))})
+
+    read_paths = []
+    original = type(reader.format).read_func
+    monkeypatch.setattr(type(reader.format), 'read_func',
+                        staticmethod(lambda path, **kwargs: read_paths.append(path) or original(path, **kwargs)))
+    pandas_assert(reader.read(local, columns=['b']).data, data[['b']])
+    assert read_paths == [os.path.join(path, PANDAS_DATA_FILE)]
+
+
+def test_hdf_read_stream__no_temp_files(monkeypatch):
+    data = pd.DataFrame({'a': range(10)})
+    payload = PandasFormatHdf().write(data)
+
+    def mktemp(*args, **kwargs):
+        raise AssertionError('Temporary file is used')
+
+    monkeypatch.setattr(dataset_source.tempfile, 'mktemp', mktemp)
+    pandas_assert(PandasFormatHdf().read(payload), data)
+
+
+class _NonSeekableStream(io.RawIOBase):
+    def __init__(self, payload: bytes):
+        self.payload = io.BytesIO(payload)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.payload.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+@pytest.mark.parametrize('format_type', ['excel', 'feather', 'parquet'])
+@pytest.mark.parametrize('filters', [None, [('a', '>', 7)], [('a', '>', 100)]])
+def test_read_non_seekable_stream(format_type, filters):
+    data = pd.DataFrame({'a': range(10)})
+    format = PANDAS_FORMATS[format_type]
+    payload = format.write(data).getvalue()
+
+    expected = format.read(io.BytesIO(payload), filters=filters)
+
+    pandas_assert(format.read(_NonSeekableStream(payload), filters=filters), expected)
+    batches = list(format.read_batches(_NonSeekableStream(payload), 4, filters=filters))
+    assert sum(len(b) for b in batches) == len(expected)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import (accuracy_score, confusion_matrix, f1_score, mean_absolute_error, mean_squared_error,
+                             precision_score, recall_score, roc_auc_score)
+
+from ebonite.core.analyzer.metric import MetricAnalyzer
+from ebonite.core.objects.metric import CollectingAccumulator, MetricBatch, MetricSetAccumulator
+from ebonite.ext.sklearn import metric as metric_module
+
+TRUTH = np.array([0, 1, 2, 1, 0, 2, 2])
+PREDICTION = np.array([0, 2, 2, 1, 1, 2, 0])
+
+
+@pytest.mark.parametrize('function', [accuracy_score, confusion_matrix, mean_absolute_error, mean_squared_error])
+def test_streaming_accumulators(function):
+    metric = MetricAnalyzer.analyze(function)
+    accumulator = metric.accumulator()
+    assert not isinstance(accumulator, CollectingAccumulator)
+
+    for start in range(0, len(TRUTH), 3):
+        accumulator.update(TRUTH[start:start + 3], PREDICTION[start:start + 3])
+    np.testing.assert_allclose(accumulator.result(), function(TRUTH, PREDICTION))
+
+
+def test_accuracy_accumulator__empty():
+    accumulator = MetricAnalyzer.analyze(accuracy_score).accumulator()
+    with pytest.warns(RuntimeWarning):
+        assert np.isnan(accumulator.result())
+
+
+@pytest.mark.parametrize('function', [accuracy_score, confusion_matrix])
+@pytest.mark.parametrize('truth, prediction', [
+    (np.array([0, 1]), np.array([.2, .9])),
+    (np.array([1, 2]), np.array(['1', '2'])),
+    (np.array([1, 2]), np.array([1, '2'], dtype=object))
+])
+def test_streaming_accumulators__sklearn_targets(function, truth, prediction):
+    accumulator = MetricAnalyzer.analyze(function).accumulator()
+    try:
+        expected = function(truth, prediction)
+    except ValueError:
+        with pytest.raises(ValueError):
+            accumulator.update_batch(MetricBatch(truth, prediction))
+        return
+    accumulator.update_batch(MetricBatch(truth, prediction))
+    np.testing.assert_array_equal(accumulator.result(), expected)
+
+
+def test_streaming_accumulators__args_fallback():
+    metric = MetricAnalyzer.analyze(accuracy_score)
+    metric.args = {'normalize': False}
+    assert isinstance(metric.accumulator(), CollectingAccumulator)
+
+
+BINARY_TRUTH = np.array([0, 1, 1, 0, 1, 0, 0, 1])
+BINARY_SCORES = np.array([.1, .8, .4, .4, .9, .2, .6, .4])
+
+
+@pytest.mark.parametrize('function, prediction', [
+    (precision_score, BINARY_SCORES > .5),
+    (recall_score, BINARY_SCORES > .5),
+    (f1_score, BINARY_SCORES > .5),
+    (precision_score, np.zeros(8, dtype=int)),
+    (roc_auc_score, BINARY_SCORES)
+])
+def test_shared_metrics(function, prediction):
+    metric = MetricAnalyzer.analyze(function)
+    result = metric.evaluate_batch(MetricBatch(pd.Series(BINARY_TRUTH), list(prediction)))
+    assert result == pytest.approx(function(BINARY_TRUTH, prediction))
+
+
+def test_shared_metrics__fallback():
+    metric = MetricAnalyzer.analyze(precision_score)
+    metric.args = {'average': 'macro'}
+    assert metric.evaluate_batch(MetricBatch(TRUTH, PREDICTION)) == precision_score(TRUTH, PREDICTION, average='macro')
+    with pytest.raises(ValueError):  # multiclass targets are not supported with default args
+        MetricAnalyzer.analyze(precision_score).evaluate_batch(MetricBatch(TRUTH, PREDICTION))
+
+
+def test_metric_set_accumulator(monkeypatch):
+    functions = [accuracy_score, confusion_matrix, mean_absolute_error, mean_squared_error, f1_score]
+    metrics = {f.__name__: MetricAnalyzer.analyze(f) for f in functions}
+    computed = []
+    original = metric_module._compute_confusion
+    monkeypatch.setattr(metric_module, '_compute_confusion', lambda *args: computed.append(1) or original(*args))
+
+    accumulator = MetricSetAccumulator(metrics)
+    for start in range(0, len(BINARY_TRUTH), 3):
+        accumulator.update(BINARY_TRUTH[start:start + 3], (BINARY_SCORES > .5)[start:start + 3].astype(int))
+    result = accumulator.result()
+
+    assert list(result) == list(metrics)
+    for function in functions:
+        np.testing.assert_allclose(result[function.__name__], function(BINARY_TRUTH, BINARY_SCORES > .5))
+    # one confusion matrix per batch for streaming metrics and one for concatenated batches for f1
+    assert len(computed) == 4
@@ -1,6 +1,9 @@
 import numpy as np
 import pytest
+import xgboost
 
+from ebonite.core.analyzer.dataset import DatasetAnalyzer
+from ebonite.core.analyzer.model import ModelAnalyzer
 from ebonite.core.objects import ModelWrapper
 from ebonite.ext.xgboost.model import XGBoostModelWrapper
 
@@ -37,3 +40,15 @@ def test_wrapper__dump_load(tmpdir, wrapper: ModelWrapper, dmatrix_np):
     test_wrapper__predict(wrapper, dmatrix_np)
 
     assert set(wrapper.requirements.modules) == expected_requirements
+
+
+@pytest.mark.parametrize('params', [{}, {'objective': 'multi:softprob', 'num_class': 3},
+                                    {'objective': 'multi:softmax', 'num_class': 3}])
+def test_wrapper__static_output_type(params, np_payload, monkeypatch):
+    data = xgboost.DMatrix(np_payload, label=np.arange(len(np_payload)) % 3)
+    booster = xgboost.train(params, data, 1)
+    monkeypatch.setattr(ModelWrapper, '_call_method', lambda *args: pytest.fail('method should not be called'))
+
+    wrapper = ModelAnalyzer.analyze(booster, input_data=data)
+
+    assert wrapper.method_signature('predict')[1] == DatasetAnalyzer.analyze(booster.predict(data))
@@ -1,4 +1,7 @@
+from copy import copy
+
 import pytest
+from pyjackson import deserialize, serialize
 
 from ebonite.core.objects.core import Model
 
@@ -41,3 +44,47 @@ def test_push_artifacts__repush_with_add(artifact_repository, unpersisted_model,
     artifact_repository.push_model_artifacts(unpersisted_model)
     assert unpersisted_model._persisted_artifacts.bytes_dict() == bytes_dict
     assert unpersisted_model._unpersisted_artifacts is None
+
+
+def test_push_artifacts__shared_sources(artifact_repository, unpersisted_model):
+    from ebonite.core import objects
+    from ebonite.core.objects.requirements import CustomRequirement
+
+    requirement = CustomRequirement.from_module(objects)
+    unpersisted_model.requirements += requirement
+    other = copy(unpersisted_model)
+    other._id = 'test_model2'
+
+    artifact_repository.push_model_artifacts(unpersisted_model)
+    artifact_repository.push_model_artifacts(other)
+
+    stored, other_stored = [m.requirements.custom[0] for m in (unpersisted_model, other)]
+    assert stored.source64zip is None
+    assert stored.artifact == other_stored.artifact
+    assert stored.artifact == artifact_repository.get_artifact(artifact_repository.SOURCES_TYPE, requirement.digest)
+    assert stored.to_sources_dict() == requirement.to_sources_dict()
+    assert deserialize(serialize(stored), CustomRequirement).to_sources_dict() == requirement.to_sources_dict()
+
+
+def test_push_artifacts__corrupted_sources(artifact_repository, unpersisted_model, monkeypatch):
+    from ebonite.core import objects
+    from ebonite.core.errors import ArtifactIntegrityError
+    from ebonite.core.objects.requirements import CustomRequirement, Requirements
+
+    requirement = CustomRequirement.from_module(objects)
+    artifact_repository.push_requirements_sources(Requirements([requirement]))
+    get_artifact, deleted = artifact_repository.get_artifact, []
+
+    def corrupted(artifact_type, artifact_id):
+        if not deleted:
+            raise ArtifactIntegrityError(f'Artifact {artifact_id} is corrupted')
+        return get_artifact(artifact_type, artifact_id)
+
+    delete_artifact = artifact_repository.delete_artifact
+    monkeypatch.setattr(artifact_repository, 'get_artifact', corrupted)
+    monkeypatch.setattr(artifact_repository, 'delete_artifact', lambda *args: deleted.append(args) or delete_artifact(*args))
+    unpersisted_model.requirements += requirement
+    artifact_repository.push_model_artifacts(unpersisted_model)
+
+    assert deleted == [(artifact_repository.SOURCES_TYPE, requirement.digest)]
+    assert unpersisted_model.requirements.custom[0].to_sources_dict() == requirement.to_sources_dict()
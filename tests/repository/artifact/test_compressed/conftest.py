@@ -0,0 +1,13 @@
+import pytest
+
+from ebonite.repository.artifact.compressed import CompressedArtifactRepository
+from ebonite.repository.artifact.local import LocalArtifactRepository
+from tests.repository.artifact.conftest import create_artifact_hooks
+
+
+@pytest.fixture
+def compressed_artifact(tmpdir_factory):
+    yield CompressedArtifactRepository(LocalArtifactRepository(tmpdir_factory.mktemp('repo')), codec='gzip')
+
+
+pytest_runtest_protocol, pytest_collect_file = create_artifact_hooks(compressed_artifact, 'compressed')
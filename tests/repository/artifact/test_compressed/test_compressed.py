@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from ebonite.core.objects.artifacts import CompressedBlob, InMemoryBlob, LazyBlob
+from ebonite.repository.artifact.base import ArtifactManifest
+from ebonite.repository.artifact.compressed import COMPRESSED_SUFFIX, CompressedArtifactRepository
+from ebonite.repository.artifact.inmemory import InMemoryArtifactRepository
+from ebonite.repository.artifact.local import LocalArtifactRepository
+
+COMPRESSIBLE = b'ebonite' * 10000
+
+
+@pytest.fixture
+def local_repo(tmpdir):
+    return LocalArtifactRepository(tmpdir)
+
+
+@pytest.mark.parametrize('codec', ['gzip', 'bz2', 'lzma', 'zstd', 'lz4'])
+def test_compressed_repo__roundtrip(codec, tmpdir):
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    if codec == 'lz4':
+        pytest.importorskip('lz4')
+    repo = CompressedArtifactRepository(InMemoryArtifactRepository(), codec=codec, level=1)
+
+    pushed = repo.push_artifact('model', '1', {'model.pkl': InMemoryBlob(COMPRESSIBLE)})
+    with pushed.blob_dict() as blobs:
+        assert isinstance(blobs['model.pkl'], CompressedBlob)
+        assert blobs['model.pkl'].codec == codec
+    assert pushed.bytes_dict() == {'model.pkl': COMPRESSIBLE}
+
+    fetched = repo.get_artifact('model', '1')
+    fetched.materialize(tmpdir)
+    with open(os.path.join(tmpdir, 'model.pkl'), 'rb') as f:
+        assert f.read() == COMPRESSIBLE
+
+
+def test_compressed_repo__stores_compressed(local_repo):
+    repo = CompressedArtifactRepository(local_repo, codec='gzip')
+    repo.push_artifact('model', '1', {'model.pkl': InMemoryBlob(COMPRESSIBLE)})
+
+    stored = os.path.join(local_repo.path, 'model', '1', 'model.pkl' + COMPRESSED_SUFFIX + 'gzip')
+    assert os.path.getsize(stored) < len(COMPRESSIBLE)
+
+
+def test_compressed_repo__skips(local_repo):
+    repo = CompressedArtifactRepository(local_repo, codec='gzip')
+    blobs = {
+        'small': InMemoryBlob(b'small'),
+        'archive.zip': InMemoryBlob(COMPRESSIBLE),
+        'random': InMemoryBlob(os.urandom(100000))
+    }
+    pushed = repo.push_artifact('model', '1', blobs)
+
+    with pushed.blob_dict() as pushed_blobs:
+        assert not any(isinstance(b, CompressedBlob) for b in pushed_blobs.values())
+    assert set(os.listdir(os.path.join(local_repo.path, 'model', '1'))) == set(blobs.keys()) | {ArtifactManifest.file_name}
+
+
+def test_compressed_repo__reads_uncompressed_artifacts(local_repo):
+    local_repo.push_artifact('model', '1', {'model.pkl': InMemoryBlob(COMPRESSIBLE)})
+
+    repo = CompressedArtifactRepository(local_repo, codec='gzip')
+    assert repo.get_artifact('model', '1').bytes_dict() == {'model.pkl': COMPRESSIBLE}
+
+
+@pytest.mark.parametrize('payload', [COMPRESSIBLE, os.urandom(100000), b'small'])
+def test_compressed_repo__reads_blob_once(local_repo, payload):
+    calls = []
+    blob = LazyBlob(lambda: calls.append(1) or payload)
+    repo = CompressedArtifactRepository(local_repo, codec='gzip')
+
+    pushed = repo.push_artifact('model', '1', {'data': blob})
+
+    assert len(calls) == 1
+    assert pushed.bytes_dict() == {'data': payload}
@@ -0,0 +1,128 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from ebonite.core.errors import ArtifactExistsError, ArtifactIntegrityError
+from ebonite.core.objects.artifacts import Blob, InMemoryBlob, VerifiedBlob
+from ebonite.repository.artifact.base import ArtifactManifest
+from ebonite.repository.artifact.local import LocalArtifactRepository
+
+
+class _FailingBlob(Blob):
+    def materialize(self, path):
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def bytestream(self):
+        raise ValueError('interrupted')
+        yield
+
+
+class _CountingBlob(InMemoryBlob):
+    reads = 0
+
+    @contextlib.contextmanager
+    def bytestream(self):
+        self.reads += 1
+        yield io.BytesIO(self.payload)
+
+
+@pytest.fixture
+def repo(tmpdir):
+    return LocalArtifactRepository(tmpdir)
+
+
+def _path(repo, name):
+    return os.path.join(repo.path, 'model', '1', name)
+
+
+def test_push_artifact__manifest(repo):
+    blob = _CountingBlob(b'payload')
+    artifact = repo.push_artifact('model', '1', {'blob': blob})
+    assert blob.reads == 1
+
+    with open(_path(repo, ArtifactManifest.file_name), 'rb') as f:
+        manifest = ArtifactManifest.from_bytes(f.read())
+    assert manifest.complete
+    assert manifest.files['blob'].size == len(b'payload')
+
+    with artifact.blob_dict() as blobs:
+        assert isinstance(blobs['blob'], VerifiedBlob)
+    assert artifact.bytes_dict() == {'blob': b'payload'}
+
+
+def test_get_artifact__corrupted(repo, tmpdir):
+    repo.push_artifact('model', '1', {'blob': InMemoryBlob(b'payload')})
+
+    with open(_path(repo, 'blob'), 'wb') as f:
+        f.write(b'payloaD')
+    artifact = repo.get_artifact('model', '1')
+    with pytest.raises(ArtifactIntegrityError):
+        artifact.bytes_dict()
+    with pytest.raises(ArtifactIntegrityError):
+        artifact.materialize(os.path.join(tmpdir, 'out'))
+    assert not os.path.exists(os.path.join(tmpdir, 'out', 'blob'))
+
+    with open(_path(repo, 'blob'), 'wb') as f:
+        f.write(b'pay')
+    with pytest.raises(ArtifactIntegrityError):
+        repo.get_artifact('model', '1')
+
+
+def test_get_artifact__without_manifest(repo):
+    repo.push_artifact('model', '1', {'blob': InMemoryBlob(b'payload')})
+    os.remove(_path(repo, ArtifactManifest.file_name))
+
+    assert repo.get_artifact('model', '1').bytes_dict() == {'blob': b'payload'}
+
+
+def test_materialize__skips_existing(repo, tmpdir):
+    artifact = repo.push_artifact('model', '1', {'blob': InMemoryBlob(b'payload')})
+    artifact.materialize(tmpdir)
+    mtime = os.path.getmtime(os.path.join(tmpdir, 'blob'))
+
+    os.remove(_path(repo, 'blob'))
+    artifact.materialize(tmpdir)
+    assert os.path.getmtime(os.path.join(tmpdir, 'blob')) == mtime
+
+
+def test_push_artifact__resume(repo):
+    first = _CountingBlob(b'first')
+    with pytest.raises(ValueError):
+        repo.push_artifact('model', '1', {'first': first, 'second': _FailingBlob()})
+    with pytest.raises(ArtifactIntegrityError):
+        repo.get_artifact('model', '1')
+
+    first_mtime = os.path.getmtime(_path(repo, 'first'))
+    artifact = repo.push_artifact('model', '1', {'first': first, 'second': InMemoryBlob(b'second')})
+    assert os.path.getmtime(_path(repo, 'first')) == first_mtime
+    assert first.reads == 1
+    assert artifact.bytes_dict() == {'first': b'first', 'second': b'second'}
+    assert repo.get_artifact('model', '1') == artifact
+
+    with pytest.raises(ArtifactExistsError):
+        repo.push_artifact('model', '1', {'first': first})
+
+
+def test_get_artifact__local_path(repo):
+    repo.push_artifact('model', '1', {'blob': InMemoryBlob(b'payload')})
+    with repo.get_artifact('model', '1').blob_dict() as blobs:
+        assert blobs['blob'].local_path() == _path(repo, 'blob')
+
+        with open(_path(repo, 'blob'), 'wb') as f:
+            f.write(b'payload!')
+        with pytest.raises(ArtifactIntegrityError):
+            blobs['blob'].local_path()
+
+
+def test_push_artifact__manifest_writes(repo, monkeypatch):
+    writes = []
+    replace = os.replace
+    monkeypatch.setattr(os, 'replace', lambda src, dst: writes.append(dst) or replace(src, dst))
+    monkeypatch.setattr(ArtifactManifest, 'save_every_blobs', 2)
+
+    repo.push_artifact('model', '1', {str(i): InMemoryBlob(b'payload') for i in range(5)})
+
+    assert writes == [_path(repo, ArtifactManifest.file_name)] * 4
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from ebonite.core.errors import DatasetExistsError, NoSuchDataset
@@ -30,3 +31,29 @@ def test_delete(dataset_repo: DatasetRepository, data: Dataset):
 def test_delete_not_existing(dataset_repo: DatasetRepository):
     with pytest.raises(NoSuchDataset):
         dataset_repo.delete('a')
+
+
+def test_append(dataset_repo: DatasetRepository):
+    for day in range(3):
+        source = dataset_repo.append('a', Dataset.from_object(np.arange(day * 3, day * 3 + 3)), f'2020-01-0{day + 1}')
+
+    assert list(source.partitions) == ['2020-01-01', '2020-01-02', '2020-01-03']
+    np.testing.assert_array_equal(source.read().data, np.arange(9))
+    assert [list(b.data) for b in source.read_batches(2)] == [[0, 1], [2], [3, 4], [5], [6, 7], [8]]
+    np.testing.assert_array_equal(source.select(since='2020-01-02').read().data, np.arange(3, 9))
+    np.testing.assert_array_equal(source.select(['2020-01-01', '2020-01-03']).read().data, [0, 1, 2, 6, 7, 8])
+    assert source.fingerprint() != source.select(until='2020-01-02').fingerprint()
+
+    with pytest.raises(DatasetExistsError):
+        dataset_repo.append('a', Dataset.from_object(np.arange(3)), '2020-01-03')
+    with pytest.raises(DatasetExistsError):
+        dataset_repo.save('a', Dataset.from_object(np.arange(3)))
+
+    dataset_repo.delete('a')
+    assert list(dataset_repo.append('a', Dataset.from_object(np.arange(3))).partitions) != ['2020-01-01']
+
+
+def test_append_not_partitioned(dataset_repo: DatasetRepository, data: Dataset):
+    dataset_repo.save('a', data)
+    with pytest.raises(ValueError):
+        dataset_repo.append('a', data)
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+from ebonite.core.errors import DatasetExistsError
+from ebonite.core.objects.dataset_source import Dataset
+from ebonite.repository.artifact.inmemory import InMemoryArtifactRepository
+from ebonite.repository.artifact.local import LocalArtifactRepository
+from ebonite.repository.dataset.artifact import ArtifactDatasetRepository
+from tests.repository.dataset import dataset_common
+
+
+@pytest.fixture(params=['local', 'inmemory'])
+def repo(request, tmpdir) -> ArtifactDatasetRepository:
+    if request.param == 'inmemory':
+        return ArtifactDatasetRepository(InMemoryArtifactRepository())
+    return ArtifactDatasetRepository(LocalArtifactRepository(str(tmpdir)))
+
+
+def test_append(repo):
+    dataset_common.test_append(repo)
+
+
+def test_append__failed_manifest_push(repo, monkeypatch):
+    repo.append('a', Dataset.from_object(np.arange(3)), '1')
+    original = repo.repo.push_artifact
+
+    def push_artifact(artifact_type, artifact_id, blobs):
+        if repo.PARTITIONS_FILE in blobs:
+            raise ValueError('interrupted')
+        return original(artifact_type, artifact_id, blobs)
+
+    monkeypatch.setattr(repo.repo, 'push_artifact', push_artifact)
+    with pytest.raises(ValueError):
+        repo.append('a', Dataset.from_object(np.arange(3, 6)), '2')
+    monkeypatch.setattr(repo.repo, 'push_artifact', original)
+    assert [list(m.partitions) for m in repo._read_manifests('a')] == [['1']]
+
+    np.testing.assert_array_equal(repo.append('a', Dataset.from_object(np.arange(3, 6)), '2').read().data,
+                                  np.arange(6))
+
+
+def test_append__concurrent(repo, monkeypatch):
+    repo.append('a', Dataset.from_object(np.arange(3)), '1')
+    stale = repo._read_manifests('a')
+    repo.append('a', Dataset.from_object(np.arange(3, 6)), '2')
+
+    # other process appended partition after this one read manifests
+    monkeypatch.setattr(repo, '_read_manifests', lambda dataset_id: list(stale))
+    with pytest.raises(DatasetExistsError):
+        repo.append('a', Dataset.from_object(np.arange(6, 9)), '3')
+    monkeypatch.undo()
+
+    assert [list(m.partitions) for m in repo._read_manifests('a')] == [['1'], ['2']]
+    assert not any('.partitions/3.' in artifact_id for artifact_id in _artifact_ids(repo))
+
+
+def test_append__manifest_delta(repo):
+    for day in range(20):
+        repo.append('a', Dataset.from_object(np.arange(day, day + 1)), f'{day:02}')
+
+    manifests = repo._read_manifests('a')
+    assert [list(m.partitions) for m in manifests] == [[f'{day:02}'] for day in range(20)]
+    np.testing.assert_array_equal(repo.append('a', Dataset.from_object(np.arange(20, 21)), '20').read().data,
+                                  np.arange(21))
+
+
+def _artifact_ids(repo):
+    if isinstance(repo.repo, InMemoryArtifactRepository):
+        return list(repo.repo._cache)
+    root = os.path.join(repo.repo.path, repo.ARTIFACT_TYPE)
+    return [os.path.relpath(path, root) for path, _, _ in os.walk(root)]
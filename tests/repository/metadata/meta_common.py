@@ -991,6 +991,22 @@ def test_update_pipeline(meta: MetadataRepository, project: Project, task: Task,
     assert pipeline.has_meta_repo
 
 
+def test_update_models_and_pipelines(meta: MetadataRepository, project: Project, task: Task, model: Model,
+                                     pipeline: Pipeline):
+    task.project = meta.create_project(project)
+    task = meta.create_task(task)
+    model.task_id = pipeline.task_id = task.id
+    model = meta.create_model(model)
+    pipeline = meta.create_pipeline(pipeline)
+
+    model.description = 'updated model'
+    pipeline.name = 'updated_pipeline'
+    meta.update_models_and_pipelines([model, pipeline])
+
+    assert meta.get_model_by_id(model.id).description == 'updated model'
+    assert meta.get_pipeline_by_id(pipeline.id).name == 'updated_pipeline'
+
+
 def test_update_pipeline_source_is_changed(meta: MetadataRepository, project: Project, task: Task, pipeline: Pipeline):
     task.project = meta.create_project(project)
     task = meta.create_task(task)
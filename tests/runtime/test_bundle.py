@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from pyjackson.core import ArgList, Field
+
+import ebonite
+from ebonite.core.objects import DatasetType
+from ebonite.runtime.bundle import RuntimeBundle, interface_schema, interface_specs, method_spec
+from ebonite.runtime.interface import Interface, expose
+from ebonite.runtime.interface.base import InterfaceDescriptor
+
+
+class StrDataset(DatasetType):
+    type = 'str_type'
+
+    def get_spec(self) -> ArgList:
+        return [Field('', str, False)]
+
+    def deserialize(self, obj):
+        return obj
+
+    def serialize(self, instance):
+        return instance
+
+
+class MyInterface(Interface):
+    @expose
+    def method(self, argument: StrDataset()) -> StrDataset():
+        """AAA"""
+        return argument + 'a'
+
+
+@pytest.fixture
+def bundle_path(tmpdir):
+    path = str(tmpdir.join('runtime.json'))
+    with open(path, 'w') as f:
+        f.write(RuntimeBundle.from_interface(MyInterface()).dumps())
+    return path
+
+
+def test_bundle__from_interface():
+    interface = MyInterface()
+    bundle = RuntimeBundle.from_interface(interface)
+
+    assert bundle.version == ebonite.__version__
+    assert bundle.descriptor == InterfaceDescriptor.from_interface(interface).to_dict()
+    assert bundle.specs == {'method': method_spec(interface, 'method')}
+    assert bundle.matches(interface)
+
+
+def test_bundle__attach(bundle_path):
+    interface = RuntimeBundle.attach(MyInterface(), bundle_path)
+
+    assert interface.bundle is not None
+    assert interface_specs(interface) is interface.bundle.specs
+    assert interface_schema(interface) is interface.bundle.descriptor
+    assert interface_specs(interface) == interface_specs(MyInterface())
+    assert interface_schema(interface) == interface_schema(MyInterface())
+
+
+def test_bundle__attach_missing(tmpdir):
+    interface = RuntimeBundle.attach(MyInterface(), str(tmpdir.join('runtime.json')))
+    assert interface.bundle is None
+
+
+def test_bundle__attach_other_interface(bundle_path):
+    class OtherInterface(Interface):
+        @expose
+        def other(self, argument: StrDataset()) -> StrDataset():
+            return argument
+
+    interface = RuntimeBundle.attach(OtherInterface(), bundle_path)
+    assert interface.bundle is None
+    assert set(interface_specs(interface)) == {'other'}
+
+
+def test_bundle__other_version(bundle_path):
+    with open(bundle_path, 'r') as f:
+        payload = json.load(f)
+    payload['version'] = 'other'
+    with open(bundle_path, 'w') as f:
+        json.dump(payload, f)
+
+    assert RuntimeBundle.read(bundle_path) is None
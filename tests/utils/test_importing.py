@@ -0,0 +1,17 @@
+from ebonite.utils.importing import import_time_report
+
+
+def test_import_time_report():
+    report = import_time_report('json', top=100)
+
+    assert 'json' in dict(report)
+    assert all(t >= 0 for _, t in report)
+    assert [t for _, t in report] == sorted((t for _, t in report), reverse=True)
+
+
+def test_runtime_import_budget():
+    imported = {name.split('.')[0] for name, _ in import_time_report('ebonite', top=10000,
+                                                                     env={'EBONITE_RUNTIME': 'true'})}
+
+    assert 'ebonite' in imported
+    assert not imported.intersection({'sqlalchemy', 'boto3', 'aiohttp', 'imageio', 'isort', 'requests', 'jinja2'})
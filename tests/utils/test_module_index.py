@@ -0,0 +1,74 @@
+import os
+
+import numpy
+import pytest
+
+from ebonite.utils.module import get_module_as_requirement, get_module_version, is_installable_module
+from ebonite.utils.module_index import ModuleIndex, canonical_package_name
+
+
+@pytest.fixture
+def module_index(tmpdir, monkeypatch):
+    monkeypatch.setenv('EBONITE_MODULE_INDEX_CACHE', str(tmpdir))
+    monkeypatch.setattr(ModuleIndex, '_instance', None)
+    return tmpdir
+
+
+def test_module_index__packages(module_index):
+    index = ModuleIndex.get()
+    assert index.package('sklearn.linear_model')[0] == 'scikit-learn'
+    assert index.package('numpy')[1] == numpy.__version__
+    assert index.package('some_local_module') is None
+
+
+def test_module_index__persisted(module_index, monkeypatch):
+    assert is_installable_module(numpy)
+    ModuleIndex.get().flush()
+    assert len(os.listdir(module_index)) == 1
+
+    monkeypatch.setattr(ModuleIndex, '_instance', None)
+    monkeypatch.setattr(ModuleIndex, 'build', None)  # index is loaded from file instead of being rebuilt
+    index = ModuleIndex.get()
+    assert index.sections['numpy'] == 'THIRDPARTY'
+
+    def classify(module):
+        raise AssertionError('Module is classified again')
+
+    assert index.section('numpy', classify) == 'THIRDPARTY'
+
+
+def test_module_index__local_sections_not_persisted(module_index):
+    index = ModuleIndex.get()
+    assert index.section('my_local_module', lambda m: 'FIRSTPARTY') == 'FIRSTPARTY'
+    assert 'my_local_module' not in index.sections
+
+
+def test_module_index__disabled(tmpdir, monkeypatch):
+    monkeypatch.setenv('EBONITE_MODULE_INDEX_CACHE', '')
+    monkeypatch.setattr(ModuleIndex, '_instance', None)
+    monkeypatch.chdir(tmpdir)
+    ModuleIndex.get().save()
+    assert os.listdir(tmpdir) == []
+
+
+def test_package_names(module_index):
+    import yaml
+    assert get_module_version(yaml) == yaml.__version__
+    assert get_module_as_requirement(yaml).package == 'PyYAML'
+    assert get_module_as_requirement(numpy).package_name is None
+    assert canonical_package_name('Some_Package.name') == 'some-package-name'
+
+
+def test_requirements_use_distribution_names(module_index):
+    import sklearn
+    import yaml
+    from pyjackson import deserialize, serialize
+
+    from ebonite.core.objects.requirements import InstallableRequirement
+    from ebonite.utils.module import get_object_requirements
+
+    requirement = get_object_requirements(yaml.safe_load).installable[0]
+    assert requirement.module == 'yaml'
+    assert requirement.to_str() == f'PyYAML=={yaml.__version__}'
+    assert deserialize(serialize(requirement), InstallableRequirement).to_str() == requirement.to_str()
+    assert get_module_as_requirement(sklearn).to_str() == f'scikit-learn=={sklearn.__version__}'
@@ -1,9 +1,13 @@
+import gc
+import weakref
+
 import pytest
 
 from ebonite.utils.importing import import_module
-from ebonite.utils.module import (analyze_module_imports, check_pypi_module, get_module_repr, get_module_version,
-                                  get_object_module, is_builtin_module, is_ebonite_module, is_extension_module,
-                                  is_installable_module, is_local_module, is_private_module, is_pseudo_module)
+from ebonite.utils.module import (_TYPE_MODULES, PAYLOAD_TYPES, analyze_module_imports, check_pypi_module,
+                                  get_module_repr, get_module_version, get_object_module, get_object_requirements,
+                                  is_builtin_module, is_ebonite_module, is_extension_module, is_installable_module,
+                                  is_local_module, is_private_module, is_pseudo_module)
 
 
 class Obj:
@@ -126,3 +130,40 @@ def test_module_version():
     assert get_module_version(import_module('dill')) is not None
     # responses doesn't have __version__ attr, thus heuristics should be applied here
     assert get_module_version(import_module('responses')) is not None
+
+
+class Payload:
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce__(self):
+        raise AssertionError('Payload is traversed')
+
+
+def test_get_object_requirements__payloads(monkeypatch):
+    import numpy as np
+    import pandas as pd
+    monkeypatch.setitem(PAYLOAD_TYPES, f'{Payload.__module__}.{Payload.__qualname__}', None)
+
+    assert get_object_requirements({'a': np.zeros(10), 'b': Payload(pd.Series(dtype=float))}).modules == ['numpy']
+    objects = np.empty(1, dtype=object)
+    objects[0] = pd.Timedelta(1)
+    assert set(get_object_requirements(objects).modules) == {'numpy', 'pandas'}
+
+
+def test_get_object_requirements__type_cache():
+    import pandas as pd
+    assert get_object_requirements([pd.Timedelta(1)]).modules == ['pandas']
+    assert _TYPE_MODULES[pd.Timedelta].__name__.startswith('pandas.')
+    assert get_object_requirements([pd.Timedelta(2)]).modules == ['pandas']
+
+
+def test_get_object_requirements__type_cache_weak():
+    local_type = type('LocalType', (), {})
+    get_object_requirements(local_type())
+    assert local_type in _TYPE_MODULES
+
+    ref = weakref.ref(local_type)
+    del local_type
+    gc.collect()
+    assert ref() is None